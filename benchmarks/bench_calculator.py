@@ -0,0 +1,197 @@
+"""
+Latency benchmark for the CS-GradeCalculator pipeline.
+
+Generates a synthetic cohort (N students with up to
+GradeCalculator.MAX_EVALUATIONS_PER_STUDENT evaluations each) and times,
+per call:
+- GradeCalculator.calculate_weighted_average
+- GradeCalculator.calculate_final_grade
+- GradeCalculator.generate_grade_report
+- bulk GradeCalculatorApp.add_evaluation (all evaluations of a student)
+
+p50/p95/p99 latencies are reported in milliseconds. The run fails (exit
+status 1) when any call exceeds GradeCalculator.MAX_CALCULATION_TIME_MS
+or when a percentile regresses past a saved baseline.
+
+Usage:
+    python benchmarks/bench_calculator.py [--students N] [--seed S]
+        [--save-baseline FILE] [--baseline FILE] [--tolerance 0.25]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, Iterator, List, Tuple
+
+# Add grade_calculator directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..',
+                                'grade_calculator'))
+
+from evaluation import Evaluation  # noqa: E402
+from grade_calculator import GradeCalculator  # noqa: E402
+from main import GradeCalculatorApp  # noqa: E402
+
+PERCENTILES = (50, 95, 99)
+
+CohortRow = Tuple[str, str, List[Tuple[str, float, float]]]
+
+
+def generate_cohort(students: int, seed: int = 0,
+                    max_evaluations: int =
+                    GradeCalculator.MAX_EVALUATIONS_PER_STUDENT
+                    ) -> Iterator[CohortRow]:
+    """
+    Generate a reproducible synthetic cohort.
+
+    Args:
+        students: Number of students
+        seed: Random seed
+        max_evaluations: Maximum evaluations per student
+
+    Yields:
+        (student_id, name, [(evaluation_id, grade, weight), ...]) with
+        weights summing to 100
+    """
+    rng = random.Random(seed)
+    for index in range(students):
+        count = rng.randint(1, max_evaluations)
+        cuts = sorted(rng.sample(range(1, 100), count - 1))
+        weights = [b - a for a, b in zip([0] + cuts, cuts + [100])]
+        evaluations = [
+            (f"E{j:03d}", round(rng.uniform(Evaluation.MIN_GRADE,
+                                            Evaluation.MAX_GRADE), 1),
+             float(weight))
+            for j, weight in enumerate(weights)
+        ]
+        yield f"S{index:07d}", f"Student {index}", evaluations
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Return the nearest-rank percentile of sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(samples_ns: List[int]) -> Dict[str, float]:
+    """Summarize per-call samples (ns) as millisecond statistics."""
+    values = sorted(sample / 1e6 for sample in samples_ns)
+    summary = {f"p{pct}": percentile(values, pct) for pct in PERCENTILES}
+    summary["max"] = values[-1] if values else 0.0
+    summary["calls"] = len(values)
+    return summary
+
+
+def run(students: int, seed: int = 0) -> Dict[str, Dict[str, float]]:
+    """Run every timed operation over a fresh synthetic cohort."""
+    clock = time.perf_counter_ns
+    cohort = list(generate_cohort(students, seed))
+    calculator = GradeCalculator()
+    app = GradeCalculatorApp(load_sample_data=False)
+    samples: Dict[str, List[int]] = {
+        "add_evaluation_bulk": [],
+        "calculate_weighted_average": [],
+        "calculate_final_grade": [],
+        "generate_grade_report": [],
+    }
+
+    for student_id, name, evaluations in cohort:
+        app.add_student(student_id, name)
+        start = clock()
+        for evaluation_id, grade, weight in evaluations:
+            app.add_evaluation(student_id, evaluation_id, grade, weight)
+        samples["add_evaluation_bulk"].append(clock() - start)
+
+    for student_id, name, _ in cohort:
+        evaluations = app.students[student_id].get_evaluations()
+
+        start = clock()
+        calculator.calculate_weighted_average(evaluations)
+        samples["calculate_weighted_average"].append(clock() - start)
+
+        start = clock()
+        calculator.calculate_final_grade(evaluations, 85.0, 1.0, True)
+        samples["calculate_final_grade"].append(clock() - start)
+
+        start = clock()
+        calculator.generate_grade_report(student_id, name, evaluations,
+                                         85.0, 1.0, True)
+        samples["generate_grade_report"].append(clock() - start)
+
+    return {name: summarize(values) for name, values in samples.items()}
+
+
+def check(results: Dict[str, Dict[str, float]],
+          baseline: Dict[str, Dict[str, float]] = None,
+          tolerance: float = 0.25) -> List[str]:
+    """
+    Check results against the latency budget and an optional baseline.
+
+    Args:
+        results: Output of run()
+        baseline: Previously saved results to compare against
+        tolerance: Allowed relative slowdown versus the baseline
+
+    Returns:
+        List of failure messages (empty when the run passes)
+    """
+    budget = GradeCalculator.MAX_CALCULATION_TIME_MS
+    failures = []
+    for name, stats in results.items():
+        if stats["max"] > budget:
+            failures.append(
+                f"{name}: slowest call {stats['max']:.3f} ms exceeds the "
+                f"{budget} ms budget"
+            )
+        if baseline and name in baseline:
+            for pct in PERCENTILES:
+                key = f"p{pct}"
+                allowed = baseline[name][key] * (1 + tolerance)
+                if stats[key] > allowed:
+                    failures.append(
+                        f"{name}: {key} {stats[key]:.4f} ms regressed past "
+                        f"baseline {baseline[name][key]:.4f} ms "
+                        f"(+{tolerance:.0%} allowed)"
+                    )
+    return failures
+
+
+def main(argv=None) -> int:
+    """Command line entry point; returns the process exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--students", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", help="JSON baseline to compare with")
+    parser.add_argument("--save-baseline", help="write results as baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative regression (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run(args.students, args.seed)
+    print(f"{'operation':<28} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'max ms':>9}")
+    for name, stats in results.items():
+        print(f"{name:<28} {stats['p50']:>9.4f} {stats['p95']:>9.4f} "
+              f"{stats['p99']:>9.4f} {stats['max']:>9.4f}")
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as handle:
+            baseline = json.load(handle)
+    failures = check(results, baseline, args.tolerance)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as handle:
+            json.dump(results, handle, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
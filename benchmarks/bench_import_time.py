@@ -0,0 +1,140 @@
+"""
+Import-time benchmark for the grade_calculator package.
+
+Runs fresh interpreters with -X importtime and compares:
+- calculator: "import grade_calculator" and first use of GradeCalculator,
+  the path of worker processes that only grade
+- app: creating an empty GradeCalculatorApp, which must not load the
+  optional subsystems (storage, snapshot, wal, profiling, scenarios,
+  parallel, ranking)
+- eager: "from grade_calculator import *" plus the optional subsystems,
+  which loads every module the application can use (what importing the
+  package did before the lazy __getattr__ and function-local imports)
+
+The reported time is the sum of the cumulative import times of the
+package and its submodules, median over --runs interpreters. The run fails
+(exit status 1) when the calculator path imports the terminal application
+(grade_calculator.main), the app path imports an optional subsystem or
+the calculator path takes more than --max-ratio of the eager time.
+
+Usage:
+    python benchmarks/bench_import_time.py [--runs N] [--max-ratio 0.5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import List, Set, Tuple
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+PACKAGE = "grade_calculator"
+
+SCENARIOS = {
+    "calculator": "import grade_calculator; grade_calculator.GradeCalculator",
+    "app": ("import grade_calculator; "
+            "grade_calculator.GradeCalculatorApp(load_sample_data=False)"),
+    "eager": ("from grade_calculator import *; "
+              "import grade_calculator.parallel, grade_calculator.profiling"),
+}
+
+# Modules the app imports only in the methods that use them
+OPTIONAL_MODULES = ("storage", "snapshot", "wal", "profiling", "scenarios",
+                    "parallel", "ranking")
+
+# Printed after the scenario so the loaded submodules can be checked
+LIST_MODULES = ("; import sys; print('\\n'.join(name for name in sys.modules"
+                f" if name.startswith('{PACKAGE}.')))")
+
+
+def parse_importtime(stderr: str) -> int:
+    """
+    Sum the cumulative import time of the package's top-level imports.
+
+    Args:
+        stderr: -X importtime output ("import time: self | cumulative |
+                name" lines, nested imports indented)
+
+    Returns:
+        Total microseconds
+    """
+    total = 0
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[1].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        # Indented names were imported by an enclosing line
+        if name.startswith("  ") or not name.strip():
+            continue
+        name = name.strip()
+        if name == PACKAGE or name.startswith(PACKAGE + "."):
+            total += int(fields[1])
+    return total
+
+
+def measure(code: str) -> Tuple[int, Set[str]]:
+    """Run code in a fresh interpreter; return (microseconds, modules)."""
+    # The package is imported from the repository root (cwd)
+    environment = dict(os.environ)
+    environment.pop("PYTHONPATH", None)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code + LIST_MODULES],
+        cwd=ROOT, env=environment, capture_output=True, text=True,
+        check=True)
+    return parse_importtime(result.stderr), set(result.stdout.split())
+
+
+def run(runs: int) -> dict:
+    """Measure every scenario; return its median time and modules."""
+    results = {}
+    for name, code in SCENARIOS.items():
+        samples: List[int] = []
+        modules: Set[str] = set()
+        for _ in range(runs):
+            elapsed, modules = measure(code)
+            samples.append(elapsed)
+        results[name] = {
+            "median_ms": statistics.median(samples) / 1000.0,
+            "min_ms": min(samples) / 1000.0,
+            "modules": sorted(modules),
+        }
+    return results
+
+
+def main(argv=None) -> int:
+    """Command line entry point; returns the process exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=15)
+    parser.add_argument("--max-ratio", type=float, default=0.5)
+    args = parser.parse_args(argv)
+
+    results = run(max(1, args.runs))
+    for name, result in results.items():
+        print(f"{name:<12} median {result['median_ms']:8.2f} ms  "
+              f"min {result['min_ms']:8.2f} ms  "
+              f"modules {len(result['modules'])}")
+
+    status = 0
+    calculator, eager = results["calculator"], results["eager"]
+    if PACKAGE + ".main" in calculator["modules"]:
+        print("FAIL: importing GradeCalculator loaded grade_calculator.main")
+        status = 1
+    optional = sorted(set(results["app"]["modules"]) & {
+        f"{PACKAGE}.{name}" for name in OPTIONAL_MODULES})
+    if optional:
+        print(f"FAIL: creating the app loaded {', '.join(optional)}")
+        status = 1
+    ratio = calculator["median_ms"] / eager["median_ms"]
+    print(f"calculator/eager ratio: {ratio:.2f} (max {args.max_ratio})")
+    if ratio > args.max_ratio:
+        print("FAIL: lazy import time regressed")
+        status = 1
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
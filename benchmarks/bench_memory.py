@@ -0,0 +1,119 @@
+"""
+Memory benchmark for the CS-GradeCalculator model classes.
+
+Compares the memory needed to hold N evaluations as:
+- dict-backed objects (the layout the model classes used before __slots__)
+- slotted Evaluation objects
+- rows of a columnar EvaluationStore
+
+Usage:
+    python benchmarks/bench_memory.py [--count N]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+# Add grade_calculator directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..',
+                                'grade_calculator'))
+
+from evaluation import Evaluation  # noqa: E402
+from evaluation_store import EvaluationStore  # noqa: E402
+
+EVALUATIONS_PER_STUDENT = 10
+
+
+class DictEvaluation:
+    """Dict-backed evaluation record used as the comparison baseline."""
+
+    def __init__(self, student_id, evaluation_id, grade, weight_percentage):
+        """Initialize a DictEvaluation with the same fields as Evaluation."""
+        self.student_id = student_id
+        self.evaluation_id = evaluation_id
+        self.grade = grade
+        self.weight_percentage = weight_percentage
+
+
+def _rows(count):
+    """Yield (student_id, evaluation_id, grade, weight) synthetic rows."""
+    student_ids = [f"S{i:07d}" for i in
+                   range(count // EVALUATIONS_PER_STUDENT + 1)]
+    evaluation_ids = [f"E{i:03d}" for i in range(EVALUATIONS_PER_STUDENT)]
+    for i in range(count):
+        yield (student_ids[i // EVALUATIONS_PER_STUDENT],
+               evaluation_ids[i % EVALUATIONS_PER_STUDENT],
+               float(i % 21), 10.0)
+
+
+def _measure(label, build, count):
+    """Measure peak traced memory and build time of one layout."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    holder = build(count)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del holder
+    return {
+        "layout": label,
+        "bytes": current,
+        "bytes_per_evaluation": current / count,
+        "build_seconds": elapsed,
+    }
+
+
+def build_dict_objects(count):
+    """Build a list of dict-backed evaluation objects."""
+    return [DictEvaluation(*row) for row in _rows(count)]
+
+
+def build_slotted_objects(count):
+    """Build a list of slotted Evaluation objects."""
+    return [Evaluation(*row) for row in _rows(count)]
+
+
+def build_store(count):
+    """Build a columnar EvaluationStore."""
+    store = EvaluationStore()
+    evaluations = {}
+    for row in _rows(count):
+        student_id = row[0]
+        if student_id not in evaluations:
+            evaluations[student_id] = store.bind_student(student_id)
+        evaluations[student_id].append(Evaluation(*row))
+    return store
+
+
+def run(count):
+    """Run the memory comparison and return one result per layout."""
+    return [
+        _measure("dict objects", build_dict_objects, count),
+        _measure("slotted Evaluation", build_slotted_objects, count),
+        _measure("EvaluationStore", build_store, count),
+    ]
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=1_000_000,
+                        help="number of evaluations to load")
+    args = parser.parse_args(argv)
+
+    results = run(args.count)
+    baseline = results[0]["bytes"]
+    print(f"{'layout':<20} {'MiB':>9} {'B/eval':>8} {'saving':>8} "
+          f"{'build s':>8}")
+    for result in results:
+        saving = 1 - result["bytes"] / baseline
+        print(f"{result['layout']:<20} {result['bytes'] / 2**20:>9.1f} "
+              f"{result['bytes_per_evaluation']:>8.1f} {saving:>8.1%} "
+              f"{result['build_seconds']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Startup benchmark for memory-mapped snapshots.
+
+Builds a synthetic term (about --evaluations evaluations), writes it as a
+snapshot and compares:
+- rebuilding the app by replaying add_student/add_evaluation
+- starting the app from the snapshot (GradeCalculatorApp(snapshot=...))
+- get_student_final_grade latency on the mapped snapshot
+
+Usage:
+    python benchmarks/bench_snapshot.py [--evaluations N] [--seed S]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add grade_calculator directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..',
+                                'grade_calculator'))
+
+from bench_calculator import generate_cohort, summarize  # noqa: E402
+from main import GradeCalculatorApp  # noqa: E402
+from snapshot import write_snapshot  # noqa: E402
+
+
+def main(argv=None) -> int:
+    """Command line entry point; returns the process exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--evaluations", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    # Cohorts average 5.5 evaluations per student
+    cohort = list(generate_cohort(max(1, args.evaluations * 2 // 11),
+                                  args.seed))
+    start = time.perf_counter()
+    app = GradeCalculatorApp(load_sample_data=False)
+    for student_id, name, evaluations in cohort:
+        app.add_student(student_id, name)
+        for evaluation_id, grade, weight in evaluations:
+            app.add_evaluation(student_id, evaluation_id, grade, weight)
+    replay = time.perf_counter() - start
+    total = sum(len(evaluations) for _, _, evaluations in cohort)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "term.snap")
+        start = time.perf_counter()
+        write_snapshot(app, path)
+        written = time.perf_counter() - start
+
+        start = time.perf_counter()
+        mapped = GradeCalculatorApp(load_sample_data=False, snapshot=path)
+        opened = time.perf_counter() - start
+
+        samples = []
+        for student_id, _, _ in cohort[::max(1, len(cohort) // 10_000)]:
+            begin = time.perf_counter_ns()
+            mapped.get_student_final_grade(student_id, 85.0, 1.0)
+            samples.append(time.perf_counter_ns() - begin)
+        size = os.path.getsize(path)
+        mapped.close()
+
+    stats = summarize(samples)
+    print(f"students: {len(cohort)}  evaluations: {total}  "
+          f"snapshot: {size / 1e6:.1f} MB")
+    print(f"{'replay inserts':<20} {replay * 1000:10.1f} ms")
+    print(f"{'write snapshot':<20} {written * 1000:10.1f} ms")
+    print(f"{'start from snapshot':<20} {opened * 1000:10.3f} ms")
+    print(f"{'final grade p50':<20} {stats['p50']:10.4f} ms")
+    print(f"{'final grade p99':<20} {stats['p99']:10.4f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
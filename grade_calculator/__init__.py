@@ -4,25 +4,118 @@ CS-GradeCalculator Package
 A comprehensive grade calculation system for managing student evaluations,
 attendance policies, and final grade calculations.
 
+The public names are imported lazily (PEP 562) on first attribute access,
+so "from grade_calculator import GradeCalculator" does not load the
+terminal application, storage or concurrency modules.
+
 Author: UTEC Software Engineering
 Course: CS3081 - Software Engineering
 """
+import importlib
+from typing import TYPE_CHECKING
 
-from .evaluation import Evaluation
-from .student import Student
-from .teacher import Teacher
-from .grade_calculator import GradeCalculator
-from .attendance_policy import AttendancePolicy
-from .extra_points_policy import ExtraPointsPolicy
-from .main import GradeCalculatorApp
+if TYPE_CHECKING:
+    from .evaluation import Evaluation
+    from .evaluation_store import EvaluationStore, EvaluationView
+    from .student import Student
+    from .teacher import Teacher
+    from .grade_calculator import GradeCalculator
+    from .attendance_policy import AttendancePolicy
+    from .extra_points_policy import ExtraPointsPolicy
+    from .main import GradeCalculatorApp
+    from .concurrency import ConcurrentGradeCalculatorApp, SessionLimitError
+    from .storage import StorageBackend, SQLiteStorage
+    from .snapshot import Snapshot, write_snapshot
+    from .wal import WriteAheadLog
+    from .ranking import GradeRanking, RankingEngine
+    from .sketch import GradeSketch
+    from .scenarios import PolicySweep
+    from .metrics import Metrics, enable_metrics, disable_metrics, get_metrics
+    from .tracing import (Tracer, Span, ListSink, ChromeTraceSink, set_tracer,
+                          get_tracer)
 
 __version__ = "1.0.0"
 __all__ = [
     "Evaluation",
+    "EvaluationStore",
+    "EvaluationView",
     "Student",
     "Teacher",
     "GradeCalculator",
     "AttendancePolicy",
     "ExtraPointsPolicy",
-    "GradeCalculatorApp"
+    "GradeCalculatorApp",
+    "ConcurrentGradeCalculatorApp",
+    "SessionLimitError",
+    "StorageBackend",
+    "SQLiteStorage",
+    "Snapshot",
+    "write_snapshot",
+    "WriteAheadLog",
+    "GradeRanking",
+    "RankingEngine",
+    "GradeSketch",
+    "PolicySweep",
+    "Metrics",
+    "enable_metrics",
+    "disable_metrics",
+    "get_metrics",
+    "Tracer",
+    "Span",
+    "ListSink",
+    "ChromeTraceSink",
+    "set_tracer",
+    "get_tracer"
 ]
+
+# Public name -> submodule defining it
+_LAZY_ATTRIBUTES = {
+    "Evaluation": "evaluation",
+    "EvaluationStore": "evaluation_store",
+    "EvaluationView": "evaluation_store",
+    "Student": "student",
+    "Teacher": "teacher",
+    "GradeCalculator": "grade_calculator",
+    "AttendancePolicy": "attendance_policy",
+    "ExtraPointsPolicy": "extra_points_policy",
+    "GradeCalculatorApp": "main",
+    "ConcurrentGradeCalculatorApp": "concurrency",
+    "SessionLimitError": "concurrency",
+    "StorageBackend": "storage",
+    "SQLiteStorage": "storage",
+    "Snapshot": "snapshot",
+    "write_snapshot": "snapshot",
+    "WriteAheadLog": "wal",
+    "GradeRanking": "ranking",
+    "RankingEngine": "ranking",
+    "GradeSketch": "sketch",
+    "PolicySweep": "scenarios",
+    "Metrics": "metrics",
+    "enable_metrics": "metrics",
+    "disable_metrics": "metrics",
+    "get_metrics": "metrics",
+    "Tracer": "tracing",
+    "Span": "tracing",
+    "ListSink": "tracing",
+    "ChromeTraceSink": "tracing",
+    "set_tracer": "tracing",
+    "get_tracer": "tracing",
+}
+
+
+def __getattr__(name: str):
+    """Import a public name from its submodule on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__),
+                    name)
+    # Cache it, so later lookups no longer reach __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List the public names along with the loaded module attributes."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,104 @@
+"""
+Cache module for memoizing grade calculations.
+
+This module contains the LRUCache class, a small least-recently-used cache
+with hit, miss and eviction counters. It is safe to share between threads.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+
+class LRUCache:
+    """Least-recently-used cache with usage statistics."""
+
+    def __init__(self, maxsize: int = 1024):
+        """
+        Initialize an LRUCache.
+
+        Args:
+            maxsize: Maximum number of entries kept (default: 1024)
+
+        Raises:
+            ValueError: If maxsize is not positive
+        """
+        if maxsize <= 0:
+            raise ValueError("Cache size must be greater than 0")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Look up an entry and mark it as recently used.
+
+        Args:
+            key: The cache key
+            default: Value returned when the key is missing
+
+        Returns:
+            The cached value, or default on a miss
+        """
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Store an entry, evicting the least recently used one if full.
+
+        Args:
+            key: The cache key
+            value: The value to cache
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every entry (statistics are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the cache usage statistics.
+
+        Returns:
+            Dict with 'hits', 'misses', 'evictions', 'size' and 'maxsize'
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize
+            }
+
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Return True if key is cached (does not count as a hit)."""
+        return key in self._entries
+
+    def __repr__(self) -> str:
+        """Return a string representation of the LRUCache."""
+        return (
+            f"LRUCache(size={len(self._entries)}, maxsize={self.maxsize}, "
+            f"hits={self.hits}, misses={self.misses})"
+        )
@@ -0,0 +1,504 @@
+"""
+Concurrency module for serving many users from one GradeCalculatorApp.
+
+This module contains a reader/writer lock, a sharded set of those locks
+keyed by student_id, a session limiter that enforces
+GradeCalculatorApp.MAX_CONCURRENT_USERS (RNF02) and the thread-safe
+ConcurrentGradeCalculatorApp built on top of them. Every thread-safe entry
+point of the app runs inside a session, so the cap holds for library
+callers as well as for the HTTP service.
+"""
+import functools
+import threading
+import zlib
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Iterable, Iterator, List, Optional
+
+# Support both direct execution and package imports
+try:
+    from .main import GradeCalculatorApp, compacting
+    from .evaluation import Evaluation
+    from .evaluation_store import EvaluationStore
+    from .sketch import GradeSketch
+except (ImportError, ValueError):
+    from main import GradeCalculatorApp, compacting
+    from evaluation import Evaluation
+    from evaluation_store import EvaluationStore
+    from sketch import GradeSketch
+
+if TYPE_CHECKING:
+    from .storage import StorageBackend
+    from .wal import WriteAheadLog
+
+
+class SessionLimitError(RuntimeError):
+    """Raised when no session slot is free within the allowed wait."""
+
+
+class ReadWriteLock:
+    """Lock allowing many concurrent readers or a single writer.
+
+    Waiting writers block new readers, so a steady stream of grade reads
+    cannot starve evaluation writes. The lock is not reentrant.
+    """
+
+    def __init__(self):
+        """Initialize an unlocked ReadWriteLock."""
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    def acquire_read(self) -> None:
+        """Acquire the lock for reading."""
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        """Release a read acquisition."""
+        with self._condition:
+            self._readers -= 1
+            if self._readers == 0:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """Acquire the lock for writing."""
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+
+    def release_write(self) -> None:
+        """Release a write acquisition."""
+        with self._condition:
+            self._writer = False
+            self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self) -> Iterator[None]:
+        """Context manager holding the lock for reading."""
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self) -> Iterator[None]:
+        """Context manager holding the lock for writing."""
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+class ShardedLocks:
+    """Fixed set of reader/writer locks selected by key hash."""
+
+    DEFAULT_SHARD_COUNT = 64
+
+    def __init__(self, shard_count: int = DEFAULT_SHARD_COUNT):
+        """
+        Initialize the ShardedLocks.
+
+        Args:
+            shard_count: Number of independent locks (default: 64)
+
+        Raises:
+            ValueError: If shard_count is not positive
+        """
+        if shard_count <= 0:
+            raise ValueError("Shard count must be greater than 0")
+        self.locks: List[ReadWriteLock] = [
+            ReadWriteLock() for _ in range(shard_count)
+        ]
+
+    def for_key(self, key: str) -> ReadWriteLock:
+        """
+        Get the lock guarding a key.
+
+        Args:
+            key: The key (e.g. a student_id)
+
+        Returns:
+            The ReadWriteLock of the key's shard
+        """
+        return self.locks[zlib.crc32(key.encode("utf-8")) % len(self.locks)]
+
+    @contextmanager
+    def all_read_locked(self) -> Iterator[None]:
+        """Context manager holding every shard for reading, in order."""
+        acquired = []
+        try:
+            for lock in self.locks:
+                lock.acquire_read()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release_read()
+
+
+class SessionLimiter:
+    """Admission control capping the number of concurrent sessions."""
+
+    def __init__(self, max_sessions: int):
+        """
+        Initialize a SessionLimiter.
+
+        Args:
+            max_sessions: Maximum number of simultaneous sessions
+
+        Raises:
+            ValueError: If max_sessions is not positive
+        """
+        if max_sessions <= 0:
+            raise ValueError("Maximum sessions must be greater than 0")
+        self.max_sessions = max_sessions
+        self._slots = threading.BoundedSemaphore(max_sessions)
+        self._lock = threading.Lock()
+        self._active = 0
+
+    @property
+    def active_sessions(self) -> int:
+        """Return the number of sessions currently admitted."""
+        return self._active
+
+    def acquire(self, timeout: Optional[float] = 0.0) -> None:
+        """
+        Admit a new session.
+
+        Args:
+            timeout: Seconds to wait for a free slot (0: fail immediately,
+                     None: wait forever)
+
+        Raises:
+            SessionLimitError: If no slot became free in time
+        """
+        if timeout is None:
+            admitted = self._slots.acquire()
+        elif timeout <= 0:
+            admitted = self._slots.acquire(blocking=False)
+        else:
+            admitted = self._slots.acquire(timeout=timeout)
+        if not admitted:
+            raise SessionLimitError(
+                f"Maximum of {self.max_sessions} concurrent users reached"
+            )
+        with self._lock:
+            self._active += 1
+
+    def release(self) -> None:
+        """Release the slot of a finished session."""
+        with self._lock:
+            self._active -= 1
+        self._slots.release()
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = 0.0) -> Iterator[None]:
+        """Context manager admitting one session for its duration."""
+        self.acquire(timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+def admitted(method):
+    """Run an app method inside a session unless its thread is in one.
+
+    Calls outside app.session() are admitted for their own duration,
+    waiting up to ADMISSION_TIMEOUT seconds for a free slot; calls made
+    while the thread already holds a session (including nested calls)
+    use that session.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if getattr(self._sessions, "depth", 0):
+            return method(self, *args, **kwargs)
+        with self.session(self.ADMISSION_TIMEOUT):
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class ConcurrentGradeCalculatorApp(GradeCalculatorApp):
+    """GradeCalculatorApp that is safe to share between threads.
+
+    The student and teacher registries are guarded by one reader/writer
+    lock and each student by a sharded reader/writer lock, so grade reads
+    for any students run in parallel while an evaluation write only
+    blocks readers of the same shard. Locks are always taken in the order
+    registry, then shards.
+
+    At most MAX_CONCURRENT_USERS threads use the app at a time: a thread
+    holds a slot inside session(), and the public methods below admit
+    callers that did not open one.
+    """
+
+    # Seconds a call outside session() waits for a free slot before
+    # raising SessionLimitError
+    ADMISSION_TIMEOUT = 5.0
+
+    def __init__(self, load_sample_data=True,
+                 evaluation_store: Optional[EvaluationStore] = None,
+                 lock_shards: int = ShardedLocks.DEFAULT_SHARD_COUNT,
+                 storage: Optional["StorageBackend"] = None,
+                 snapshot: Optional[str] = None,
+                 wal: Optional["WriteAheadLog"] = None):
+        """Initialize the concurrent Grade Calculator application.
+
+        Args:
+            load_sample_data: Whether to load sample data on initialization
+            evaluation_store: Optional columnar store shared by all students
+            lock_shards: Number of per-student lock shards
+            storage: Optional backend loaded from and written through to
+            snapshot: Optional snapshot file to memory-map at startup
+            wal: Optional write-ahead log replayed and appended to
+        """
+        # Locks must exist before the base class loads sample data
+        self._registry_lock = ReadWriteLock()
+        self._student_locks = ShardedLocks(lock_shards)
+        self._store_lock = threading.RLock()  # re-entered on materialization
+        self.session_limiter = SessionLimiter(self.MAX_CONCURRENT_USERS)
+        self._sessions = threading.local()  # session depth per thread
+        super().__init__(load_sample_data, evaluation_store, storage,
+                         snapshot, wal)
+
+    @contextmanager
+    def session(self, timeout: Optional[float] = 0.0) -> Iterator[None]:
+        """
+        Admit a user session, capped at MAX_CONCURRENT_USERS.
+
+        The session belongs to the calling thread; app calls made by the
+        thread inside it are not admitted again, and a nested session()
+        reuses the slot.
+
+        Args:
+            timeout: Seconds to wait for a free slot (0: fail immediately,
+                     None: wait forever)
+
+        Raises:
+            SessionLimitError: If the limit is reached (on entering)
+        """
+        depth = getattr(self._sessions, "depth", 0)
+        if depth == 0:
+            self.session_limiter.acquire(timeout)
+        self._sessions.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._sessions.depth = depth
+            if depth == 0:
+                self.session_limiter.release()
+
+    @admitted
+    @compacting
+    def add_teacher(self, teacher_id: str, name: str, course: str) -> None:
+        """Add a teacher to the system (thread-safe)."""
+        with self._registry_lock.write_locked():
+            super().add_teacher(teacher_id, name, course)
+
+    @admitted
+    @compacting
+    def add_student(self, student_id: str, name: str) -> None:
+        """Add a student to the system (thread-safe)."""
+        with self._registry_lock.write_locked():
+            with self._student_locks.for_key(student_id).write_locked():
+                super().add_student(student_id, name)
+
+    @admitted
+    @compacting
+    def add_new_student(self, student_id: str, name: str) -> bool:
+        """Add a student unless it already exists (thread-safe)."""
+        with self._registry_lock.write_locked():
+            with self._student_locks.for_key(student_id).write_locked():
+                return super().add_new_student(student_id, name)
+
+    @admitted
+    @compacting
+    def enroll_student(self, teacher_id: str, student_id: str) -> bool:
+        """Enroll a student with a teacher (thread-safe)."""
+        with self._registry_lock.write_locked():
+            return super().enroll_student(teacher_id, student_id)
+
+    @admitted
+    def checkpoint(self, path: Optional[str] = None) -> None:
+        """Save a snapshot and truncate the log (thread-safe).
+
+        Holds the registry for writing, which excludes every reader and
+        writer of every shard while the snapshot is written and remapped.
+        """
+        with self._registry_lock.write_locked():
+            super().checkpoint(path)
+
+    @admitted
+    def get_teachers_by_course(self, course: str):
+        """Get the teachers of a course (thread-safe)."""
+        with self._registry_lock.read_locked():
+            return super().get_teachers_by_course(course)
+
+    @admitted
+    def get_teacher_students(self, teacher_id: str):
+        """Get the students enrolled with a teacher (thread-safe)."""
+        with self._registry_lock.read_locked():
+            return super().get_teacher_students(teacher_id)
+
+    @admitted
+    def get_teacher_evaluations(self, teacher_id: str):
+        """Get the evaluations of a teacher's students (thread-safe)."""
+        with self._registry_lock.read_locked():
+            with self._student_locks.all_read_locked():
+                return super().get_teacher_evaluations(teacher_id)
+
+    @admitted
+    @compacting
+    def add_evaluation(self, student_id: str, evaluation_id: str,
+                       grade: float, weight_percentage: float = 100.0) -> bool:
+        """Add an evaluation for a student (thread-safe)."""
+        with self._registry_lock.read_locked():
+            with self._student_locks.for_key(student_id).write_locked():
+                if self.evaluation_store is None:
+                    return super().add_evaluation(student_id, evaluation_id,
+                                                  grade, weight_percentage)
+                # The shared store columns are not covered by shard locks
+                with self._store_lock:
+                    return super().add_evaluation(student_id, evaluation_id,
+                                                  grade, weight_percentage)
+
+    def _materialize_student(self, student_id: str):
+        """Copy a snapshot student into memory (thread-safe)."""
+        # Readers of different shards may materialize at the same time
+        with self._store_lock:
+            return super()._materialize_student(student_id)
+
+    @admitted
+    @compacting
+    def add_evaluations_bulk(self, evaluations: Iterable[Evaluation]) -> int:
+        """Add already validated evaluations (thread-safe)."""
+        added = 0
+        with self._registry_lock.read_locked():
+            for evaluation in evaluations:
+                lock = self._student_locks.for_key(evaluation.student_id)
+                with lock.write_locked(), self._store_lock:
+                    self._insert_evaluation(evaluation)
+                added += 1
+        return added
+
+    @admitted
+    def search_students(self, prefix: str, limit: int = 10):
+        """Find students by the beginning of their name (thread-safe)."""
+        with self._registry_lock.read_locked():
+            return super().search_students(prefix, limit)
+
+    @admitted
+    def fuzzy_search_students(self, query: str, limit: int = 10):
+        """Find students with a similar name (thread-safe)."""
+        with self._registry_lock.read_locked():
+            return super().fuzzy_search_students(query, limit)
+
+    @admitted
+    def get_student_final_grade(self, student_id: str,
+                                attendance_percentage: float = 100.0,
+                                extra_points: float = 0.0,
+                                reached_minimum_attendance: bool = True
+                                ) -> Optional[tuple]:
+        """Calculate final grade for a student (thread-safe)."""
+        with self._registry_lock.read_locked():
+            with self._student_locks.for_key(student_id).read_locked():
+                return super().get_student_final_grade(
+                    student_id, attendance_percentage, extra_points,
+                    reached_minimum_attendance
+                )
+
+    @admitted
+    def get_student_required_grade(self, student_id: str,
+                                   remaining_weights: List[float],
+                                   target_grade: Optional[float] = None,
+                                   attendance_percentage: float = 100.0,
+                                   extra_points: float = 0.0,
+                                   reached_minimum_attendance: bool = True
+                                   ) -> Optional[tuple]:
+        """Calculate a student's required grade (thread-safe)."""
+        with self._registry_lock.read_locked():
+            with self._student_locks.for_key(student_id).read_locked():
+                return super().get_student_required_grade(
+                    student_id, remaining_weights, target_grade,
+                    attendance_percentage, extra_points,
+                    reached_minimum_attendance
+                )
+
+    @admitted
+    def get_required_grades(self, remaining_weights: List[float],
+                            target_grade: Optional[float] = None,
+                            inputs: Optional[dict] = None,
+                            at_risk_only: bool = False) -> dict:
+        """Calculate every student's required grade (thread-safe)."""
+        with self._registry_lock.read_locked():
+            with self._student_locks.all_read_locked():
+                return super().get_required_grades(
+                    remaining_weights, target_grade, inputs, at_risk_only)
+
+    @admitted
+    def display_grade_report(self, student_id: str,
+                             attendance_percentage: float = 100.0,
+                             extra_points: float = 0.0,
+                             reached_minimum_attendance: bool = True) -> None:
+        """Display grade report for a student (thread-safe)."""
+        with self._registry_lock.read_locked():
+            with self._student_locks.for_key(student_id).read_locked():
+                super().display_grade_report(
+                    student_id, attendance_percentage, extra_points,
+                    reached_minimum_attendance
+                )
+
+    @admitted
+    def _lookup_report(self, student_id: str, attendance_percentage: float,
+                       extra_points: float,
+                       reached_minimum_attendance: bool,
+                       operation: str = "get_grade_report"):
+        """Validate the student and return its report (thread-safe)."""
+        with self._registry_lock.read_locked():
+            with self._student_locks.for_key(student_id).read_locked():
+                return super()._lookup_report(
+                    student_id, attendance_percentage, extra_points,
+                    reached_minimum_attendance, operation
+                )
+
+    @admitted
+    def grade_all_students(self, inputs: Optional[dict] = None,
+                           processes: Optional[int] = None,
+                           sketch: Optional[GradeSketch] = None) -> dict:
+        """Calculate the final grade of every student (thread-safe)."""
+        with self._registry_lock.read_locked():
+            with self._student_locks.all_read_locked():
+                return super().grade_all_students(inputs, processes, sketch)
+
+    @admitted
+    def get_grade_distribution(self, course: Optional[str] = None,
+                               inputs: Optional[dict] = None,
+                               processes: Optional[int] = None,
+                               bin_count: int = GradeSketch.DEFAULT_BIN_COUNT
+                               ) -> GradeSketch:
+        """Sketch a course's or the cohort's final grades (thread-safe)."""
+        with self._registry_lock.read_locked():
+            with self._student_locks.all_read_locked():
+                return super().get_grade_distribution(course, inputs,
+                                                      processes, bin_count)
+
+    @admitted
+    def sweep_policies(self, minimum_attendances: Optional[list] = None,
+                       penalty_percentages: Optional[list] = None,
+                       extra_points_values: Optional[list] = None,
+                       inputs: Optional[dict] = None,
+                       passing_grade: Optional[float] = None) -> List[dict]:
+        """Grade every student under a policy grid (thread-safe)."""
+        with self._registry_lock.read_locked():
+            with self._student_locks.all_read_locked():
+                return super().sweep_policies(
+                    minimum_attendances, penalty_percentages,
+                    extra_points_values, inputs, passing_grade)
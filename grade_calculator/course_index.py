@@ -0,0 +1,113 @@
+"""
+Course index module for course, teacher and enrollment lookups.
+
+This module contains the CourseIndex class, which keeps course -> teachers,
+the set of all-years teachers and teacher <-> student enrollments in
+dictionaries updated on every insert, so course dashboards never scan the
+full teacher or student registries.
+"""
+from typing import Dict, List
+
+
+def normalize_course(course: str) -> str:
+    """
+    Normalize a course name for lookups (case and spacing ignored).
+
+    Args:
+        course: The course name
+
+    Returns:
+        The normalized course key
+    """
+    return " ".join(course.casefold().split())
+
+
+class CourseIndex:
+    """Insert-maintained indexes over teachers, courses and enrollments.
+
+    Ordered dicts are used as insertion-ordered sets, so every lookup
+    returns IDs in the order they were added.
+    """
+
+    def __init__(self):
+        """Initialize an empty CourseIndex."""
+        self._teacher_course: Dict[str, str] = {}
+        self._course_teachers: Dict[str, Dict[str, None]] = {}
+        self._all_years: Dict[str, None] = {}
+        self._teacher_students: Dict[str, Dict[str, None]] = {}
+        self._student_teachers: Dict[str, Dict[str, None]] = {}
+
+    def add_teacher(self, teacher_id: str, course: str,
+                    all_years: bool) -> None:
+        """
+        Index a teacher, moving it if it was indexed under another course.
+
+        Args:
+            teacher_id: The teacher identifier
+            course: Course taught by the teacher
+            all_years: Whether the teacher teaches across all years
+        """
+        old_course = self._teacher_course.get(teacher_id)
+        if old_course is not None:
+            teachers = self._course_teachers[old_course]
+            del teachers[teacher_id]
+            if not teachers:
+                del self._course_teachers[old_course]
+        key = normalize_course(course)
+        self._teacher_course[teacher_id] = key
+        self._course_teachers.setdefault(key, {})[teacher_id] = None
+        if all_years:
+            self._all_years[teacher_id] = None
+        else:
+            self._all_years.pop(teacher_id, None)
+
+    def enroll(self, teacher_id: str, student_id: str) -> bool:
+        """
+        Record that a student is taught by a teacher.
+
+        Args:
+            teacher_id: The teacher identifier
+            student_id: The student identifier
+
+        Returns:
+            True if the enrollment is new
+        """
+        students = self._teacher_students.setdefault(teacher_id, {})
+        if student_id in students:
+            return False
+        students[student_id] = None
+        self._student_teachers.setdefault(student_id, {})[teacher_id] = None
+        return True
+
+    def get_teacher_ids_by_course(self, course: str) -> List[str]:
+        """Return the IDs of the teachers of a course."""
+        return list(self._course_teachers.get(normalize_course(course), ()))
+
+    def get_all_years_teacher_ids(self) -> List[str]:
+        """Return the IDs of the all-years teachers."""
+        return list(self._all_years)
+
+    def get_student_ids(self, teacher_id: str) -> List[str]:
+        """Return the IDs of the students enrolled with a teacher."""
+        return list(self._teacher_students.get(teacher_id, ()))
+
+    def get_teacher_ids(self, student_id: str) -> List[str]:
+        """Return the IDs of the teachers a student is enrolled with."""
+        return list(self._student_teachers.get(student_id, ()))
+
+    def get_enrollments(self) -> List[tuple]:
+        """Return every (teacher_id, student_id), grouped by teacher."""
+        return [(teacher_id, student_id)
+                for teacher_id, students in self._teacher_students.items()
+                for student_id in students]
+
+    def get_courses(self) -> List[str]:
+        """Return the normalized names of every indexed course."""
+        return list(self._course_teachers)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the CourseIndex."""
+        return (
+            f"CourseIndex(courses={len(self._course_teachers)}, "
+            f"teachers={len(self._teacher_course)})"
+        )
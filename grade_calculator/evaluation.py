@@ -9,6 +9,8 @@ evaluation record for a course.
 class Evaluation:
     """Represents an evaluation record for a student."""
 
+    __slots__ = ("student_id", "evaluation_id", "grade", "weight_percentage")
+
     MIN_GRADE = 0.0
     MAX_GRADE = 20.0
     DEFAULT_WEIGHT_PERCENTAGE = 100.0
@@ -28,18 +30,33 @@ class Evaluation:
             ValueError: If grade is not in valid range
             ValueError: If weight_percentage is not in valid range
         """
-        if not (self.MIN_GRADE <= grade <= self.MAX_GRADE):
-            raise ValueError(
-                f"Grade must be between {self.MIN_GRADE} and {self.MAX_GRADE}"
-            )
-        if not (0 < weight_percentage <= 100):
-            raise ValueError("Weight percentage must be between 0 and 100")
+        self.validate(grade, weight_percentage)
 
         self.student_id = student_id
         self.evaluation_id = evaluation_id
         self.grade = grade
         self.weight_percentage = weight_percentage
 
+    @classmethod
+    def validate(cls, grade: float, weight_percentage: float) -> None:
+        """
+        Check that a grade and weight are within the allowed ranges.
+
+        Args:
+            grade: The grade obtained (0-20)
+            weight_percentage: Weight percentage of the evaluation
+
+        Raises:
+            ValueError: If grade is not in valid range
+            ValueError: If weight_percentage is not in valid range
+        """
+        if not (cls.MIN_GRADE <= grade <= cls.MAX_GRADE):
+            raise ValueError(
+                f"Grade must be between {cls.MIN_GRADE} and {cls.MAX_GRADE}"
+            )
+        if not (0 < weight_percentage <= 100):
+            raise ValueError("Weight percentage must be between 0 and 100")
+
     def get_weighted_grade(self) -> float:
         """
         Calculate the weighted grade.
@@ -6,6 +6,8 @@ Standalone evaluation module - Direct imports version.
 class Evaluation:
     """Represents an evaluation record for a student."""
 
+    __slots__ = ("student_id", "evaluation_id", "grade", "weight_percentage")
+
     MIN_GRADE = 0.0
     MAX_GRADE = 20.0
     DEFAULT_WEIGHT_PERCENTAGE = 100.0
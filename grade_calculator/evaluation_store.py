@@ -0,0 +1,329 @@
+"""
+Evaluation store module for compact, column-oriented evaluation storage.
+
+This module contains the EvaluationStore class that keeps every evaluation
+as a row in packed ``array`` columns instead of one Python object per
+grade, plus lightweight views that let existing code keep working with
+Evaluation-like objects. Rows of removed evaluations go to a free list
+and are reused, so the columns only grow with the live evaluations.
+"""
+from array import array
+from typing import Dict, Iterator, List
+
+# Support both direct execution and package imports
+try:
+    from .evaluation import Evaluation
+except (ImportError, ValueError):
+    from evaluation import Evaluation
+
+
+class EvaluationView:
+    """
+    Read-only Evaluation-like view over one row of an EvaluationStore.
+
+    A view is valid while its evaluation stays attached to the student;
+    the row of a removed evaluation is reused by later ones.
+    """
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "EvaluationStore", row: int):
+        """
+        Initialize an EvaluationView.
+
+        Args:
+            store: The store holding the evaluation data
+            row: Row number of the evaluation inside the store
+        """
+        self._store = store
+        self._row = row
+
+    @property
+    def student_id(self) -> str:
+        """Return the student identifier of the evaluation."""
+        return self._store.student_ids[self._store.student_index[self._row]]
+
+    @property
+    def evaluation_id(self) -> str:
+        """Return the evaluation identifier."""
+        return self._store.evaluation_ids[
+            self._store.evaluation_code[self._row]
+        ]
+
+    @property
+    def grade(self) -> float:
+        """Return the grade obtained."""
+        return self._store.grades[self._row]
+
+    @property
+    def weight_percentage(self) -> float:
+        """Return the weight percentage of the evaluation."""
+        return self._store.weights[self._row]
+
+    def get_weighted_grade(self) -> float:
+        """
+        Calculate the weighted grade.
+
+        Returns:
+            The weighted grade value
+        """
+        return self.grade * (self.weight_percentage / 100.0)
+
+    def __eq__(self, other) -> bool:
+        """Return True if both views point at the same stored row."""
+        if not isinstance(other, EvaluationView):
+            return NotImplemented
+        return self._store is other._store and self._row == other._row
+
+    def __hash__(self) -> int:
+        """Return a hash based on the store and row."""
+        return hash((id(self._store), self._row))
+
+    def __repr__(self) -> str:
+        """Return a string representation of the Evaluation."""
+        return (
+            f"Evaluation(student_id={self.student_id}, "
+            f"evaluation_id={self.evaluation_id}, grade={self.grade}, "
+            f"weight={self.weight_percentage}%)"
+        )
+
+
+class StudentEvaluations:
+    """List-like collection of one student's evaluations inside a store."""
+
+    __slots__ = ("_store", "_student_code", "_rows")
+
+    def __init__(self, store: "EvaluationStore", student_code: int,
+                 rows: array):
+        """
+        Initialize a StudentEvaluations collection.
+
+        Args:
+            store: The store holding the evaluation data
+            student_code: Interned code of the owning student
+            rows: Row numbers of the student's evaluations
+        """
+        self._store = store
+        self._student_code = student_code
+        self._rows = rows
+
+    @property
+    def rows(self) -> array:
+        """Return the row numbers of the student's evaluations."""
+        return self._rows
+
+    def append(self, evaluation) -> None:
+        """
+        Store an evaluation for the owning student.
+
+        Args:
+            evaluation: Evaluation (or Evaluation-like) object to store
+        """
+        self._rows.append(self._store.append_row(
+            self._student_code,
+            evaluation.evaluation_id,
+            evaluation.grade,
+            evaluation.weight_percentage
+        ))
+
+    def pop(self, index: int = -1) -> Evaluation:
+        """
+        Detach an evaluation from the student and free its row.
+
+        Args:
+            index: Position of the evaluation to detach (default: last)
+
+        Returns:
+            The detached evaluation, copied out of the store columns
+        """
+        store = self._store
+        row = self._rows.pop(index)
+        evaluation = Evaluation(
+            store.student_ids[self._student_code],
+            store.evaluation_ids[store.evaluation_code[row]],
+            store.grades[row],
+            store.weights[row]
+        )
+        store.free_row(row)
+        return evaluation
+
+    def copy(self) -> List[EvaluationView]:
+        """
+        Return a list of views over the student's evaluations.
+
+        Returns:
+            List of EvaluationView objects (the data itself is not copied)
+        """
+        return list(self)
+
+    def __len__(self) -> int:
+        """Return the number of evaluations."""
+        return len(self._rows)
+
+    def __bool__(self) -> bool:
+        """Return True if the student has any evaluation."""
+        return len(self._rows) > 0
+
+    def __getitem__(self, index):
+        """Return the view (or list of views for a slice) at index."""
+        if isinstance(index, slice):
+            return [EvaluationView(self._store, row)
+                    for row in self._rows[index]]
+        return EvaluationView(self._store, self._rows[index])
+
+    def __iter__(self) -> Iterator[EvaluationView]:
+        """Iterate over views of the student's evaluations."""
+        store = self._store
+        for row in self._rows:
+            yield EvaluationView(store, row)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the collection."""
+        return repr(self.copy())
+
+
+class EvaluationStore:
+    """Stores evaluations column-wise in packed arrays."""
+
+    def __init__(self):
+        """Initialize an empty EvaluationStore."""
+        self.student_index = array("I")
+        self.evaluation_code = array("I")
+        self.grades = array("d")
+        self.weights = array("d")
+        self.student_ids: List[str] = []
+        self.evaluation_ids: List[str] = []
+        self._student_codes: Dict[str, int] = {}
+        self._evaluation_codes: Dict[str, int] = {}
+        self._student_rows: List[array] = []
+        # Rows no student lists any more, reused before the columns grow
+        self._free_rows = array("I")
+
+    def _intern_student(self, student_id: str) -> int:
+        """Return the code of a student, registering it if needed."""
+        code = self._student_codes.get(student_id)
+        if code is None:
+            code = len(self.student_ids)
+            self._student_codes[student_id] = code
+            self.student_ids.append(student_id)
+            self._student_rows.append(array("I"))
+        return code
+
+    def _intern_evaluation(self, evaluation_id: str) -> int:
+        """Return the code of an evaluation id, registering it if needed."""
+        code = self._evaluation_codes.get(evaluation_id)
+        if code is None:
+            code = len(self.evaluation_ids)
+            self._evaluation_codes[evaluation_id] = code
+            self.evaluation_ids.append(evaluation_id)
+        return code
+
+    def bind_student(self, student_id: str) -> StudentEvaluations:
+        """
+        Start a fresh evaluation collection for a student.
+
+        Rows previously stored for the same student_id are freed for reuse
+        and the student's previous collection is left empty.
+
+        Args:
+            student_id: Unique identifier for the student
+
+        Returns:
+            The student's StudentEvaluations collection
+        """
+        code = self._intern_student(student_id)
+        previous = self._student_rows[code]
+        for row in previous:
+            self.free_row(row)
+        del previous[:]
+        rows = array("I")
+        self._student_rows[code] = rows
+        return StudentEvaluations(self, code, rows)
+
+    def append_row(self, student_code: int, evaluation_id: str,
+                   grade: float, weight_percentage: float) -> int:
+        """
+        Store one evaluation row, reusing a free row if there is one.
+
+        Args:
+            student_code: Interned code of the student
+            evaluation_id: Unique identifier for the evaluation
+            grade: The grade obtained (0-20)
+            weight_percentage: Weight percentage of the evaluation
+
+        Returns:
+            The row number of the new evaluation
+
+        Raises:
+            ValueError: If grade or weight_percentage are out of range
+        """
+        Evaluation.validate(grade, weight_percentage)
+        evaluation_code = self._intern_evaluation(evaluation_id)
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self.student_index[row] = student_code
+            self.evaluation_code[row] = evaluation_code
+            self.grades[row] = grade
+            self.weights[row] = weight_percentage
+            return row
+        row = len(self.grades)
+        self.student_index.append(student_code)
+        self.evaluation_code.append(evaluation_code)
+        self.grades.append(grade)
+        self.weights.append(weight_percentage)
+        return row
+
+    def free_row(self, row: int) -> None:
+        """
+        Release the row of a detached evaluation for reuse.
+
+        Args:
+            row: Row number that no student lists any more
+        """
+        self._free_rows.append(row)
+
+    @property
+    def capacity(self) -> int:
+        """Return the number of allocated rows, live or free."""
+        return len(self.grades)
+
+    def get_evaluations(self, student_id: str) -> List[EvaluationView]:
+        """
+        Get views over all evaluations of a student.
+
+        Args:
+            student_id: Unique identifier for the student
+
+        Returns:
+            List of EvaluationView objects (empty if the student is unknown)
+        """
+        code = self._student_codes.get(student_id)
+        if code is None:
+            return []
+        return [EvaluationView(self, row) for row in self._student_rows[code]]
+
+    def get_evaluation_count(self, student_id: str) -> int:
+        """
+        Get the number of evaluations stored for a student.
+
+        Args:
+            student_id: Unique identifier for the student
+
+        Returns:
+            The count of evaluations
+        """
+        code = self._student_codes.get(student_id)
+        if code is None:
+            return 0
+        return len(self._student_rows[code])
+
+    def __len__(self) -> int:
+        """Return the number of live evaluation rows."""
+        return len(self.grades) - len(self._free_rows)
+
+    def __repr__(self) -> str:
+        """Return a string representation of the EvaluationStore."""
+        return (
+            f"EvaluationStore(students={len(self.student_ids)}, "
+            f"evaluations={len(self)})"
+        )
@@ -9,6 +9,9 @@ applying extra points to students' grades.
 class ExtraPointsPolicy:
     """Defines the policy for applying extra points to students' grades."""
 
+    # Grades with extra points are capped here
+    MAX_GRADE = 20.0
+
     def __init__(self, extra_points_value: float = 1.0):
         """
         Initialize an ExtraPointsPolicy.
@@ -36,9 +39,8 @@ class ExtraPointsPolicy:
         Returns:
             The grade with extra points applied, capped at 20.0
         """
-        MAX_GRADE = 20.0
         result = grade + (extra_points_count * self.extra_points_value)
-        return min(result, MAX_GRADE)
+        return min(result, self.MAX_GRADE)
 
     def __repr__(self) -> str:
         """Return a string representation of the ExtraPointsPolicy."""
@@ -4,17 +4,28 @@ Grade calculator module for computing final grades.
 This module contains the GradeCalculator class that computes weighted
 averages, applies penalties and extra points, and generates grade reports.
 """
-from typing import List, Tuple, Dict
+import math
+from itertools import count
+from typing import (Iterable, List, Mapping, Tuple, Dict, Optional,
+                    Sequence)
 
 # Support both direct execution and package imports
 try:
     from .evaluation import Evaluation
     from .attendance_policy import AttendancePolicy
     from .extra_points_policy import ExtraPointsPolicy
+    from .metrics import instrumented, record_error
+    from .tracing import NULL_TRACER, current_tracer
 except (ImportError, ValueError):
     from evaluation import Evaluation
     from attendance_policy import AttendancePolicy
     from extra_points_policy import ExtraPointsPolicy
+    from metrics import instrumented, record_error
+    from tracing import NULL_TRACER, current_tracer
+
+# Policy versions are unique across all calculators, so replacing either
+# a policy or the whole calculator always yields a new version
+_policy_version_counter = count(1)
 
 
 class GradeCalculator:
@@ -24,6 +35,7 @@ class GradeCalculator:
     MAX_GRADE = 20.0
     MIN_GRADE = 0.0
     ATTENDANCE_PENALTY_PERCENTAGE = 0.1  # 10% penalty per missed class
+    PASSING_GRADE = 11.0  # lowest passing final grade
     MAX_CALCULATION_TIME_MS = 300  # milliseconds
 
     def __init__(self, attendance_policy: AttendancePolicy = None,
@@ -35,9 +47,32 @@ class GradeCalculator:
             attendance_policy: Policy for attendance requirements
             extra_points_policy: Policy for extra points application
         """
+        self.policy_version = 0
         self.attendance_policy = attendance_policy or AttendancePolicy()
         self.extra_points_policy = extra_points_policy or ExtraPointsPolicy()
 
+    @property
+    def attendance_policy(self) -> AttendancePolicy:
+        """Return the attendance policy in use."""
+        return self._attendance_policy
+
+    @attendance_policy.setter
+    def attendance_policy(self, policy: AttendancePolicy) -> None:
+        """Replace the attendance policy and bump the policy version."""
+        self._attendance_policy = policy
+        self.policy_version = next(_policy_version_counter)
+
+    @property
+    def extra_points_policy(self) -> ExtraPointsPolicy:
+        """Return the extra points policy in use."""
+        return self._extra_points_policy
+
+    @extra_points_policy.setter
+    def extra_points_policy(self, policy: ExtraPointsPolicy) -> None:
+        """Replace the extra points policy and bump the policy version."""
+        self._extra_points_policy = policy
+        self.policy_version = next(_policy_version_counter)
+
     def calculate_weighted_average(self,
                                     evaluations: List[Evaluation]) -> float:
         """
@@ -53,18 +88,43 @@ class GradeCalculator:
             ValueError: If evaluations list is empty
             ValueError: If exceeds maximum evaluations per student
         """
-        if not evaluations:
+        total_weighted = 0.0
+        total_weight = 0.0
+        for evaluation in evaluations:
+            total_weighted += evaluation.get_weighted_grade()
+            total_weight += evaluation.weight_percentage
+
+        return self.calculate_weighted_average_from_totals(
+            len(evaluations), total_weighted, total_weight
+        )
+
+    def calculate_weighted_average_from_totals(self, evaluation_count: int,
+                                               total_weighted: float,
+                                               total_weight: float) -> float:
+        """
+        Calculate the weighted average from precomputed aggregates.
+
+        Args:
+            evaluation_count: Number of evaluations
+            total_weighted: Sum of the weighted grades
+            total_weight: Sum of the weight percentages
+
+        Returns:
+            The weighted average grade
+
+        Raises:
+            ValueError: If there are no evaluations
+            ValueError: If exceeds maximum evaluations per student
+        """
+        if evaluation_count == 0:
             raise ValueError("No evaluations provided")
 
-        if len(evaluations) > self.MAX_EVALUATIONS_PER_STUDENT:
+        if evaluation_count > self.MAX_EVALUATIONS_PER_STUDENT:
             raise ValueError(
                 f"Maximum {self.MAX_EVALUATIONS_PER_STUDENT} evaluations "
                 f"allowed per student"
             )
 
-        total_weighted = sum(e.get_weighted_grade() for e in evaluations)
-        total_weight = sum(e.weight_percentage for e in evaluations)
-
         if total_weight == 0:
             raise ValueError("Total weight cannot be zero")
 
@@ -88,6 +148,7 @@ class GradeCalculator:
                   self.ATTENDANCE_PENALTY_PERCENTAGE
         return min(penalty, self.MAX_GRADE)
 
+    @instrumented("calculate_final_grade")
     def calculate_final_grade(
         self,
         evaluations: List[Evaluation],
@@ -113,14 +174,108 @@ class GradeCalculator:
         Raises:
             ValueError: If inputs are invalid
         """
-        weighted_avg = self.calculate_weighted_average(evaluations)
-        penalty = self.calculate_attendance_penalty(attendance_percentage)
+        tracer = current_tracer()
+        if tracer is NULL_TRACER:
+            return self._finalize_grade(
+                self.calculate_weighted_average(evaluations),
+                attendance_percentage, extra_points,
+                reached_minimum_attendance)
+        with tracer.span("calculate_final_grade"):
+            with tracer.span("weighted_average"):
+                weighted_avg = self.calculate_weighted_average(evaluations)
+            return self._finalize_grade(weighted_avg, attendance_percentage,
+                                        extra_points,
+                                        reached_minimum_attendance, tracer)
+
+    @instrumented("calculate_student_final_grade")
+    def calculate_student_final_grade(
+        self,
+        student,
+        attendance_percentage: float = 100.0,
+        extra_points: float = 0.0,
+        reached_minimum_attendance: bool = True
+    ) -> Tuple[float, Dict[str, float]]:
+        """
+        Calculate the final grade of a student from its running totals.
 
-        grade_after_penalty = max(
-            self.MIN_GRADE,
-            weighted_avg - penalty
-        )
+        Equivalent to calculate_final_grade(student.get_evaluations(), ...)
+        but reads the student's aggregates in O(1) instead of copying and
+        rescanning the evaluation list.
+
+        Args:
+            student: Student object exposing get_weighted_totals()
+            attendance_percentage: Student's attendance percentage
+            extra_points: Number of extra points earned
+            reached_minimum_attendance: Whether student reached minimum
+                                       attendance (RNF02 requirement)
+
+        Returns:
+            Tuple of (final_grade, details_dict), as calculate_final_grade
 
+        Raises:
+            ValueError: If inputs are invalid
+        """
+        tracer = current_tracer()
+        if tracer is NULL_TRACER:
+            return self._finalize_grade(
+                self.calculate_weighted_average_from_totals(
+                    *student.get_weighted_totals()),
+                attendance_percentage, extra_points,
+                reached_minimum_attendance)
+        with tracer.span("calculate_student_final_grade"):
+            with tracer.span("weighted_average"):
+                weighted_avg = self.calculate_weighted_average_from_totals(
+                    *student.get_weighted_totals()
+                )
+            return self._finalize_grade(weighted_avg, attendance_percentage,
+                                        extra_points,
+                                        reached_minimum_attendance, tracer)
+
+    def _finalize_grade(
+        self,
+        weighted_avg: float,
+        attendance_percentage: float,
+        extra_points: float,
+        reached_minimum_attendance: bool,
+        tracer=NULL_TRACER
+    ) -> Tuple[float, Dict[str, float]]:
+        """Apply penalty and extra points to a weighted average.
+
+        With a real tracer each stage runs in its own span; with
+        NULL_TRACER (tracing off) the stages run without entering spans.
+        """
+        if tracer is NULL_TRACER:
+            penalty, grade_after_penalty = self._penalize(
+                weighted_avg, attendance_percentage)
+            extra_points_applied, final_grade = self._add_extra_points(
+                grade_after_penalty, extra_points, reached_minimum_attendance)
+            return final_grade, self._grade_details(
+                weighted_avg, attendance_percentage, penalty,
+                grade_after_penalty, extra_points_applied, final_grade)
+
+        with tracer.span("attendance_penalty"):
+            penalty, grade_after_penalty = self._penalize(
+                weighted_avg, attendance_percentage)
+        with tracer.span("extra_points"):
+            extra_points_applied, final_grade = self._add_extra_points(
+                grade_after_penalty, extra_points, reached_minimum_attendance)
+        with tracer.span("details"):
+            details = self._grade_details(
+                weighted_avg, attendance_percentage, penalty,
+                grade_after_penalty, extra_points_applied, final_grade)
+        return final_grade, details
+
+    def _penalize(self, weighted_avg: float,
+                  attendance_percentage: float) -> Tuple[float, float]:
+        """Return (penalty, grade_after_penalty) of a weighted average."""
+        penalty = self.calculate_attendance_penalty(attendance_percentage)
+        return penalty, max(self.MIN_GRADE, weighted_avg - penalty)
+
+    def _add_extra_points(self, grade_after_penalty: float,
+                          extra_points: float,
+                          reached_minimum_attendance: bool
+                          ) -> Tuple[float, float]:
+        """Return (extra_points_applied, final_grade) of a penalized grade."""
         extra_points_applied = 0.0
         if reached_minimum_attendance:
             extra_points_applied = \
@@ -133,8 +288,15 @@ class GradeCalculator:
             self.MAX_GRADE,
             grade_after_penalty + extra_points_applied
         )
-
-        details = {
+        return extra_points_applied, final_grade
+
+    @staticmethod
+    def _grade_details(weighted_avg: float, attendance_percentage: float,
+                       penalty: float, grade_after_penalty: float,
+                       extra_points_applied: float,
+                       final_grade: float) -> Dict[str, float]:
+        """Build the details dict of calculate_final_grade."""
+        return {
             'weighted_average': round(weighted_avg, 2),
             'attendance_percentage': attendance_percentage,
             'attendance_penalty': round(penalty, 2),
@@ -143,8 +305,310 @@ class GradeCalculator:
             'final_grade': round(final_grade, 2)
         }
 
-        return final_grade, details
+    @instrumented("calculate_final_grades_batch")
+    def calculate_final_grades_batch(
+        self,
+        grades: Sequence[float],
+        weights: Sequence[float],
+        offsets: Sequence[int],
+        attendance_percentages: Sequence[float],
+        extra_points: Sequence[float],
+        reached_minimum_attendance: Optional[Sequence[bool]] = None
+    ) -> List[Tuple[float, Dict[str, float]]]:
+        """
+        Calculate final grades for a whole cohort in column passes.
+
+        Evaluations are given as flat columns; student ``i`` owns the rows
+        ``offsets[i]:offsets[i + 1]``. Each stage (weighted average,
+        penalty, extra points, final grade) runs as one pass over its
+        column, using the same arithmetic as calculate_final_grade so the
+        results are identical to grading the students one by one.
+
+        Args:
+            grades: Grade of every evaluation, grouped by student
+            weights: Weight percentage of every evaluation
+            offsets: Row offsets per student (length is students + 1)
+            attendance_percentages: Attendance percentage per student
+            extra_points: Extra points earned per student
+            reached_minimum_attendance: Per-student minimum attendance
+                                       flags (default: all True)
+
+        Returns:
+            List of (final_grade, details_dict) tuples, one per student,
+            in the same order as the offsets
+
+        Raises:
+            ValueError: If the columns are inconsistent
+            ValueError: If a student has no evaluations or too many
+        """
+        student_count = len(offsets) - 1
+        if student_count < 0:
+            raise ValueError("Offsets must contain at least one entry")
+        if len(grades) != len(weights):
+            raise ValueError("Grades and weights must have the same length")
+        if offsets[0] != 0 or offsets[-1] != len(grades):
+            raise ValueError("Offsets must span the evaluation columns")
+        if (len(attendance_percentages) != student_count or
+                len(extra_points) != student_count):
+            raise ValueError(
+                "Attendance and extra points must have one entry per student"
+            )
+        if reached_minimum_attendance is None:
+            reached_minimum_attendance = [True] * student_count
+        elif len(reached_minimum_attendance) != student_count:
+            raise ValueError(
+                "Minimum attendance flags must have one entry per student"
+            )
+
+        # Pass 1: weighted averages (same summation order as the
+        # per-student path, so the floating point results match exactly)
+        weighted_avgs = []
+        for index in range(student_count):
+            start, end = offsets[index], offsets[index + 1]
+            count = end - start
+            if count <= 0:
+                raise ValueError(
+                    f"No evaluations provided for student at index {index}"
+                )
+            if count > self.MAX_EVALUATIONS_PER_STUDENT:
+                raise ValueError(
+                    f"Maximum {self.MAX_EVALUATIONS_PER_STUDENT} evaluations "
+                    f"allowed per student (student at index {index})"
+                )
+            total_weighted = 0.0
+            total_weight = 0.0
+            for row in range(start, end):
+                weight = weights[row]
+                total_weighted += grades[row] * (weight / 100.0)
+                total_weight += weight
+            if total_weight == 0:
+                raise ValueError("Total weight cannot be zero")
+            weighted_avgs.append(total_weighted / (total_weight / 100.0))
+
+        # Pass 2: attendance penalties
+        penalties = [
+            self.calculate_attendance_penalty(attendance)
+            for attendance in attendance_percentages
+        ]
+
+        # Pass 3: grades after penalty
+        after_penalty = [
+            max(self.MIN_GRADE, avg - penalty)
+            for avg, penalty in zip(weighted_avgs, penalties)
+        ]
+
+        # Pass 4: extra points, only for students with minimum attendance
+        apply_extra_points = self.extra_points_policy.apply_extra_points
+        extras = [
+            apply_extra_points(grade, points) - grade if reached else 0.0
+            for grade, points, reached in zip(
+                after_penalty, extra_points, reached_minimum_attendance
+            )
+        ]
+
+        # Pass 5: final grades and details
+        results = []
+        for index in range(student_count):
+            grade = after_penalty[index]
+            extra = extras[index]
+            final_grade = min(self.MAX_GRADE, grade + extra)
+            details = {
+                'weighted_average': round(weighted_avgs[index], 2),
+                'attendance_percentage': attendance_percentages[index],
+                'attendance_penalty': round(penalties[index], 2),
+                'grade_before_extra': round(grade, 2),
+                'extra_points_applied': round(extra, 2),
+                'final_grade': round(final_grade, 2)
+            }
+            results.append((final_grade, details))
+
+        return results
+
+    def calculate_required_grade(
+        self,
+        student,
+        remaining_weights: Sequence[float],
+        target_grade: Optional[float] = None,
+        attendance_percentage: float = 100.0,
+        extra_points: float = 0.0,
+        reached_minimum_attendance: bool = True
+    ) -> Tuple[Optional[float], Dict[str, float]]:
+        """
+        Calculate the lowest grade still needed on the remaining evaluations.
+
+        The same grade is assumed on every remaining evaluation. The
+        pipeline (weighted average, attendance penalty, capped extra
+        points) is inverted in closed form; the candidate is then checked
+        by running the pipeline forward and moved by a few ulps, so the
+        answer is exactly the smallest float that reaches the target.
+
+        Args:
+            student: Student object exposing get_weighted_totals()
+            remaining_weights: Weight percentage of each evaluation still
+                               to come
+            target_grade: Final grade to reach (default: PASSING_GRADE)
+            attendance_percentage: Student's attendance percentage
+            extra_points: Number of extra points earned
+            reached_minimum_attendance: Whether student reached minimum
+                                       attendance
+
+        Returns:
+            Tuple of (required_grade, details) where required_grade is None
+            when even MAX_GRADE falls short; details contains
+            'target_grade', 'remaining_weight', 'achievable' and
+            'final_grade' (reached with the required grade, or with
+            MAX_GRADE when not achievable)
+
+        Raises:
+            ValueError: If no weights are given, a weight or the target is
+                        out of range, or there would be too many evaluations
+        """
+        if target_grade is None:
+            target_grade = self.PASSING_GRADE
+        if not self.MIN_GRADE <= target_grade <= self.MAX_GRADE:
+            raise ValueError(
+                f"Target grade must be between {self.MIN_GRADE} and "
+                f"{self.MAX_GRADE}"
+            )
+        if not remaining_weights:
+            raise ValueError("No remaining evaluations provided")
+        for weight in remaining_weights:
+            Evaluation.validate(self.MIN_GRADE, weight)
+        evaluation_count, total_weighted, total_weight = \
+            student.get_weighted_totals()
+        evaluation_count += len(remaining_weights)
+        if evaluation_count > self.MAX_EVALUATIONS_PER_STUDENT:
+            raise ValueError(
+                f"Maximum {self.MAX_EVALUATIONS_PER_STUDENT} evaluations "
+                f"allowed per student"
+            )
+        # Sum in the order Student.add_evaluation would, so the forward
+        # check is bit-identical to grading the recorded evaluations
+        remaining_weight = 0.0
+        final_weight = total_weight
+        for weight in remaining_weights:
+            remaining_weight += weight
+            final_weight += weight
+
+        def final_for(grade: float) -> float:
+            """Run the pipeline forward as if grade were recorded."""
+            weighted = total_weighted
+            for weight in remaining_weights:
+                weighted += grade * (weight / 100.0)
+            weighted_avg = self.calculate_weighted_average_from_totals(
+                evaluation_count, weighted, final_weight)
+            return self._finalize_grade(
+                weighted_avg, attendance_percentage, extra_points,
+                reached_minimum_attendance)[0]
+
+        def passes(grade: float) -> bool:
+            return final_for(grade) >= target_grade
 
+        details = {
+            'target_grade': target_grade,
+            'remaining_weight': remaining_weight,
+            'achievable': True
+        }
+        if passes(self.MIN_GRADE):
+            required = self.MIN_GRADE
+        elif not passes(self.MAX_GRADE):
+            details['achievable'] = False
+            details['final_grade'] = round(final_for(self.MAX_GRADE), 2)
+            return None, details
+        else:
+            # Closed-form inverse of the pipeline
+            needed = target_grade + self.calculate_attendance_penalty(
+                attendance_percentage)
+            if reached_minimum_attendance:
+                needed -= (extra_points *
+                           self.extra_points_policy.extra_points_value)
+            candidate = ((needed * (final_weight / 100.0) - total_weighted)
+                         / (remaining_weight / 100.0))
+            candidate = min(max(candidate, self.MIN_GRADE), self.MAX_GRADE)
+            required = self._nudge_required_grade(candidate, passes)
+        details['final_grade'] = round(final_for(required), 2)
+        return required, details
+
+    def _nudge_required_grade(self, candidate: float, passes) -> float:
+        """
+        Move a closed-form candidate to the lowest passing grade.
+
+        Rounding leaves the candidate a few ulps from the answer, so steps
+        of 1, 2, 4, ... ulps (math.ulp) away from it bracket the answer,
+        which is then bisected down to adjacent floats. passes(MIN_GRADE)
+        is False and passes(MAX_GRADE) is True.
+        """
+        step = math.ulp(candidate)
+        if passes(candidate):
+            high, low = candidate, candidate - step
+            while low > self.MIN_GRADE and passes(low):
+                high, step = low, step * 2
+                low = high - step
+            low = max(low, self.MIN_GRADE)
+        else:
+            low, high = candidate, candidate + step
+            while high < self.MAX_GRADE and not passes(high):
+                low, step = high, step * 2
+                high = low + step
+            high = min(high, self.MAX_GRADE)
+        while True:
+            middle = (low + high) / 2
+            if middle <= low or middle >= high:
+                return high
+            if passes(middle):
+                high = middle
+            else:
+                low = middle
+
+    def calculate_required_grades_batch(
+        self,
+        students: Iterable,
+        remaining_weights: Sequence[float],
+        target_grade: Optional[float] = None,
+        inputs: Optional[Mapping[str, tuple]] = None
+    ) -> Dict[str, Optional[Tuple[Optional[float], Dict[str, float]]]]:
+        """
+        Calculate the required grade of many students at once.
+
+        Args:
+            students: Student objects exposing get_weighted_totals()
+            remaining_weights: Weight percentages still to come (the same
+                               for every student)
+            target_grade: Final grade to reach (default: PASSING_GRADE)
+            inputs: Optional mapping of student_id to (attendance_percentage,
+                    extra_points, reached_minimum_attendance)
+
+        Returns:
+            Dict of student_id to the calculate_required_grade result, or
+            None for students it rejects (e.g. too many evaluations)
+
+        Raises:
+            ValueError: If no weights are given, or a weight or the target
+                        is out of range
+        """
+        if not remaining_weights:
+            raise ValueError("No remaining evaluations provided")
+        for weight in remaining_weights:
+            Evaluation.validate(self.MIN_GRADE, weight)
+        if target_grade is not None and not (
+                self.MIN_GRADE <= target_grade <= self.MAX_GRADE):
+            raise ValueError(
+                f"Target grade must be between {self.MIN_GRADE} and "
+                f"{self.MAX_GRADE}"
+            )
+        inputs = inputs or {}
+        results = {}
+        for student in students:
+            try:
+                results[student.student_id] = self.calculate_required_grade(
+                    student, remaining_weights, target_grade,
+                    *inputs.get(student.student_id, (100.0, 0.0, True))
+                )
+            except ValueError:
+                results[student.student_id] = None
+        return results
+
+    @instrumented("generate_grade_report")
     def generate_grade_report(
         self,
         student_id: str,
@@ -176,27 +640,80 @@ class GradeCalculator:
                 extra_points,
                 reached_minimum_attendance
             )
+            return self.render_grade_report(student_id, student_name,
+                                            len(evaluations), details)
+        except ValueError as e:
+            record_error("generate_grade_report", e)
+            return f"Error generating report: {str(e)}"
 
-            report = [
-                "=" * 60,
-                "GRADE REPORT",
-                "=" * 60,
-                f"Student ID: {student_id}",
-                f"Student Name: {student_name}",
-                f"Total Evaluations: {len(evaluations)}",
-                "",
-                "GRADE CALCULATION BREAKDOWN:",
-                f"  Weighted Average: {details['weighted_average']}",
-                f"  Attendance: {details['attendance_percentage']}%",
-                f"  Attendance Penalty: -{details['attendance_penalty']}",
-                f"  Grade Before Extra Points: "
-                f"{details['grade_before_extra']}",
-                f"  Extra Points Applied: "
-                f"+{details['extra_points_applied']}",
-                "",
-                f"FINAL GRADE: {details['final_grade']}/20",
-                "=" * 60
-            ]
-            return "\n".join(report)
+    @instrumented("generate_student_grade_report")
+    def generate_student_grade_report(
+        self,
+        student,
+        attendance_percentage: float = 100.0,
+        extra_points: float = 0.0,
+        reached_minimum_attendance: bool = True
+    ) -> str:
+        """
+        Generate a detailed grade report from a student's running totals.
+
+        Args:
+            student: Student object exposing get_weighted_totals()
+            attendance_percentage: Student's attendance percentage
+            extra_points: Number of extra points earned
+            reached_minimum_attendance: Whether student reached minimum
+                                       attendance
+
+        Returns:
+            A formatted grade report string
+        """
+        try:
+            final_grade, details = self.calculate_student_final_grade(
+                student,
+                attendance_percentage,
+                extra_points,
+                reached_minimum_attendance
+            )
+            return self.render_grade_report(student.student_id, student.name,
+                                            student.get_evaluation_count(),
+                                            details)
         except ValueError as e:
+            record_error("generate_student_grade_report", e)
             return f"Error generating report: {str(e)}"
+
+    def render_grade_report(self, student_id: str, student_name: str,
+                            evaluation_count: int,
+                            details: Dict[str, float]) -> str:
+        """
+        Format a grade report from already computed details.
+
+        Args:
+            student_id: The student identifier
+            student_name: The student name
+            evaluation_count: Number of evaluations graded
+            details: Details dict returned by calculate_final_grade
+
+        Returns:
+            A formatted grade report string
+        """
+        report = [
+            "=" * 60,
+            "GRADE REPORT",
+            "=" * 60,
+            f"Student ID: {student_id}",
+            f"Student Name: {student_name}",
+            f"Total Evaluations: {evaluation_count}",
+            "",
+            "GRADE CALCULATION BREAKDOWN:",
+            f"  Weighted Average: {details['weighted_average']}",
+            f"  Attendance: {details['attendance_percentage']}%",
+            f"  Attendance Penalty: -{details['attendance_penalty']}",
+            f"  Grade Before Extra Points: "
+            f"{details['grade_before_extra']}",
+            f"  Extra Points Applied: "
+            f"+{details['extra_points_applied']}",
+            "",
+            f"FINAL GRADE: {details['final_grade']}/20",
+            "=" * 60
+        ]
+        return "\n".join(report)
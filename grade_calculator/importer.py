@@ -0,0 +1,503 @@
+"""
+Importer module for loading students and evaluations from CSV files.
+
+This module contains the CsvImporter class, a streaming generator
+pipeline (read rows -> validate -> chunk -> bulk insert) that keeps memory
+flat regardless of the input size. Rows are validated with the same rules
+as Evaluation.__init__ plus the per-student checks (registered student, no
+duplicate evaluation_id, at most MAX_EVALUATIONS_PER_STUDENT); rejected
+rows are written to a rejects CSV instead of being printed.
+
+For multi-gigabyte files, import_evaluations_parallel splits the file at
+line boundaries and parses the pieces in a process pool; the per-student
+checks still run in the parent, in file order. That mode assumes one
+record per physical line (no quoted newlines), as in registrar exports.
+
+Expected columns:
+    students:    student_id,name
+    evaluations: student_id,evaluation_id,grade[,weight_percentage]
+"""
+import csv
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import (Dict, Iterable, Iterator, List, Optional, Sequence, Set,
+                    Tuple)
+
+# Support both direct execution and package imports
+try:
+    from .evaluation import Evaluation
+    from .grade_calculator import GradeCalculator
+except (ImportError, ValueError):
+    from evaluation import Evaluation
+    from grade_calculator import GradeCalculator
+
+STUDENT_COLUMNS = ("student_id", "name")
+EVALUATION_COLUMNS = ("student_id", "evaluation_id", "grade")
+WEIGHT_COLUMN = "weight_percentage"
+REJECT_COLUMNS = ("line", "error")
+
+Row = Dict[str, str]
+# (line_offset, raw fields, (student_id, evaluation_id, grade, weight) or
+# None, error or None) as returned by parse_range
+ParsedRecord = Tuple[int, List[str], Optional[Tuple[str, str, float, float]],
+                     Optional[str]]
+
+
+class ImportResult:
+    """Summary of one CSV import."""
+
+    def __init__(self, imported: int = 0, rejected: int = 0,
+                 rejects_path: Optional[str] = None):
+        """
+        Initialize an ImportResult.
+
+        Args:
+            imported: Number of rows inserted into the application
+            rejected: Number of rows written to the rejects file
+            rejects_path: Path of the rejects file, if any
+        """
+        self.imported = imported
+        self.rejected = rejected
+        self.rejects_path = rejects_path
+
+    def __repr__(self) -> str:
+        """Return a string representation of the ImportResult."""
+        return (
+            f"ImportResult(imported={self.imported}, "
+            f"rejected={self.rejected})"
+        )
+
+
+def read_rows(path: str, required: Sequence[str]
+              ) -> Iterator[Tuple[int, Row]]:
+    """
+    Stream the rows of a CSV file with a header line.
+
+    Args:
+        path: Path of the CSV file
+        required: Column names that must be present in the header
+
+    Yields:
+        (line_number, row) pairs, line numbers counting the header as 1
+
+    Raises:
+        ValueError: If a required column is missing from the header
+    """
+    # utf-8-sig drops the byte order mark spreadsheet exports start with,
+    # as split_file does for the parallel import
+    with open(path, newline="", encoding="utf-8-sig") as handle:
+        reader = csv.DictReader(handle)
+        missing = [name for name in required
+                   if name not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(
+                f"Missing required column(s): {', '.join(missing)}"
+            )
+        for row in reader:
+            yield reader.line_num, row
+
+
+def chunked(items: Iterable, size: int) -> Iterator[List]:
+    """
+    Group an iterable into lists of at most size items.
+
+    Args:
+        items: The items to group
+        size: Maximum chunk length
+
+    Yields:
+        Consecutive chunks
+    """
+    iterator = iter(items)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def split_file(path: str, chunk_bytes: int) -> Tuple[List[str],
+                                                    List[Tuple[int, int]]]:
+    """
+    Split a CSV file into byte ranges that start and end on line breaks.
+
+    Args:
+        path: Path of the CSV file
+        chunk_bytes: Approximate size of each range
+
+    Returns:
+        Tuple of (header column names, [(start, end), ...]) where the
+        ranges cover every line after the header, in file order
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, "rb") as handle:
+        header = handle.readline()
+        start = handle.tell()
+        while start < size:
+            handle.seek(min(start + chunk_bytes, size))
+            if handle.tell() < size:
+                handle.readline()  # advance to the next line break
+            end = handle.tell()
+            ranges.append((start, end))
+            start = end
+    fieldnames = next(csv.reader([header.decode("utf-8-sig")]), [])
+    return [name.strip() for name in fieldnames], ranges
+
+
+def parse_range(path: str, start: int, end: int, fieldnames: List[str]
+                ) -> Tuple[int, List[ParsedRecord]]:
+    """
+    Parse and validate one byte range of an evaluations CSV.
+
+    Runs inside a worker process; only the stateless checks of
+    parse_evaluation_row are applied here.
+
+    Args:
+        path: Path of the CSV file
+        start: Offset of the first byte of the range
+        end: Offset just past the last byte of the range
+        fieldnames: Column names from the header line
+
+    Returns:
+        Tuple of (line_count, records) with one record per non-blank line,
+        in file order; line offsets count from 0 at the start of the range
+    """
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        lines = handle.read(end - start).decode("utf-8").split("\n")
+    if lines and not lines[-1]:
+        lines.pop()  # the range ends with a line break
+    records = []
+    for offset, fields in enumerate(csv.reader(lines)):
+        if not fields:
+            continue
+        try:
+            evaluation = parse_evaluation_row(dict(zip(fieldnames, fields)))
+        except ValueError as e:
+            records.append((offset, fields, None, str(e)))
+            continue
+        records.append((offset, fields, (
+            evaluation.student_id, evaluation.evaluation_id,
+            evaluation.grade, evaluation.weight_percentage
+        ), None))
+    return len(lines), records
+
+
+def parse_evaluation_row(row: Row) -> Evaluation:
+    """
+    Build an Evaluation from a CSV row (stateless checks only).
+
+    Args:
+        row: Mapping with student_id, evaluation_id, grade and optional
+             weight_percentage
+
+    Returns:
+        The validated Evaluation
+
+    Raises:
+        ValueError: If a field is missing, not a number or out of range
+    """
+    student_id = (row.get("student_id") or "").strip()
+    evaluation_id = (row.get("evaluation_id") or "").strip()
+    if not student_id or not evaluation_id:
+        raise ValueError("Student ID and evaluation ID cannot be empty")
+    grade = _parse_number(row.get("grade"), "grade")
+    weight_text = (row.get(WEIGHT_COLUMN) or "").strip()
+    weight = _parse_number(weight_text, WEIGHT_COLUMN) if weight_text \
+        else Evaluation.DEFAULT_WEIGHT_PERCENTAGE
+    return Evaluation(student_id, evaluation_id, grade, weight)
+
+
+def _parse_number(text: Optional[str], name: str) -> float:
+    """Convert a CSV field to float with a readable error."""
+    try:
+        return float((text or "").strip())
+    except ValueError:
+        raise ValueError(f"Invalid {name} '{text}'")
+
+
+class EvaluationRowChecker:
+    """Stateful checks an evaluation needs against the application.
+
+    Evaluations already in the application are checked against the
+    student's own list; only the evaluations accepted since the last
+    commit() (at most one chunk) are kept here, so memory stays flat
+    however many students the input covers.
+    """
+
+    def __init__(self, app):
+        """
+        Initialize an EvaluationRowChecker.
+
+        Args:
+            app: GradeCalculatorApp the evaluations will be added to
+        """
+        self.app = app
+        self.max_evaluations = GradeCalculator.MAX_EVALUATIONS_PER_STUDENT
+        self._pending: Dict[str, Set[str]] = {}
+
+    def check(self, evaluation: Evaluation) -> None:
+        """
+        Check and reserve an evaluation for insertion.
+
+        Args:
+            evaluation: The evaluation about to be inserted
+
+        Raises:
+            ValueError: If the student is unknown, the evaluation_id is
+                        already used by the student, or the student would
+                        exceed MAX_EVALUATIONS_PER_STUDENT
+        """
+        student_id = evaluation.student_id
+        evaluation_id = evaluation.evaluation_id
+        student = self.app.get_student(student_id)
+        if student is None:
+            raise ValueError(f"Student {student_id} not found")
+        pending = self._pending.get(student_id, ())
+        if evaluation_id in pending or any(
+                e.evaluation_id == evaluation_id
+                for e in student.evaluations):
+            raise ValueError(
+                f"Duplicate evaluation {evaluation_id} for "
+                f"student {student_id}"
+            )
+        if (student.get_evaluation_count() + len(pending)
+                >= self.max_evaluations):
+            raise ValueError(
+                f"Maximum {self.max_evaluations} evaluations allowed per "
+                f"student"
+            )
+        self._pending.setdefault(student_id, set()).add(evaluation_id)
+
+    def commit(self) -> None:
+        """Forget the reserved evaluations once they were inserted."""
+        self._pending.clear()
+
+
+class RejectsWriter:
+    """Lazily opened CSV file receiving rejected rows."""
+
+    def __init__(self, path: Optional[str], columns: Sequence[str]):
+        """
+        Initialize a RejectsWriter.
+
+        Args:
+            path: Path of the rejects CSV (None discards rejects)
+            columns: Input columns copied to the rejects file
+        """
+        self.path = path
+        self.columns = list(REJECT_COLUMNS) + list(columns)
+        self.count = 0
+        self._handle = None
+        self._writer = None
+
+    def write(self, line: int, row: Row, error: str) -> None:
+        """Record one rejected row."""
+        self.count += 1
+        if self.path is None:
+            return
+        if self._writer is None:
+            self._handle = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._handle, self.columns,
+                                          extrasaction="ignore")
+            self._writer.writeheader()
+        self._writer.writerow(dict(row, line=line, error=error))
+
+    def close(self) -> None:
+        """Close the rejects file if it was opened."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            self._writer = None
+
+
+class CsvImporter:
+    """Streams registrar CSV exports into a GradeCalculatorApp."""
+
+    DEFAULT_CHUNK_SIZE = 1000
+
+    def __init__(self, app, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        """
+        Initialize a CsvImporter.
+
+        Args:
+            app: GradeCalculatorApp receiving the data
+            chunk_size: Number of rows inserted per bulk call
+
+        Raises:
+            ValueError: If chunk_size is not positive
+        """
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be greater than 0")
+        self.app = app
+        self.chunk_size = chunk_size
+
+    def import_students(self, path: str,
+                        rejects_path: Optional[str] = None) -> ImportResult:
+        """
+        Import students from a CSV file.
+
+        Args:
+            path: CSV with student_id and name columns
+            rejects_path: Optional CSV receiving rejected rows
+
+        Returns:
+            The ImportResult of the run
+
+        Raises:
+            ValueError: If a required column is missing
+        """
+        rejects = RejectsWriter(rejects_path, STUDENT_COLUMNS)
+        imported = 0
+        try:
+            for line, row in read_rows(path, STUDENT_COLUMNS):
+                student_id = (row.get("student_id") or "").strip()
+                name = (row.get("name") or "").strip()
+                if not student_id or not name:
+                    rejects.write(line, row,
+                                  "Student ID and name cannot be empty")
+                elif self.app.has_student(student_id):
+                    rejects.write(line, row,
+                                  f"Student {student_id} already exists")
+                else:
+                    self.app.add_student(student_id, name)
+                    imported += 1
+        finally:
+            rejects.close()
+        return ImportResult(imported, rejects.count,
+                            rejects_path if rejects.count else None)
+
+    def import_evaluations(self, path: str,
+                           rejects_path: Optional[str] = None
+                           ) -> ImportResult:
+        """
+        Import evaluations from a CSV file.
+
+        Args:
+            path: CSV with student_id, evaluation_id, grade and optional
+                  weight_percentage columns
+            rejects_path: Optional CSV receiving rejected rows
+
+        Returns:
+            The ImportResult of the run
+
+        Raises:
+            ValueError: If a required column is missing
+        """
+        rejects = RejectsWriter(rejects_path,
+                                EVALUATION_COLUMNS + (WEIGHT_COLUMN,))
+        checker = EvaluationRowChecker(self.app)
+        imported = 0
+        try:
+            valid = self._validated(read_rows(path, EVALUATION_COLUMNS),
+                                    checker, rejects)
+            for chunk in chunked(valid, self.chunk_size):
+                imported += self.app.add_evaluations_bulk(chunk)
+                checker.commit()
+        finally:
+            rejects.close()
+        return ImportResult(imported, rejects.count,
+                            rejects_path if rejects.count else None)
+
+    def import_evaluations_parallel(self, path: str,
+                                    rejects_path: Optional[str] = None,
+                                    processes: Optional[int] = None,
+                                    chunk_bytes: int = 8 * 1024 * 1024
+                                    ) -> ImportResult:
+        """
+        Import evaluations, parsing chunks of the file in worker processes.
+
+        Chunks are merged in file order, so duplicate evaluation_ids and
+        the MAX_EVALUATIONS_PER_STUDENT rule are detected exactly as in
+        import_evaluations, including across chunk boundaries.
+
+        Args:
+            path: CSV with student_id, evaluation_id, grade and optional
+                  weight_percentage columns (one record per line)
+            rejects_path: Optional CSV receiving rejected rows
+            processes: Number of worker processes (default: CPU count)
+            chunk_bytes: Approximate size of each parsed chunk
+
+        Returns:
+            The same ImportResult import_evaluations would return
+
+        Raises:
+            ValueError: If a required column is missing or chunk_bytes is
+                        not positive
+        """
+        if chunk_bytes <= 0:
+            raise ValueError("Chunk size must be greater than 0")
+        fieldnames, ranges = split_file(path, chunk_bytes)
+        missing = [name for name in EVALUATION_COLUMNS
+                   if name not in fieldnames]
+        if missing:
+            raise ValueError(
+                f"Missing required column(s): {', '.join(missing)}"
+            )
+
+        rejects = RejectsWriter(rejects_path,
+                                EVALUATION_COLUMNS + (WEIGHT_COLUMN,))
+        checker = EvaluationRowChecker(self.app)
+        imported = 0
+        line_base = 2  # line number of the first line after the header
+        workers = processes or os.cpu_count() or 1
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                pending = deque()
+                remaining = iter(ranges)
+                # Keep a bounded number of chunks in flight so memory
+                # stays flat however far the workers get ahead
+                for start, end in islice(remaining, workers * 2):
+                    pending.append(executor.submit(parse_range, path, start,
+                                                   end, fieldnames))
+                while pending:
+                    line_count, records = pending.popleft().result()
+                    for start, end in islice(remaining, 1):
+                        pending.append(executor.submit(
+                            parse_range, path, start, end, fieldnames
+                        ))
+                    merged = self._merged(line_base, fieldnames, records,
+                                          checker, rejects)
+                    for chunk in chunked(merged, self.chunk_size):
+                        imported += self.app.add_evaluations_bulk(chunk)
+                        checker.commit()
+                    line_base += line_count
+        finally:
+            rejects.close()
+        return ImportResult(imported, rejects.count,
+                            rejects_path if rejects.count else None)
+
+    @staticmethod
+    def _merged(line_base: int, fieldnames: List[str],
+                records: List[ParsedRecord], checker: EvaluationRowChecker,
+                rejects: RejectsWriter) -> Iterator[Evaluation]:
+        """Apply the stateful checks to a parsed chunk, in line order."""
+        for offset, fields, parsed, error in records:
+            if parsed is not None:
+                evaluation = Evaluation(*parsed)
+                try:
+                    checker.check(evaluation)
+                except ValueError as e:
+                    error = str(e)
+                else:
+                    yield evaluation
+                    continue
+            rejects.write(line_base + offset, dict(zip(fieldnames, fields)),
+                          error)
+
+    @staticmethod
+    def _validated(rows: Iterable[Tuple[int, Row]],
+                   checker: EvaluationRowChecker,
+                   rejects: RejectsWriter) -> Iterator[Evaluation]:
+        """Yield valid evaluations, sending the others to rejects."""
+        for line, row in rows:
+            try:
+                evaluation = parse_evaluation_row(row)
+                checker.check(evaluation)
+            except ValueError as e:
+                rejects.write(line, row, str(e))
+                continue
+            yield evaluation
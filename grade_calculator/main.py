@@ -3,9 +3,17 @@ Main module for CS-GradeCalculator application.
 
 This module provides the terminal-based interface for the grade calculator
 system. Implements use case CU001: Calculate student's final grade.
+
+The optional subsystems (storage, snapshot, write-ahead log, rankings,
+parallel grading, policy sweeps and profiling) are imported by the methods
+that use them, so creating a plain GradeCalculatorApp does not load them.
 """
+import functools
+import importlib
+import os
 import sys
-from typing import List, Optional
+import threading
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
 
 # Support both direct execution and package imports
 try:
@@ -15,6 +23,13 @@ try:
     from .grade_calculator import GradeCalculator
     from .attendance_policy import AttendancePolicy
     from .extra_points_policy import ExtraPointsPolicy
+    from .evaluation_store import EvaluationStore
+    from .cache import LRUCache
+    from .name_index import NamePrefixIndex, TrigramIndex
+    from .course_index import CourseIndex
+    from .metrics import instrumented, record_error
+    from .tracing import traced
+    from .sketch import GradeSketch
 except (ImportError, ValueError):
     from student import Student
     from teacher import Teacher
@@ -22,6 +37,61 @@ except (ImportError, ValueError):
     from grade_calculator import GradeCalculator
     from attendance_policy import AttendancePolicy
     from extra_points_policy import ExtraPointsPolicy
+    from evaluation_store import EvaluationStore
+    from cache import LRUCache
+    from name_index import NamePrefixIndex, TrigramIndex
+    from course_index import CourseIndex
+    from metrics import instrumented, record_error
+    from tracing import traced
+    from sketch import GradeSketch
+
+if TYPE_CHECKING:
+    from .ranking import RankingEngine
+    from .snapshot import Snapshot
+    from .storage import StorageBackend
+    from .wal import WriteAheadLog
+
+
+def _import_optional(name: str):
+    """
+    Import an optional subsystem module on first use.
+
+    Args:
+        name: Module name inside the package (e.g. "wal")
+
+    Returns:
+        The module, imported like this one (package or direct execution)
+    """
+    if __package__:
+        return importlib.import_module(f".{name}", __package__)
+    return importlib.import_module(name)
+
+
+def compacting(method):
+    """
+    Decorate a mutator so a due log compaction runs after it returns.
+
+    Mutators call each other (and subclasses wrap them in locks), so the
+    compaction runs only when the outermost mutator call of the thread
+    returns, once every lock it held has been released.
+
+    Args:
+        method: The mutator
+
+    Returns:
+        The decorated mutator
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        state = self._mutations
+        state.depth = getattr(state, "depth", 0) + 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            state.depth -= 1
+            if state.depth == 0:
+                self._compact_if_due()
+    return wrapper
 
 
 class GradeCalculatorApp:
@@ -29,22 +99,266 @@ class GradeCalculatorApp:
 
     # Class-level configuration for concurrent users (RNF02)
     MAX_CONCURRENT_USERS = 50
-
-    def __init__(self, load_sample_data=True):
+    # Number of memoized final grades kept by get_student_final_grade
+    GRADE_CACHE_SIZE = 4096
+    # Number of rendered grade reports kept by get_grade_report
+    REPORT_CACHE_SIZE = 1024
+    # Whether add_student also maintains the trigram index for fuzzy search
+    FUZZY_NAME_INDEX = True
+
+    def __init__(self, load_sample_data=True,
+                 evaluation_store: Optional[EvaluationStore] = None,
+                 storage: Optional["StorageBackend"] = None,
+                 snapshot: Optional[str] = None,
+                 wal: Optional["WriteAheadLog"] = None):
         """Initialize the Grade Calculator application.
         
         Args:
             load_sample_data: Whether to load sample data on initialization
+                              (skipped when storage or a snapshot already
+                              holds data)
+            evaluation_store: Optional columnar store shared by all students
+                              to hold evaluations compactly
+            storage: Optional backend the application state is loaded from
+                     and written through to
+            snapshot: Optional snapshot file to memory-map at startup (a
+                      missing file starts empty) and to write on checkpoint
+            wal: Optional write-ahead log replayed on top of the snapshot
+                 at startup and appended to on every mutation
         """
+        # Per-thread nesting of @compacting mutator calls
+        self._mutations = threading.local()
         self.students = {}
         self.teachers = {}
         self.grade_calculator = GradeCalculator()
         self.all_years_teachers = []
-        
+        self.course_index = CourseIndex()
+        self.evaluation_store = evaluation_store
+        self.grade_cache = LRUCache(self.GRADE_CACHE_SIZE)
+        self.report_cache = LRUCache(self.REPORT_CACHE_SIZE)
+        self.name_index = NamePrefixIndex()
+        self.fuzzy_index = TrigramIndex() if self.FUZZY_NAME_INDEX else None
+        # Snapshot names and enrollments are indexed on first use, not at
+        # startup
+        self._snapshot_names_indexed = True
+        self._snapshot_enrollments_indexed = True
+        self._index_lock = threading.Lock()
+        self.storage = None
+        self.snapshot = None
+        self.snapshot_path = snapshot
+        self.wal = None
+        self.ranking: Optional["RankingEngine"] = None
+
+        if storage is not None:
+            self._load_storage(storage)
+            self.storage = storage
+        if snapshot is not None and os.path.exists(snapshot):
+            self.attach_snapshot(snapshot)
+        if wal is not None:
+            self._replay_wal(wal)
+            self.wal = wal
+
         # Load sample data if requested
-        if load_sample_data:
+        if load_sample_data and not (self.students or self.teachers
+                                     or self.snapshot is not None):
             self._initialize_sample_data()
 
+    def _load_storage(self, storage: "StorageBackend") -> None:
+        """Rebuild the in-memory state from a storage backend."""
+        for teacher_id, name, course in storage.load_teachers():
+            self.add_teacher(teacher_id, name, course)
+        for student_id, name in storage.load_students():
+            self.add_student(student_id, name)
+        for teacher_id, student_id in storage.load_enrollments():
+            self.course_index.enroll(teacher_id, student_id)
+        self.add_evaluations_bulk(storage.load_evaluations())
+
+    def _replay_wal(self, wal: "WriteAheadLog") -> None:
+        """Re-apply the log records the snapshot does not cover."""
+        records = _import_optional("wal")
+        covered = self.snapshot.sequence if self.snapshot is not None else 0
+        if wal.last_sequence < covered:
+            # A log recreated after its snapshot must not reuse covered
+            # sequence numbers
+            wal.truncate(covered + 1)
+        for _, operation, fields in wal.replay(covered):
+            if operation == records.ADD_STUDENT:
+                self.add_student(*fields)
+            elif operation == records.ADD_TEACHER:
+                self.add_teacher(*fields)
+            elif operation == records.ENROLL_STUDENT:
+                self.enroll_student(*fields)
+            else:
+                self._insert_evaluation(Evaluation(*fields))
+
+    def _compact_if_due(self) -> None:
+        """Checkpoint once the write-ahead log has grown large enough.
+
+        Called by @compacting when the outermost mutator returns, never
+        from inside a mutator.
+        """
+        if (self.wal is not None and self.snapshot_path is not None
+                and self.wal.needs_compaction()):
+            self.checkpoint()
+
+    def checkpoint(self, path: Optional[str] = None) -> None:
+        """
+        Save a snapshot and truncate the write-ahead log.
+
+        The snapshot records the last log sequence it covers and is
+        renamed into place before the log is truncated, so a crash at any
+        point replays each mutation exactly once.
+
+        Args:
+            path: Snapshot file (default: the snapshot given at startup)
+
+        Raises:
+            ValueError: If no snapshot path is known
+        """
+        path = path or self.snapshot_path
+        if path is None:
+            raise ValueError("No snapshot path to checkpoint to")
+        self.get_all_students()
+        if self.snapshot is not None:
+            # Everything is in memory now; unmap before replacing the file
+            self.snapshot.close()
+            self.snapshot = None
+        sequence = self.wal.last_sequence if self.wal is not None else 0
+        _import_optional("snapshot").write_snapshot(self, path, sequence)
+        if self.wal is not None:
+            self.wal.truncate()
+        self.snapshot_path = path
+
+    def close(self) -> None:
+        """Flush and close the storage, snapshot and log, if any."""
+        if self.storage is not None:
+            self.storage.close()
+            self.storage = None
+        if self.wal is not None:
+            self.wal.close()
+            self.wal = None
+        if self.snapshot is not None:
+            self.snapshot.close()
+            self.snapshot = None
+
+    def attach_snapshot(self, path: str) -> "Snapshot":
+        """
+        Memory-map a snapshot as the base state of the application.
+
+        Students stay in the mapped file until they are written to (or a
+        whole-roster operation needs them); students added or loaded in
+        memory take precedence over the snapshot.
+
+        Args:
+            path: Snapshot file written by snapshot.write_snapshot
+
+        Returns:
+            The attached Snapshot
+
+        Raises:
+            ValueError: If the file is not a snapshot
+        """
+        snapshot = _import_optional("snapshot").Snapshot(path)
+        for teacher_id, name, course in snapshot.teachers():
+            if teacher_id not in self.teachers:
+                self.add_teacher(teacher_id, name, course)
+        if self.snapshot is not None:
+            self.snapshot.close()
+        self.snapshot = snapshot
+        self._snapshot_names_indexed = False
+        self._snapshot_enrollments_indexed = False
+        # Snapshot students share version 0, so drop entries of any
+        # previously attached snapshot
+        self.grade_cache.clear()
+        self.report_cache.clear()
+        if self.ranking is not None:
+            self.ranking.rebuild()
+        return snapshot
+
+    def enable_ranking(self) -> "RankingEngine":
+        """
+        Start maintaining leaderboards of final grades.
+
+        Once enabled, every mutation updates the rankings incrementally;
+        see ranking.RankingEngine for the rank, percentile and top/bottom-K
+        queries.
+
+        Returns:
+            The application's RankingEngine
+        """
+        if self.ranking is None:
+            self.ranking = _import_optional("ranking").RankingEngine(self)
+        return self.ranking
+
+    def has_student(self, student_id: str) -> bool:
+        """
+        Check whether a student is registered (in memory or snapshot).
+
+        Args:
+            student_id: The student identifier
+
+        Returns:
+            True if the student exists
+        """
+        return student_id in self.students or (
+            self.snapshot is not None and student_id in self.snapshot
+        )
+
+    @traced("find_student")
+    def find_student(self, student_id: str):
+        """
+        Look up a student for reading without materializing it.
+
+        Args:
+            student_id: The student identifier
+
+        Returns:
+            The Student, a read-only SnapshotStudent exposing the same
+            get_evaluation_count() and get_weighted_totals(), or None
+        """
+        student = self.students.get(student_id)
+        if student is None and self.snapshot is not None:
+            return self.snapshot.get_student(student_id)
+        return student
+
+    @traced("get_student")
+    def get_student(self, student_id: str) -> Optional[Student]:
+        """
+        Get a student, copying it out of the snapshot on first use.
+
+        Args:
+            student_id: The student identifier
+
+        Returns:
+            The Student object, or None if the student is not registered
+        """
+        student = self.students.get(student_id)
+        if student is None and self.snapshot is not None:
+            student = self._materialize_student(student_id)
+        return student
+
+    def get_all_students(self) -> List[Student]:
+        """
+        Get every registered student, materializing the snapshot.
+
+        Returns:
+            List of Student objects
+        """
+        if self.snapshot is not None:
+            for student_id in self.snapshot.student_ids():
+                if student_id not in self.students:
+                    self._materialize_student(student_id)
+        return list(self.students.values())
+
+    def _materialize_student(self, student_id: str) -> Optional[Student]:
+        """Copy a snapshot student into memory (copy-on-write)."""
+        student = self.snapshot.load_student(student_id,
+                                             self.evaluation_store)
+        if student is not None:
+            self.students[student_id] = student
+        return student
+
+    @compacting
     def add_teacher(self, teacher_id: str, name: str, course: str) -> None:
         """
         Add a teacher to the system.
@@ -55,10 +369,141 @@ class GradeCalculatorApp:
             course: Course taught by the teacher
         """
         teacher = Teacher(teacher_id, name, course)
+        previous = self.teachers.get(teacher_id)
+        if self.wal is not None:
+            records = _import_optional("wal")
+            self.wal.append(records.ADD_TEACHER, teacher_id, name, course)
+        if self.storage is not None:
+            self.storage.save_teacher(teacher_id, name, course)
         self.teachers[teacher_id] = teacher
-        if self.should_all_years_teacher(course):
+        all_years = self.should_all_years_teacher(course)
+        self.course_index.add_teacher(teacher_id, course, all_years)
+        # A replaced teacher leaves the list, so it is never stranded or
+        # listed twice
+        if previous is not None and previous in self.all_years_teachers:
+            self.all_years_teachers.remove(previous)
+        if all_years:
             self.all_years_teachers.append(teacher)
+        if self.ranking is not None:
+            self.ranking.invalidate_courses()
+
+    @compacting
+    def enroll_student(self, teacher_id: str, student_id: str) -> bool:
+        """
+        Enroll a student with a teacher (and so in the teacher's course).
+
+        Args:
+            teacher_id: The teacher identifier
+            student_id: The student identifier
+
+        Returns:
+            True if successful (including an existing enrollment), False
+            if the teacher or student is not registered
+        """
+        if teacher_id not in self.teachers:
+            print(f"Error: Teacher {teacher_id} not found")
+            return False
+        if not self.has_student(student_id):
+            print(f"Error: Student {student_id} not found")
+            return False
+        with self._index_lock:
+            self._index_snapshot_enrollments()
+        if student_id in self.course_index.get_student_ids(teacher_id):
+            return True
+        if self.wal is not None:
+            records = _import_optional("wal")
+            self.wal.append(records.ENROLL_STUDENT, teacher_id, student_id)
+        if self.storage is not None:
+            self.storage.save_enrollment(teacher_id, student_id)
+        self.course_index.enroll(teacher_id, student_id)
+        if self.ranking is not None:
+            self.ranking.on_enroll(teacher_id, student_id)
+        return True
+
+    def _index_snapshot_enrollments(self) -> None:
+        """Index the enrollments stored in the snapshot, once."""
+        if self._snapshot_enrollments_indexed or self.snapshot is None:
+            return
+        for teacher_id, student_id in self.snapshot.enrollments():
+            self.course_index.enroll(teacher_id, student_id)
+        self._snapshot_enrollments_indexed = True
+
+    def get_enrollments(self) -> List[Tuple[str, str]]:
+        """
+        Get every enrollment, including those of an attached snapshot.
+
+        Returns:
+            List of (teacher_id, student_id)
+        """
+        with self._index_lock:
+            self._index_snapshot_enrollments()
+            return self.course_index.get_enrollments()
+
+    def get_teachers_by_course(self, course: str) -> List[Teacher]:
+        """
+        Get the teachers of a course (case and spacing are ignored).
+
+        Args:
+            course: The course name
+
+        Returns:
+            List of Teacher objects
+        """
+        return [self.teachers[teacher_id] for teacher_id
+                in self.course_index.get_teacher_ids_by_course(course)]
+
+    @traced("get_teacher_students")
+    def get_teacher_students(self, teacher_id: str) -> List[Student]:
+        """
+        Get the students enrolled with a teacher.
+
+        Args:
+            teacher_id: The teacher identifier
+
+        Returns:
+            List of Student objects, in enrollment order
+        """
+        return self._teacher_students(teacher_id)
+
+    def _teacher_students(self, teacher_id: str) -> List[Student]:
+        """Look up the enrolled students of a teacher."""
+        with self._index_lock:
+            self._index_snapshot_enrollments()
+            student_ids = self.course_index.get_student_ids(teacher_id)
+        students = [self.get_student(student_id) for student_id in student_ids]
+        return [student for student in students if student is not None]
+
+    def get_teacher_evaluations(self, teacher_id: str) -> List[Evaluation]:
+        """
+        Get the evaluations of every student enrolled with a teacher.
 
+        Args:
+            teacher_id: The teacher identifier
+
+        Returns:
+            List of evaluations, grouped by student in enrollment order
+        """
+        return [evaluation
+                for student in self._teacher_students(teacher_id)
+                for evaluation in student.get_evaluations()]
+
+    @traced("get_student_teachers")
+    def get_student_teachers(self, student_id: str) -> List[Teacher]:
+        """
+        Get the teachers a student is enrolled with.
+
+        Args:
+            student_id: The student identifier
+
+        Returns:
+            List of Teacher objects
+        """
+        with self._index_lock:
+            self._index_snapshot_enrollments()
+            teacher_ids = self.course_index.get_teacher_ids(student_id)
+        return [self.teachers[teacher_id] for teacher_id in teacher_ids]
+
+    @compacting
     def add_student(self, student_id: str, name: str) -> None:
         """
         Add a student to the system.
@@ -67,9 +512,121 @@ class GradeCalculatorApp:
             student_id: Unique identifier for the student
             name: Student's full name
         """
-        student = Student(student_id, name)
+        self._add_student(student_id, name)
+
+    @compacting
+    def add_new_student(self, student_id: str, name: str) -> bool:
+        """
+        Add a student unless the ID is already registered.
+
+        Unlike has_student() followed by add_student(), the check and the
+        insert happen in one step, so an existing student (and its
+        evaluations) is never replaced.
+
+        Args:
+            student_id: Unique identifier for the student
+            name: Student's full name
+
+        Returns:
+            True if the student was added, False if it already exists
+        """
+        if self.has_student(student_id):
+            print(f"Error: Student {student_id} already exists")
+            return False
+        self._add_student(student_id, name)
+        return True
+
+    def _add_student(self, student_id: str, name: str) -> None:
+        """Register a student, replacing any with the same ID."""
+        student = Student(student_id, name, self.evaluation_store)
+        if self.wal is not None:
+            records = _import_optional("wal")
+            self.wal.append(records.ADD_STUDENT, student_id, name)
+        if self.storage is not None:
+            self.storage.save_student(student_id, name)
         self.students[student_id] = student
+        self._index_student_name(student_id, name)
+        if self.ranking is not None:
+            self.ranking.refresh_student(student_id)
+
+    def _index_student_name(self, student_id: str, name: str) -> None:
+        """Add (or re-add) a student to the name indexes."""
+        self.name_index.add(student_id, name)
+        if self.fuzzy_index is not None:
+            self.fuzzy_index.add(student_id, name)
+
+    def _index_snapshot_names(self) -> None:
+        """Index the names of snapshot students not indexed yet."""
+        if self._snapshot_names_indexed or self.snapshot is None:
+            return
+        for student_id, name in self.snapshot.names():
+            if student_id not in self.name_index:
+                self._index_student_name(student_id, name)
+        self._snapshot_names_indexed = True
+
+    @traced("search_students")
+    def search_students(self, prefix: str,
+                        limit: int = 10) -> List[Tuple[str, str]]:
+        """
+        Find students by the beginning of their name.
+
+        Accents and case are ignored and any word of the name may match,
+        so "garc" finds "María García".
+
+        Args:
+            prefix: Beginning of the first name or of any later name
+            limit: Maximum number of results
+
+        Returns:
+            List of (student_id, name)
+        """
+        with self._index_lock:
+            self._index_snapshot_names()
+            return self.name_index.search(prefix, limit)
+
+    @traced("fuzzy_search_students")
+    def fuzzy_search_students(self, query: str, limit: int = 10
+                              ) -> List[Tuple[str, str, float]]:
+        """
+        Find students whose name resembles a possibly misspelled query.
 
+        Args:
+            query: The approximate name
+            limit: Maximum number of results
+
+        Returns:
+            List of (student_id, name, similarity), best match first
+            (empty when FUZZY_NAME_INDEX is disabled)
+        """
+        if self.fuzzy_index is None:
+            return []
+        with self._index_lock:
+            self._index_snapshot_names()
+            return self.fuzzy_index.search(query, limit)
+
+    def _resolve_student_id(self, text: str) -> Optional[str]:
+        """Map menu input (an ID or a unique name prefix) to an ID."""
+        if self.has_student(text):
+            return text
+        matches = self.search_students(text, limit=2) if text else []
+        if len(matches) == 1:
+            return matches[0][0]
+        return None
+
+    def _print_name_suggestions(self, text: str) -> None:
+        """Print the students a menu input could have meant."""
+        if not text:
+            return
+        matches = self.search_students(text) or [
+            (student_id, name) for student_id, name, _
+            in self.fuzzy_search_students(text, limit=5)
+        ]
+        if matches:
+            print("Did you mean:")
+            for student_id, name in matches:
+                print(f"  - {student_id}: {name}")
+
+    @compacting
     def add_evaluation(self, student_id: str, evaluation_id: str,
                        grade: float, weight_percentage: float = 100.0) -> bool:
         """
@@ -85,18 +642,57 @@ class GradeCalculatorApp:
             True if successful, False otherwise
         """
         try:
-            if student_id not in self.students:
-                print(f"Error: Student {student_id} not found")
+            if not self.has_student(student_id):
+                message = f"Student {student_id} not found"
+                print(f"Error: {message}")
+                record_error("add_evaluation", message)
                 return False
 
             evaluation = Evaluation(student_id, evaluation_id, grade,
                                    weight_percentage)
-            self.students[student_id].add_evaluation(evaluation)
+            self._insert_evaluation(evaluation)
             return True
         except ValueError as e:
             print(f"Error adding evaluation: {str(e)}")
+            record_error("add_evaluation", e)
             return False
 
+    @compacting
+    def add_evaluations_bulk(self, evaluations: Iterable[Evaluation]) -> int:
+        """
+        Add already validated evaluations without printing per row.
+
+        Args:
+            evaluations: Evaluation objects of registered students
+
+        Returns:
+            The number of evaluations added
+
+        Raises:
+            ValueError: If an evaluation's student is not registered
+        """
+        added = 0
+        for evaluation in evaluations:
+            self._insert_evaluation(evaluation)
+            added += 1
+        return added
+
+    def _insert_evaluation(self, evaluation: Evaluation) -> None:
+        """Attach a validated evaluation to its registered student."""
+        student = self.get_student(evaluation.student_id)
+        if student is None:
+            raise ValueError(f"Student {evaluation.student_id} not found")
+        if self.wal is not None:
+            records = _import_optional("wal")
+            self.wal.append(records.ADD_EVALUATION, evaluation.student_id,
+                            evaluation.evaluation_id, evaluation.grade,
+                            evaluation.weight_percentage)
+        student.add_evaluation(evaluation)
+        if self.storage is not None:
+            self.storage.save_evaluation(evaluation)
+        if self.ranking is not None:
+            self.ranking.refresh_student(evaluation.student_id)
+
     def should_all_years_teacher(self, course: str) -> bool:
         """
         Determine if a teacher teaches across all academic years.
@@ -133,6 +729,8 @@ class GradeCalculatorApp:
         self.add_evaluation("S003", "E002", 11.5, 40.0)
         self.add_evaluation("S003", "E003", 13.0, 30.0)
 
+    @instrumented("get_student_final_grade")
+    @traced("get_student_final_grade")
     def get_student_final_grade(self, student_id: str,
                                 attendance_percentage: float = 100.0,
                                 extra_points: float = 0.0,
@@ -151,26 +749,232 @@ class GradeCalculatorApp:
         Returns:
             Tuple of (final_grade, details) or None if student not found
         """
-        if student_id not in self.students:
-            print(f"Error: Student {student_id} not found")
+        # Failures are printed, so they are counted here rather than by
+        # the instrumented wrapper
+        student = self.find_student(student_id)
+        if student is None:
+            message = f"Student {student_id} not found"
+            print(f"Error: {message}")
+            record_error("get_student_final_grade", message)
             return None
 
-        student = self.students[student_id]
-        if not student.get_evaluations():
-            print(f"Error: Student {student_id} has no evaluations")
+        if student.get_evaluation_count() == 0:
+            message = f"Student {student_id} has no evaluations"
+            print(f"Error: {message}")
+            record_error("get_student_final_grade", message)
             return None
 
+        calculator = self.grade_calculator
+        # The versions change whenever the student's evaluations or the
+        # calculator's policies change, so stale entries are never hit
+        cache_key = (student_id, student.version, calculator.policy_version,
+                     attendance_percentage, extra_points,
+                     reached_minimum_attendance)
+        cached = self.grade_cache.get(cache_key)
+        if cached is not None:
+            return cached[0], dict(cached[1])
+
         try:
-            final_grade, details = self.grade_calculator.calculate_final_grade(
-                student.get_evaluations(),
+            final_grade, details = calculator.calculate_student_final_grade(
+                student,
                 attendance_percentage,
                 extra_points,
                 reached_minimum_attendance
             )
+            self.grade_cache.put(cache_key, (final_grade, dict(details)))
             return final_grade, details
         except ValueError as e:
             print(f"Error calculating grade: {str(e)}")
+            record_error("get_student_final_grade", e)
+            return None
+
+    def get_student_required_grade(self, student_id: str,
+                                   remaining_weights: List[float],
+                                   target_grade: Optional[float] = None,
+                                   attendance_percentage: float = 100.0,
+                                   extra_points: float = 0.0,
+                                   reached_minimum_attendance: bool = True
+                                   ) -> Optional[tuple]:
+        """
+        Calculate the grade a student still needs on remaining evaluations.
+
+        Args:
+            student_id: The student identifier
+            remaining_weights: Weight percentage of each evaluation to come
+            target_grade: Final grade to reach (default: PASSING_GRADE)
+            attendance_percentage: Student's attendance percentage
+            extra_points: Number of extra points earned
+            reached_minimum_attendance: Whether student reached minimum
+                                       attendance requirements
+
+        Returns:
+            Tuple of (required_grade, details) as
+            GradeCalculator.calculate_required_grade, or None on error
+        """
+        student = self.find_student(student_id)
+        if student is None:
+            message = f"Student {student_id} not found"
+            print(f"Error: {message}")
+            record_error("get_student_required_grade", message)
             return None
+        try:
+            return self.grade_calculator.calculate_required_grade(
+                student, remaining_weights, target_grade,
+                attendance_percentage, extra_points,
+                reached_minimum_attendance
+            )
+        except ValueError as e:
+            print(f"Error calculating required grade: {str(e)}")
+            record_error("get_student_required_grade", e)
+            return None
+
+    def get_required_grades(self, remaining_weights: List[float],
+                            target_grade: Optional[float] = None,
+                            inputs: Optional[dict] = None,
+                            at_risk_only: bool = False) -> dict:
+        """
+        Calculate the required grade of every registered student.
+
+        Args:
+            remaining_weights: Weight percentages still to come
+            target_grade: Final grade to reach (default: PASSING_GRADE)
+            inputs: Optional mapping of student_id to (attendance_percentage,
+                    extra_points, reached_minimum_attendance)
+            at_risk_only: Keep only students who would not reach the
+                          target with the minimum grade on what remains
+
+        Returns:
+            Dict of student_id to (required_grade, details), or None for
+            students that cannot be solved, in registration order
+
+        Raises:
+            ValueError: If no weights are given, or a weight or the target
+                        is out of range
+        """
+        results = self.grade_calculator.calculate_required_grades_batch(
+            self.get_all_students(), remaining_weights, target_grade, inputs)
+        if at_risk_only:
+            minimum = self.grade_calculator.MIN_GRADE
+            results = {student_id: result
+                       for student_id, result in results.items()
+                       if result is not None and result[0] != minimum}
+        return results
+
+    def grade_all_students(self, inputs: Optional[dict] = None,
+                           processes: Optional[int] = None,
+                           sketch: Optional[GradeSketch] = None) -> dict:
+        """
+        Calculate the final grade of every registered student.
+
+        Args:
+            inputs: Optional mapping of student_id to (attendance_percentage,
+                    extra_points, reached_minimum_attendance); students not
+                    listed use (100.0, 0.0, True)
+            processes: Number of worker processes; None or 1 grades in the
+                       current process, 0 uses one worker per CPU
+            sketch: Optional GradeSketch every final grade is added to
+
+        Returns:
+            Dict of student_id to (final_grade, details), or None when the
+            student has no evaluations or too many, in registration order
+        """
+        self.get_all_students()
+        return self._grade_students(self.students, inputs, processes, sketch)
+
+    def _grade_students(self, students: dict, inputs: Optional[dict],
+                        processes: Optional[int],
+                        sketch: Optional[GradeSketch]) -> dict:
+        """Grade a roster serially or across worker processes."""
+        parallel = _import_optional("parallel")
+        if processes is None or processes == 1:
+            return parallel.grade_students_serial(
+                students, self.grade_calculator, inputs, sketch)
+        return parallel.grade_students_parallel(
+            students, self.grade_calculator, inputs, processes or None,
+            sketch)
+
+    def get_grade_distribution(self, course: Optional[str] = None,
+                               inputs: Optional[dict] = None,
+                               processes: Optional[int] = None,
+                               bin_count: int = GradeSketch.DEFAULT_BIN_COUNT
+                               ) -> GradeSketch:
+        """
+        Sketch the distribution of final grades of a course or cohort.
+
+        Args:
+            course: Course name (None for every registered student)
+            inputs: Optional mapping of student_id to (attendance_percentage,
+                    extra_points, reached_minimum_attendance)
+            processes: Number of worker processes, as in grade_all_students
+            bin_count: Number of histogram bins over the 0-20 scale
+
+        Returns:
+            GradeSketch of the final grades of the gradable students
+        """
+        sketch = GradeSketch(bin_count)
+        if course is None:
+            self.get_all_students()
+            students = self.students
+        else:
+            students = {}
+            for teacher_id in self.course_index.get_teacher_ids_by_course(
+                    course):
+                for student in self._teacher_students(teacher_id):
+                    students[student.student_id] = student
+        self._grade_students(students, inputs, processes, sketch)
+        return sketch
+
+    def sweep_policies(self, minimum_attendances: Optional[list] = None,
+                       penalty_percentages: Optional[list] = None,
+                       extra_points_values: Optional[list] = None,
+                       inputs: Optional[dict] = None,
+                       passing_grade: Optional[float] = None) -> List[dict]:
+        """
+        Grade every student under each combination of policy parameters.
+
+        A student reaches the minimum attendance in a scenario when its
+        attendance percentage meets that scenario's minimum.
+
+        Args:
+            minimum_attendances: Minimum attendance percentages to try
+                                 (default: the current policy's)
+            penalty_percentages: Attendance penalty percentages to try
+                                 (default: ATTENDANCE_PENALTY_PERCENTAGE)
+            extra_points_values: Extra points values to try (default: the
+                                 current policy's)
+            inputs: Optional mapping of student_id to (attendance_percentage,
+                    extra_points, ...); students not listed use
+                    (100.0, 0.0)
+            passing_grade: Lowest passing grade (default: PASSING_GRADE)
+
+        Returns:
+            One result dict per scenario, see scenarios.PolicySweep.run
+
+        Raises:
+            ValueError: If a grid value is out of range
+        """
+        calculator = self.grade_calculator
+        if minimum_attendances is None:
+            minimum_attendances = [
+                calculator.attendance_policy.minimum_attendance_percentage]
+        if penalty_percentages is None:
+            penalty_percentages = [calculator.ATTENDANCE_PENALTY_PERCENTAGE]
+        if extra_points_values is None:
+            extra_points_values = [
+                calculator.extra_points_policy.extra_points_value]
+        sweep = _import_optional("scenarios").PolicySweep(
+            calculator, self.get_all_students(), inputs)
+        return sweep.run(minimum_attendances, penalty_percentages,
+                         extra_points_values, passing_grade)
+
+    def get_cache_stats(self) -> dict:
+        """
+        Get the final-grade cache statistics.
+
+        Returns:
+            Dict with 'hits', 'misses', 'evictions', 'size' and 'maxsize'
+        """
+        return self.grade_cache.get_stats()
 
     def display_grade_report(self, student_id: str,
                             attendance_percentage: float = 100.0,
@@ -186,25 +990,161 @@ class GradeCalculatorApp:
             reached_minimum_attendance: Whether student reached minimum
                                        attendance
         """
-        if student_id not in self.students:
-            print(f"Error: Student {student_id} not found")
+        operation = "display_grade_report"
+        student = self.get_student(student_id)
+        if student is None:
+            message = f"Student {student_id} not found"
+            print(f"Error: {message}")
+            record_error(operation, message)
             return
 
-        student = self.students[student_id]
-        if not student.get_evaluations():
-            print(f"Error: Student {student_id} has no evaluations")
+        if student.get_evaluation_count() == 0:
+            message = f"Student {student_id} has no evaluations"
+            print(f"Error: {message}")
+            record_error(operation, message)
             return
 
-        report = self.grade_calculator.generate_grade_report(
-            student_id,
-            student.name,
-            student.get_evaluations(),
+        report, _ = self._get_rendered_report(
+            student,
             attendance_percentage,
             extra_points,
-            reached_minimum_attendance
+            reached_minimum_attendance,
+            operation
         )
         print(report)
 
+    @instrumented("get_grade_report")
+    @traced("get_grade_report")
+    def get_grade_report(self, student_id: str,
+                         attendance_percentage: float = 100.0,
+                         extra_points: float = 0.0,
+                         reached_minimum_attendance: bool = True
+                         ) -> Optional[str]:
+        """
+        Get the grade report of a student, served from cache when possible.
+
+        Args:
+            student_id: The student identifier
+            attendance_percentage: Student's attendance percentage
+            extra_points: Number of extra points earned
+            reached_minimum_attendance: Whether student reached minimum
+                                       attendance
+
+        Returns:
+            The formatted report, or None if student not found or has no
+            evaluations
+        """
+        rendered = self._lookup_report(student_id, attendance_percentage,
+                                       extra_points,
+                                       reached_minimum_attendance,
+                                       "get_grade_report")
+        return rendered[0] if rendered is not None else None
+
+    @instrumented("get_grade_report_bytes")
+    @traced("get_grade_report_bytes")
+    def get_grade_report_bytes(self, student_id: str,
+                               attendance_percentage: float = 100.0,
+                               extra_points: float = 0.0,
+                               reached_minimum_attendance: bool = True
+                               ) -> Optional[bytes]:
+        """
+        Get the UTF-8 encoded grade report of a student.
+
+        The encoded form is cached next to the text, so it can be written
+        to a socket or file repeatedly without re-encoding.
+
+        Args:
+            student_id: The student identifier
+            attendance_percentage: Student's attendance percentage
+            extra_points: Number of extra points earned
+            reached_minimum_attendance: Whether student reached minimum
+                                       attendance
+
+        Returns:
+            The encoded report, or None if student not found or has no
+            evaluations
+        """
+        rendered = self._lookup_report(student_id, attendance_percentage,
+                                       extra_points,
+                                       reached_minimum_attendance,
+                                       "get_grade_report_bytes")
+        return rendered[1] if rendered is not None else None
+
+    def get_report_cache_stats(self) -> dict:
+        """
+        Get the grade report cache statistics.
+
+        Returns:
+            Dict with 'hits', 'misses', 'evictions', 'size' and 'maxsize'
+        """
+        return self.report_cache.get_stats()
+
+    def _lookup_report(self, student_id: str, attendance_percentage: float,
+                       extra_points: float,
+                       reached_minimum_attendance: bool,
+                       operation: str = "get_grade_report"
+                       ) -> Optional[Tuple[str, bytes]]:
+        """Validate the student and return its (text, bytes) report.
+
+        Failures are counted as errors of operation.
+        """
+        student = self.get_student(student_id)
+        if student is None:
+            message = f"Student {student_id} not found"
+            print(f"Error: {message}")
+            record_error(operation, message)
+            return None
+
+        if student.get_evaluation_count() == 0:
+            message = f"Student {student_id} has no evaluations"
+            print(f"Error: {message}")
+            record_error(operation, message)
+            return None
+
+        return self._get_rendered_report(student, attendance_percentage,
+                                         extra_points,
+                                         reached_minimum_attendance,
+                                         operation)
+
+    def _get_rendered_report(self, student: Student,
+                             attendance_percentage: float,
+                             extra_points: float,
+                             reached_minimum_attendance: bool,
+                             operation: str = "get_grade_report"
+                             ) -> Tuple[str, bytes]:
+        """Return the cached (text, bytes) report, rendering it on a miss.
+
+        A calculation error is counted as an error of operation.
+        """
+        calculator = self.grade_calculator
+        # Everything that feeds the report text is part of the key
+        cache_key = (student.student_id, student.name, student.version,
+                     calculator.policy_version, attendance_percentage,
+                     extra_points, reached_minimum_attendance)
+        rendered = self.report_cache.get(cache_key)
+        if rendered is not None:
+            return rendered
+
+        try:
+            _, details = calculator.calculate_student_final_grade(
+                student,
+                attendance_percentage,
+                extra_points,
+                reached_minimum_attendance
+            )
+        except ValueError as e:
+            record_error(operation, e)
+            report = f"Error generating report: {str(e)}"
+            return report, report.encode("utf-8")
+
+        report = calculator.render_grade_report(
+            student.student_id, student.name,
+            student.get_evaluation_count(), details
+        )
+        rendered = (report, report.encode("utf-8"))
+        self.report_cache.put(cache_key, rendered)
+        return rendered
+
     def interactive_terminal_mode(self) -> None:
         """Run the application in interactive terminal mode."""
         print("\n" + "=" * 60)
@@ -213,19 +1153,25 @@ class GradeCalculatorApp:
         print("=" * 60 + "\n")
 
         # Step 1: Get student information
-        student_id = input("Enter student ID/code: ").strip()
-
-        if student_id not in self.students:
-            print(f"Error: Student {student_id} not registered in system")
+        entered = input("Enter student ID/code or name: ").strip()
+        student_id = self._resolve_student_id(entered)
+
+        student = self.get_student(student_id) if student_id else None
+        if student is None:
+            message = f"Student {entered} not registered in system"
+            print(f"Error: {message}")
+            record_error("interactive_terminal_mode", message)
+            self._print_name_suggestions(entered)
             return
 
-        student = self.students[student_id]
         print(f"\nStudent found: {student.name}")
 
         # Step 2: Get student evaluations
         eval_count = student.get_evaluation_count()
         if eval_count == 0:
-            print("Error: Student has no evaluations registered")
+            message = "Student has no evaluations registered"
+            print(f"Error: {message}")
+            record_error("interactive_terminal_mode", message)
             return
 
         print(f"Total evaluations: {eval_count}")
@@ -244,6 +1190,7 @@ class GradeCalculatorApp:
                 raise ValueError("Attendance must be between 0 and 100")
         except ValueError as e:
             print(f"Error: Invalid attendance value - {str(e)}")
+            record_error("interactive_terminal_mode", e)
             return
 
         # Step 4: Check minimum attendance (RNF02)
@@ -263,6 +1210,7 @@ class GradeCalculatorApp:
                 raise ValueError("Extra points cannot be negative")
         except ValueError as e:
             print(f"Error: Invalid extra points - {str(e)}")
+            record_error("interactive_terminal_mode", e)
             return
 
         # Step 6: Calculate and display final grade
@@ -315,7 +1263,7 @@ class GradeCalculatorApp:
             print("Error: Student ID and name cannot be empty")
             return
 
-        if student_id in self.students:
+        if self.has_student(student_id):
             print(f"Error: Student {student_id} already exists")
             return
 
@@ -326,8 +1274,10 @@ class GradeCalculatorApp:
         """Menu option to add an evaluation."""
         student_id = input("Enter student ID: ").strip()
 
-        if student_id not in self.students:
-            print(f"Error: Student {student_id} not found")
+        if not self.has_student(student_id):
+            message = f"Student {student_id} not found"
+            print(f"Error: {message}")
+            record_error("menu_add_evaluation", message)
             return
 
         eval_id = input("Enter evaluation ID: ").strip()
@@ -346,16 +1296,19 @@ class GradeCalculatorApp:
                 print("Failed to add evaluation")
         except ValueError as e:
             print(f"Error: Invalid input - {str(e)}")
+            record_error("menu_add_evaluation", e)
 
     def menu_view_student(self) -> None:
         """Menu option to view student information."""
-        student_id = input("Enter student ID: ").strip()
+        entered = input("Enter student ID or name: ").strip()
+        student_id = self._resolve_student_id(entered)
 
-        if student_id not in self.students:
-            print(f"Error: Student {student_id} not found")
+        student = self.get_student(student_id) if student_id else None
+        if student is None:
+            print(f"Error: Student {entered} not found")
+            self._print_name_suggestions(entered)
             return
 
-        student = self.students[student_id]
         print(f"\nStudent: {student.name} (ID: {student_id})")
         print(f"Evaluations: {student.get_evaluation_count()}")
 
@@ -366,14 +1319,26 @@ class GradeCalculatorApp:
                       f"(Weight: {eval_obj.weight_percentage}%)")
 
 
-def main():
-    """Main entry point for the application."""
-    app = GradeCalculatorApp(load_sample_data=True)
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Main entry point for the application.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:]); see
+              profiling.build_parser for --batch, --profile and
+              --tracemalloc
+    """
+    profiling = _import_optional("profiling")
+    options = profiling.parse_args(argv)
+
+    def create_app() -> GradeCalculatorApp:
+        app = GradeCalculatorApp(load_sample_data=True)
+
+        print("Sample data loaded successfully!\n")
 
-    print("Sample data loaded successfully!\n")
+        return app
 
-    # Run the application
-    app.run()
+    profiling.run_session(create_app, options)
 
 
 if __name__ == "__main__":
@@ -5,10 +5,18 @@ Can be executed directly with: python main_standalone.py
 import sys
 from typing import List, Optional
 
+# The profiling options only need the standard library
+try:
+    from .profiling import parse_args, run_session
+except (ImportError, ValueError):
+    from profiling import parse_args, run_session
+
 # Import all modules directly
 class Evaluation:
     """Represents an evaluation record for a student."""
 
+    __slots__ = ("student_id", "evaluation_id", "grade", "weight_percentage")
+
     MIN_GRADE = 0.0
     MAX_GRADE = 20.0
     DEFAULT_WEIGHT_PERCENTAGE = 100.0
@@ -41,6 +49,8 @@ class Evaluation:
 class Student:
     """Represents a student in the CS-GradeCalculator system."""
 
+    __slots__ = ("student_id", "name", "evaluations")
+
     def __init__(self, student_id: str, name: str):
         self.student_id = student_id
         self.name = name
@@ -67,6 +77,8 @@ class Student:
 class Teacher:
     """Represents a teacher in the CS-GradeCalculator system."""
 
+    __slots__ = ("teacher_id", "name", "course")
+
     def __init__(self, teacher_id: str, name: str, course: str):
         self.teacher_id = teacher_id
         self.name = name
@@ -504,13 +516,25 @@ class GradeCalculatorApp:
                       f"(Weight: {eval_obj.weight_percentage}%)")
 
 
-def main():
-    """Main entry point for the application."""
-    app = GradeCalculatorApp(load_sample_data=True)
+def main(argv: Optional[List[str]] = None) -> None:
+    """
+    Main entry point for the application.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:]); see
+              profiling.build_parser for --batch, --profile and
+              --tracemalloc
+    """
+    options = parse_args(argv)
+
+    def create_app() -> GradeCalculatorApp:
+        app = GradeCalculatorApp(load_sample_data=True)
+
+        print("Sample data loaded successfully!\n")
 
-    print("Sample data loaded successfully!\n")
+        return app
 
-    app.run()
+    run_session(create_app, options)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,270 @@
+"""
+Metrics module for opt-in latency and throughput instrumentation.
+
+This module contains the Metrics registry (per-operation call counters,
+latency histograms and ValueError counts by message category) and the
+instrumented decorator applied to the grading pipeline. Instrumentation
+is off until enable_metrics() is called; while it is off an instrumented
+call costs one global lookup on top of the call itself. Operations that
+catch their own errors report them with record_error().
+
+Metrics are exported as Prometheus text exposition format or JSON, using
+only the standard library.
+"""
+import functools
+import json
+import re
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+# Latency bucket upper bounds in seconds (1 microsecond to 1 second)
+DEFAULT_BUCKETS = (
+    0.000001, 0.0000025, 0.000005, 0.00001, 0.000025, 0.00005, 0.0001,
+    0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+    0.25, 0.5, 1.0
+)
+
+_NUMBER_TOKEN = re.compile(r"\S*\d\S*")
+
+_active: Optional["Metrics"] = None
+
+
+def error_category(message: str) -> str:
+    """
+    Reduce an error message to its category.
+
+    Words containing digits (IDs, grades, limits) are replaced with "<n>",
+    so "Student S001 not found" and "Student S002 not found" share one
+    category.
+
+    Args:
+        message: The exception message
+
+    Returns:
+        The lower-cased message with its variable parts masked
+    """
+    return _NUMBER_TOKEN.sub("<n>", message.strip().lower()) or "<empty>"
+
+
+class Metrics:
+    """Thread-safe registry of per-operation counters and histograms."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize an empty Metrics registry.
+
+        Args:
+            buckets: Ascending latency bucket upper bounds, in seconds
+
+        Raises:
+            ValueError: If buckets is empty or not strictly ascending
+        """
+        if not buckets or any(a >= b for a, b in zip(buckets, buckets[1:])):
+            raise ValueError("Buckets must be a non-empty ascending sequence")
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget every recorded observation."""
+        with self._lock:
+            self._calls: Dict[str, int] = {}
+            self._histograms: Dict[str, list] = {}
+            self._sums: Dict[str, float] = {}
+            self._errors: Dict[Tuple[str, str], int] = {}
+            self._started = time.monotonic()
+
+    def observe(self, operation: str, seconds: float) -> None:
+        """
+        Record one call of an operation and its latency.
+
+        Args:
+            operation: Operation name
+            seconds: Wall-clock duration of the call
+        """
+        # The last slot counts observations above every bucket (+Inf)
+        slot = bisect_left(self.buckets, seconds)
+        with self._lock:
+            histogram = self._histograms.get(operation)
+            if histogram is None:
+                histogram = self._histograms[operation] = \
+                    [0] * (len(self.buckets) + 1)
+                self._calls[operation] = 0
+                self._sums[operation] = 0.0
+            histogram[slot] += 1
+            self._calls[operation] += 1
+            self._sums[operation] += seconds
+
+    def record_error(self, operation: str, error: BaseException) -> None:
+        """
+        Count an error of an operation by message category.
+
+        Args:
+            operation: Operation name
+            error: The raised exception
+        """
+        key = (operation, error_category(str(error)))
+        with self._lock:
+            self._errors[key] = self._errors.get(key, 0) + 1
+
+    def get_stats(self) -> dict:
+        """
+        Get a JSON-serializable view of the metrics.
+
+        Returns:
+            Dict with 'uptime_seconds' and 'operations', mapping each
+            operation to 'calls', 'calls_per_second', 'latency_sum_seconds',
+            'latency_mean_seconds', 'latency_buckets' (cumulative counts
+            keyed by upper bound, "+Inf" last) and 'errors' (count per
+            message category)
+        """
+        with self._lock:
+            uptime = time.monotonic() - self._started
+            operations = {}
+            names = set(self._calls) | {name for name, _ in self._errors}
+            for name in sorted(names):
+                calls = self._calls.get(name, 0)
+                histogram = self._histograms.get(
+                    name, [0] * (len(self.buckets) + 1))
+                cumulative = {}
+                total = 0
+                for bound, value in zip(self.buckets + (None,), histogram):
+                    total += value
+                    cumulative["+Inf" if bound is None else repr(bound)] = \
+                        total
+                latency_sum = self._sums.get(name, 0.0)
+                operations[name] = {
+                    'calls': calls,
+                    'calls_per_second': calls / uptime if uptime else 0.0,
+                    'latency_sum_seconds': latency_sum,
+                    'latency_mean_seconds': (latency_sum / calls
+                                             if calls else 0.0),
+                    'latency_buckets': cumulative,
+                    'errors': {category: count for (operation, category),
+                               count in sorted(self._errors.items())
+                               if operation == name}
+                }
+        return {'uptime_seconds': uptime, 'operations': operations}
+
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """Return get_stats() encoded as JSON."""
+        return json.dumps(self.get_stats(), indent=indent, sort_keys=True)
+
+    def to_prometheus(self, prefix: str = "grade_calculator") -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix: Metric name prefix
+
+        Returns:
+            The exposition text (newline terminated)
+        """
+        stats = self.get_stats()['operations']
+        lines = [
+            f"# HELP {prefix}_calls_total Calls per operation.",
+            f"# TYPE {prefix}_calls_total counter",
+        ]
+        for name, operation in stats.items():
+            lines.append(f'{prefix}_calls_total{{operation="{name}"}} '
+                         f"{operation['calls']}")
+        lines += [
+            f"# HELP {prefix}_latency_seconds Latency per operation.",
+            f"# TYPE {prefix}_latency_seconds histogram",
+        ]
+        for name, operation in stats.items():
+            for bound, count in operation['latency_buckets'].items():
+                lines.append(f'{prefix}_latency_seconds_bucket{{operation='
+                             f'"{name}",le="{bound}"}} {count}')
+            lines.append(f'{prefix}_latency_seconds_sum{{operation='
+                         f'"{name}"}} {operation["latency_sum_seconds"]!r}')
+            lines.append(f'{prefix}_latency_seconds_count{{operation='
+                         f'"{name}"}} {operation["calls"]}')
+        lines += [
+            f"# HELP {prefix}_errors_total ValueErrors per operation and "
+            f"message category.",
+            f"# TYPE {prefix}_errors_total counter",
+        ]
+        for name, operation in stats.items():
+            for category, count in operation['errors'].items():
+                escaped = category.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{prefix}_errors_total{{operation="{name}",'
+                             f'category="{escaped}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def __repr__(self) -> str:
+        """Return a string representation of the Metrics."""
+        return f"Metrics(operations={len(self._calls)})"
+
+
+def enable_metrics(metrics: Optional[Metrics] = None) -> Metrics:
+    """
+    Start recording instrumented calls.
+
+    Args:
+        metrics: Registry to record into (default: a new Metrics)
+
+    Returns:
+        The active registry
+    """
+    global _active
+    _active = metrics if metrics is not None else Metrics()
+    return _active
+
+
+def disable_metrics() -> None:
+    """Stop recording instrumented calls."""
+    global _active
+    _active = None
+
+
+def get_metrics() -> Optional[Metrics]:
+    """Return the active registry, or None when metrics are off."""
+    return _active
+
+
+def record_error(operation: str, error) -> None:
+    """
+    Count an error an operation caught and reported itself.
+
+    Instrumented functions that print an error and return None instead of
+    raising call this, so their failures are counted like raised
+    ValueErrors. Does nothing while metrics are off.
+
+    Args:
+        operation: Operation name
+        error: The caught exception, or the message of the failure
+    """
+    metrics = _active
+    if metrics is not None:
+        metrics.record_error(operation, error)
+
+
+def instrumented(operation: str) -> Callable:
+    """
+    Decorate a function so its calls, latency and ValueErrors are recorded.
+
+    Args:
+        operation: Name the function is recorded under
+
+    Returns:
+        The decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            metrics = _active
+            if metrics is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            except ValueError as error:
+                metrics.record_error(operation, error)
+                raise
+            finally:
+                metrics.observe(operation, time.perf_counter() - start)
+        return wrapper
+    return decorator
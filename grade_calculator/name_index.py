@@ -0,0 +1,212 @@
+"""
+Name index module for looking students up by name.
+
+This module contains NamePrefixIndex, a sorted array searched with bisect
+that answers "names starting with ..." queries, and TrigramIndex, an
+inverted index of character trigrams for typo-tolerant lookups. Both
+compare names after normalize_name, so "maria" finds "María García", and
+both are updated one student at a time.
+"""
+import unicodedata
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, List, Set, Tuple
+
+
+def normalize_name(text: str) -> str:
+    """
+    Normalize a name for searching.
+
+    Accents are removed, case is folded and whitespace is collapsed.
+
+    Args:
+        text: The name or query
+
+    Returns:
+        The normalized text
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(ch for ch in decomposed
+                       if not unicodedata.combining(ch))
+    return " ".join(stripped.casefold().split())
+
+
+class NamePrefixIndex:
+    """Sorted (key, student_id) array supporting prefix queries.
+
+    Every word of a name starts a key ("maria garcia" and "garcia"), so a
+    query matches the beginning of the first name or of any later name.
+    """
+
+    def __init__(self):
+        """Initialize an empty NamePrefixIndex."""
+        self._entries: List[Tuple[str, str]] = []
+        self._names: Dict[str, str] = {}
+
+    @staticmethod
+    def _keys(name: str) -> List[str]:
+        """Return the index keys of a name, one per word."""
+        words = normalize_name(name).split(" ")
+        return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+    def add(self, student_id: str, name: str) -> None:
+        """
+        Index a student's name, replacing any previous entry.
+
+        Args:
+            student_id: The student identifier
+            name: The student's full name
+        """
+        self.remove(student_id)
+        self._names[student_id] = name
+        for key in self._keys(name):
+            insort(self._entries, (key, student_id))
+
+    def remove(self, student_id: str) -> None:
+        """
+        Remove a student from the index (no-op if not indexed).
+
+        Args:
+            student_id: The student identifier
+        """
+        name = self._names.pop(student_id, None)
+        if name is None:
+            return
+        for key in self._keys(name):
+            position = bisect_left(self._entries, (key, student_id))
+            if (position < len(self._entries)
+                    and self._entries[position] == (key, student_id)):
+                del self._entries[position]
+
+    def search(self, prefix: str, limit: int = 10) -> List[Tuple[str, str]]:
+        """
+        Find students whose name (or a later word of it) starts with prefix.
+
+        Args:
+            prefix: Beginning of the name, e.g. "garc" or "maria g"
+            limit: Maximum number of results
+
+        Returns:
+            List of (student_id, name) in alphabetical key order
+        """
+        prefix = normalize_name(prefix)
+        if not prefix:
+            return []
+        results = []
+        seen: Set[str] = set()
+        position = bisect_left(self._entries, (prefix, ""))
+        while position < len(self._entries) and len(results) < limit:
+            key, student_id = self._entries[position]
+            if not key.startswith(prefix):
+                break
+            if student_id not in seen:
+                seen.add(student_id)
+                results.append((student_id, self._names[student_id]))
+            position += 1
+        return results
+
+    def __contains__(self, student_id: str) -> bool:
+        """Return True if the student is indexed."""
+        return student_id in self._names
+
+    def __len__(self) -> int:
+        """Return the number of indexed students."""
+        return len(self._names)
+
+
+class TrigramIndex:
+    """Inverted index of name trigrams for fuzzy matching."""
+
+    DEFAULT_MIN_SIMILARITY = 0.3
+
+    def __init__(self):
+        """Initialize an empty TrigramIndex."""
+        self._postings: Dict[str, Set[str]] = {}
+        self._names: Dict[str, str] = {}
+        self._sizes: Dict[str, int] = {}
+
+    @staticmethod
+    def trigrams(text: str) -> Set[str]:
+        """
+        Return the trigrams of a normalized, space-padded text.
+
+        Args:
+            text: The name or query
+
+        Returns:
+            Set of three-character substrings
+        """
+        padded = f"  {normalize_name(text)} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+    def add(self, student_id: str, name: str) -> None:
+        """
+        Index a student's name, replacing any previous entry.
+
+        Args:
+            student_id: The student identifier
+            name: The student's full name
+        """
+        self.remove(student_id)
+        grams = self.trigrams(name)
+        self._names[student_id] = name
+        self._sizes[student_id] = len(grams)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(student_id)
+
+    def remove(self, student_id: str) -> None:
+        """
+        Remove a student from the index (no-op if not indexed).
+
+        Args:
+            student_id: The student identifier
+        """
+        name = self._names.pop(student_id, None)
+        if name is None:
+            return
+        del self._sizes[student_id]
+        for gram in self.trigrams(name):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(student_id)
+                if not posting:
+                    del self._postings[gram]
+
+    def search(self, query: str, limit: int = 10,
+               min_similarity: float = DEFAULT_MIN_SIMILARITY
+               ) -> List[Tuple[str, str, float]]:
+        """
+        Find the names most similar to a possibly misspelled query.
+
+        Args:
+            query: The approximate name
+            limit: Maximum number of results
+            min_similarity: Smallest Jaccard similarity (0-1) returned
+
+        Returns:
+            List of (student_id, name, similarity), best match first
+        """
+        grams = self.trigrams(query)
+        if not normalize_name(query):
+            return []
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+        scored = []
+        for student_id, common in shared.items():
+            similarity = common / (len(grams) + self._sizes[student_id]
+                                   - common)
+            if similarity >= min_similarity:
+                scored.append((-similarity, self._names[student_id],
+                               student_id))
+        scored.sort()
+        return [(student_id, name, -negative)
+                for negative, name, student_id in scored[:limit]]
+
+    def __contains__(self, student_id: str) -> bool:
+        """Return True if the student is indexed."""
+        return student_id in self._names
+
+    def __len__(self) -> int:
+        """Return the number of indexed students."""
+        return len(self._names)
@@ -0,0 +1,233 @@
+"""
+Parallel grading module for grading whole cohorts across CPU cores.
+
+This module shards students by a stable hash of their student_id, ships
+each shard to a worker process as packed evaluation columns (not pickled
+Student objects) and merges the per-shard results back in roster order,
+so the output is identical to grading the students serially. Both paths
+can also feed a GradeSketch; in the parallel path every worker sketches its
+own shard and the shard sketches are merged.
+"""
+import os
+import zlib
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+# Support both direct execution and package imports
+try:
+    from .grade_calculator import GradeCalculator
+    from .sketch import GradeSketch
+except (ImportError, ValueError):
+    from grade_calculator import GradeCalculator
+    from sketch import GradeSketch
+
+DEFAULT_INPUTS = (100.0, 0.0, True)
+
+GradeResult = Optional[Tuple[float, Dict[str, float]]]
+
+
+def shard_for(student_id: str, shard_count: int) -> int:
+    """
+    Get the shard a student belongs to.
+
+    Uses CRC32 instead of hash() so the assignment is the same in every
+    process and every run.
+
+    Args:
+        student_id: The student identifier
+        shard_count: Total number of shards
+
+    Returns:
+        The shard number (0 <= shard < shard_count)
+    """
+    return zlib.crc32(student_id.encode("utf-8")) % shard_count
+
+
+def _is_gradable(student, calculator: GradeCalculator) -> bool:
+    """Return True if the student's evaluation count can be graded."""
+    count = student.get_evaluation_count()
+    return 0 < count <= calculator.MAX_EVALUATIONS_PER_STUDENT
+
+
+def pack_chunk(students: Iterable, inputs: Mapping[str, tuple]) -> dict:
+    """
+    Pack students into compact columns for a worker process.
+
+    Args:
+        students: Student objects of one shard
+        inputs: Mapping of student_id to (attendance_percentage,
+                extra_points, reached_minimum_attendance)
+
+    Returns:
+        Dict of bytes columns ('grades', 'weights', 'offsets',
+        'attendance', 'extra_points', 'reached') plus the list of
+        'student_ids'
+    """
+    student_ids = []
+    grades = array("d")
+    weights = array("d")
+    offsets = array("q", [0])
+    attendance = array("d")
+    extra_points = array("d")
+    reached = bytearray()
+    for student in students:
+        for evaluation in student.evaluations:
+            grades.append(evaluation.grade)
+            weights.append(evaluation.weight_percentage)
+        offsets.append(len(grades))
+        student_attendance, student_extra, student_reached = inputs.get(
+            student.student_id, DEFAULT_INPUTS
+        )
+        attendance.append(student_attendance)
+        extra_points.append(student_extra)
+        reached.append(1 if student_reached else 0)
+        student_ids.append(student.student_id)
+    return {
+        'student_ids': student_ids,
+        'grades': grades.tobytes(),
+        'weights': weights.tobytes(),
+        'offsets': offsets.tobytes(),
+        'attendance': attendance.tobytes(),
+        'extra_points': extra_points.tobytes(),
+        'reached': bytes(reached)
+    }
+
+
+def _unpack_column(typecode: str, data: bytes) -> array:
+    """Rebuild an array column from its bytes."""
+    column = array(typecode)
+    column.frombytes(data)
+    return column
+
+
+def grade_chunk(calculator: GradeCalculator, chunk: dict
+                ) -> Tuple[List[str], List[Tuple[float, Dict[str, float]]]]:
+    """
+    Grade one packed chunk (runs inside a worker process).
+
+    Args:
+        calculator: The GradeCalculator (with its policies) to use
+        chunk: A chunk produced by pack_chunk
+
+    Returns:
+        Tuple of (student_ids, results) in chunk order
+    """
+    results = calculator.calculate_final_grades_batch(
+        _unpack_column("d", chunk['grades']),
+        _unpack_column("d", chunk['weights']),
+        _unpack_column("q", chunk['offsets']),
+        _unpack_column("d", chunk['attendance']),
+        _unpack_column("d", chunk['extra_points']),
+        [bool(flag) for flag in chunk['reached']]
+    )
+    return chunk['student_ids'], results
+
+
+def grade_and_sketch_chunk(calculator: GradeCalculator, chunk: dict,
+                           sketch: GradeSketch
+                           ) -> Tuple[List[str], list, GradeSketch]:
+    """
+    Grade one packed chunk and sketch its final grades (in a worker).
+
+    Args:
+        calculator: The GradeCalculator (with its policies) to use
+        chunk: A chunk produced by pack_chunk
+        sketch: Empty sketch to fill with the chunk's grades
+
+    Returns:
+        Tuple of (student_ids, results, sketch)
+    """
+    student_ids, results = grade_chunk(calculator, chunk)
+    for final_grade, _ in results:
+        sketch.add(final_grade)
+    return student_ids, results, sketch
+
+
+def grade_students_serial(students: Mapping[str, object],
+                          calculator: GradeCalculator,
+                          inputs: Optional[Mapping[str, tuple]] = None,
+                          sketch: Optional[GradeSketch] = None
+                          ) -> Dict[str, GradeResult]:
+    """
+    Grade every student one by one in the current process.
+
+    Args:
+        students: Mapping of student_id to Student
+        calculator: The GradeCalculator to use
+        inputs: Optional mapping of student_id to (attendance_percentage,
+                extra_points, reached_minimum_attendance)
+        sketch: Optional GradeSketch every final grade is added to
+
+    Returns:
+        Dict of student_id to (final_grade, details), or None when the
+        student cannot be graded, in roster order
+    """
+    inputs = inputs or {}
+    results: Dict[str, GradeResult] = {}
+    for student_id, student in students.items():
+        try:
+            results[student_id] = calculator.calculate_student_final_grade(
+                student, *inputs.get(student_id, DEFAULT_INPUTS)
+            )
+        except ValueError:
+            results[student_id] = None
+            continue
+        if sketch is not None:
+            sketch.add(results[student_id][0])
+    return results
+
+
+def grade_students_parallel(students: Mapping[str, object],
+                            calculator: GradeCalculator,
+                            inputs: Optional[Mapping[str, tuple]] = None,
+                            processes: Optional[int] = None,
+                            sketch: Optional[GradeSketch] = None
+                            ) -> Dict[str, GradeResult]:
+    """
+    Grade every student using a pool of worker processes.
+
+    Args:
+        students: Mapping of student_id to Student
+        calculator: The GradeCalculator to use
+        inputs: Optional mapping of student_id to (attendance_percentage,
+                extra_points, reached_minimum_attendance)
+        processes: Number of worker processes (default: CPU count)
+        sketch: Optional GradeSketch the workers' shard sketches are
+                merged into
+
+    Returns:
+        The same dict grade_students_serial would return
+    """
+    inputs = inputs or {}
+    shard_count = processes or os.cpu_count() or 1
+    shards: List[list] = [[] for _ in range(shard_count)]
+    for student_id, student in students.items():
+        if _is_gradable(student, calculator):
+            shards[shard_for(student_id, shard_count)].append(student)
+
+    with ProcessPoolExecutor(max_workers=shard_count) as executor:
+        if sketch is None:
+            futures = [
+                executor.submit(grade_chunk, calculator,
+                                pack_chunk(shard, inputs))
+                for shard in shards if shard
+            ]
+        else:
+            futures = [
+                executor.submit(grade_and_sketch_chunk, calculator,
+                                pack_chunk(shard, inputs),
+                                GradeSketch(sketch.bin_count,
+                                            sketch.min_grade,
+                                            sketch.max_grade))
+                for shard in shards if shard
+            ]
+        graded: Dict[str, Tuple[float, Dict[str, float]]] = {}
+        for future in futures:
+            student_ids, results, *shard_sketch = future.result()
+            graded.update(zip(student_ids, results))
+            if shard_sketch:
+                sketch.merge(shard_sketch[0])
+
+    # Merge in roster order so the output matches the serial path
+    return {student_id: graded.get(student_id) for student_id in students}
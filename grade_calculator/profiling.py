@@ -0,0 +1,272 @@
+"""
+Profiling module for the command-line entry points.
+
+This module contains the command-line options shared by main.main() and
+main_standalone.main() and run_session(), which runs a terminal session
+with them: --profile writes cProfile statistics sorted by a chosen key or,
+with --profiler sampling, collapsed stacks ("outer;inner count" lines, the
+input of flamegraph.pl and speedscope) from a thread sampling the session;
+--tracemalloc reports the top allocation sites when the session ends; and
+--batch reads the menu input from a file, ending the session at its end.
+"""
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import Callable, Optional, Sequence
+
+SORT_KEYS = ("cumulative", "tottime", "calls", "ncalls", "filename", "name")
+DEFAULT_SAMPLE_INTERVAL = 0.001
+DEFAULT_TOP_ALLOCATIONS = 10
+
+
+def build_parser(prog: Optional[str] = None) -> argparse.ArgumentParser:
+    """
+    Build the parser of the entry points' command-line options.
+
+    Args:
+        prog: Program name shown in the usage message
+
+    Returns:
+        The ArgumentParser
+    """
+    parser = argparse.ArgumentParser(
+        prog=prog, description="CS-GradeCalculator terminal application")
+    parser.add_argument(
+        "--batch", metavar="FILE",
+        help="read the menu input from FILE ('-' for stdin) and exit at "
+             "its end")
+    parser.add_argument(
+        "--profile", metavar="FILE",
+        help="profile the session and write the results to FILE")
+    parser.add_argument(
+        "--profiler", choices=("cprofile", "sampling"), default="cprofile",
+        help="cprofile writes sorted statistics, sampling writes collapsed "
+             "stacks for flame graphs (default: cprofile)")
+    parser.add_argument(
+        "--sort", choices=SORT_KEYS, default="cumulative",
+        help="sort key of the cProfile statistics (default: cumulative)")
+    parser.add_argument(
+        "--sample-interval", type=float, default=DEFAULT_SAMPLE_INTERVAL,
+        metavar="SECONDS",
+        help="seconds between samples of the sampling profiler "
+             f"(default: {DEFAULT_SAMPLE_INTERVAL})")
+    parser.add_argument(
+        "--tracemalloc", type=int, nargs="?", const=DEFAULT_TOP_ALLOCATIONS,
+        metavar="N",
+        help="report the N top allocation sites when the session ends "
+             f"(default N: {DEFAULT_TOP_ALLOCATIONS})")
+    return parser
+
+
+def parse_args(argv: Optional[Sequence[str]] = None,
+               prog: Optional[str] = None) -> argparse.Namespace:
+    """
+    Parse the entry points' command-line options.
+
+    Args:
+        argv: Arguments (default: sys.argv[1:])
+        prog: Program name shown in the usage message
+
+    Returns:
+        The parsed options
+    """
+    options = build_parser(prog).parse_args(argv)
+    if options.sample_interval <= 0:
+        raise SystemExit("Error: Sample interval must be greater than 0")
+    if options.tracemalloc is not None and options.tracemalloc <= 0:
+        raise SystemExit("Error: Number of allocation sites must be "
+                         "greater than 0")
+    return options
+
+
+class SamplingProfiler:
+    """Samples a thread's stack periodically into collapsed stacks."""
+
+    def __init__(self, interval: float = DEFAULT_SAMPLE_INTERVAL,
+                 thread_id: Optional[int] = None):
+        """
+        Initialize a SamplingProfiler.
+
+        Args:
+            interval: Seconds between samples
+            thread_id: Thread to sample (default: the calling thread)
+        """
+        self.interval = interval
+        self.thread_id = (thread_id if thread_id is not None
+                          else threading.get_ident())
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _label(frame) -> str:
+        """Return the flame graph label of a frame."""
+        code = frame.f_code
+        filename = os.path.basename(code.co_filename)
+        return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+    def _sample(self) -> None:
+        """Record the sampled thread's current stack."""
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            stack.append(self._label(frame))
+            frame = frame.f_back
+        if stack:
+            self.samples[";".join(reversed(stack))] += 1
+
+    def _run(self) -> None:
+        """Sample until stopped."""
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> None:
+        """Start sampling in a daemon thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        name="sampling-profiler")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def collapsed(self) -> str:
+        """
+        Render the samples as collapsed stacks.
+
+        Returns:
+            One "frame;frame;frame count" line per distinct stack, most
+            sampled first
+        """
+        return "".join(f"{stack} {count}\n"
+                       for stack, count in self.samples.most_common())
+
+
+def format_stats(profile: cProfile.Profile, sort: str = "cumulative") -> str:
+    """
+    Render cProfile statistics as text.
+
+    Args:
+        profile: The finished profile
+        sort: pstats sort key
+
+    Returns:
+        The statistics sorted by the key
+    """
+    stream = io.StringIO()
+    stats = pstats.Stats(profile, stream=stream)
+    stats.sort_stats(sort).print_stats()
+    return stream.getvalue()
+
+
+def format_allocations(snapshot: tracemalloc.Snapshot,
+                       limit: int = DEFAULT_TOP_ALLOCATIONS) -> str:
+    """
+    Render the top allocation sites of a tracemalloc snapshot.
+
+    Args:
+        snapshot: The snapshot
+        limit: Number of sites
+
+    Returns:
+        The report, one line per site, largest first
+    """
+    # Leave out the profilers' own bookkeeping
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, pstats.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+    statistics = snapshot.statistics("lineno")
+    lines = [f"Top {min(limit, len(statistics))} allocation sites:"]
+    for index, stat in enumerate(statistics[:limit], 1):
+        frame = stat.traceback[0]
+        lines.append(f"{index:>3}. {frame.filename}:{frame.lineno}: "
+                     f"{stat.size / 1024:.1f} KiB in {stat.count} blocks")
+    total = sum(stat.size for stat in statistics)
+    lines.append(f"Total traced: {total / 1024:.1f} KiB")
+    return "\n".join(lines) + "\n"
+
+
+def _write_text(path: str, text: str) -> None:
+    """Write a report file."""
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(text)
+
+
+def run_session(create_app: Callable[[], object],
+                options: argparse.Namespace) -> None:
+    """
+    Create an app and run its terminal session with the profiling and
+    batch options.
+
+    Profiling covers creating the app (loading its data) and the session.
+    The app is still alive when the allocation report is taken, so the
+    report shows what the session holds on to. With --batch the session's
+    input() calls read from the file; the end of the input ends the
+    session like the Exit option does.
+
+    Args:
+        create_app: Function returning the app whose run() is the session
+        options: Options from parse_args()
+    """
+    batch = None
+    saved_stdin = sys.stdin
+    if options.batch and options.batch != "-":
+        batch = open(options.batch, encoding="utf-8")
+        sys.stdin = batch
+    if options.tracemalloc is not None:
+        tracemalloc.start()
+    profile = sampler = None
+    if options.profile and options.profiler == "sampling":
+        sampler = SamplingProfiler(options.sample_interval)
+        sampler.start()
+    elif options.profile:
+        profile = cProfile.Profile()
+        profile.enable()
+    app = None
+    try:
+        app = create_app()
+        app.run()
+    except EOFError:
+        if not options.batch:
+            raise
+        print("\nEnd of batch input. Goodbye!")
+    finally:
+        if profile is not None:
+            profile.disable()
+        if sampler is not None:
+            sampler.stop()
+        # Snapshot before the reports below allocate anything
+        snapshot = None
+        if options.tracemalloc is not None:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        if profile is not None:
+            _write_text(options.profile, format_stats(profile, options.sort))
+        if sampler is not None:
+            _write_text(options.profile, sampler.collapsed())
+        if options.profile:
+            print(f"Profile written to {options.profile}", file=sys.stderr)
+        if snapshot is not None:
+            sys.stderr.write(format_allocations(snapshot,
+                                                options.tracemalloc))
+            print(f"Peak traced: {peak / 1024:.1f} KiB", file=sys.stderr)
+        if batch is not None:
+            sys.stdin = saved_stdin
+            batch.close()
+
@@ -0,0 +1,388 @@
+"""
+Ranking module for leaderboards over final grades.
+
+This module contains GradeRanking, an order-statistics structure over
+final grades, and RankingEngine, which keeps a global ranking and lazily
+built per-course rankings of a GradeCalculatorApp up to date as
+evaluations arrive.
+
+Final grades lie in GradeCalculator.MIN_GRADE..MAX_GRADE and are reported
+with two decimals, so GradeRanking counts students per 0.01 bucket in a
+Fenwick (binary indexed) tree: updates, rank and percentile queries take
+O(log B) for B = 2001 buckets, and top/bottom-K descend the tree to each
+non-empty bucket they return, skipping the empty ones. Students in the
+same bucket share a rank.
+"""
+import threading
+from typing import Dict, List, Optional, Tuple
+
+# Support both direct execution and package imports
+try:
+    from .grade_calculator import GradeCalculator
+    from .course_index import normalize_course
+except (ImportError, ValueError):
+    from grade_calculator import GradeCalculator
+    from course_index import normalize_course
+
+DEFAULT_INPUTS = (100.0, 0.0, True)
+
+RankedGrade = Tuple[str, float]
+
+
+class GradeRanking:
+    """Order-statistics index of final grades at 0.01 resolution."""
+
+    SCALE = 100
+
+    def __init__(self, min_grade: float = GradeCalculator.MIN_GRADE,
+                 max_grade: float = GradeCalculator.MAX_GRADE):
+        """
+        Initialize an empty GradeRanking.
+
+        Args:
+            min_grade: Lowest possible final grade
+            max_grade: Highest possible final grade
+        """
+        self.min_grade = min_grade
+        self.bucket_count = round((max_grade - min_grade) * self.SCALE) + 1
+        self._tree = [0] * (self.bucket_count + 1)
+        # Largest power of two <= bucket_count, the first step of a descent
+        self._top_step = 1 << (self.bucket_count.bit_length() - 1)
+        self._members: List[Dict[str, float]] = [
+            {} for _ in range(self.bucket_count)
+        ]
+        self._grades: Dict[str, float] = {}
+
+    def _bucket(self, grade: float) -> int:
+        """Return the bucket of a grade (clamped to the scale)."""
+        bucket = round((grade - self.min_grade) * self.SCALE)
+        return min(max(bucket, 0), self.bucket_count - 1)
+
+    def _add(self, bucket: int, delta: int) -> None:
+        """Add delta to the count of a bucket."""
+        position = bucket + 1
+        while position <= self.bucket_count:
+            self._tree[position] += delta
+            position += position & -position
+
+    def _count_through(self, bucket: int) -> int:
+        """Return the number of grades in buckets 0..bucket."""
+        total = 0
+        position = bucket + 1
+        while position > 0:
+            total += self._tree[position]
+            position -= position & -position
+        return total
+
+    def _bucket_of(self, position: int) -> int:
+        """Return the bucket holding the position-th lowest grade (1-based).
+
+        Descends the tree in O(log B) instead of scanning the buckets.
+        """
+        bucket = 0
+        step = self._top_step
+        while step:
+            next_bucket = bucket + step
+            if (next_bucket <= self.bucket_count
+                    and self._tree[next_bucket] < position):
+                bucket = next_bucket
+                position -= self._tree[next_bucket]
+            step >>= 1
+        return bucket
+
+    def update(self, student_id: str, grade: float) -> None:
+        """
+        Insert or move a student's final grade.
+
+        Args:
+            student_id: The student identifier
+            grade: The student's final grade
+        """
+        self.remove(student_id)
+        bucket = self._bucket(grade)
+        self._grades[student_id] = grade
+        self._members[bucket][student_id] = grade
+        self._add(bucket, 1)
+
+    def remove(self, student_id: str) -> None:
+        """
+        Remove a student (no-op if not ranked).
+
+        Args:
+            student_id: The student identifier
+        """
+        grade = self._grades.pop(student_id, None)
+        if grade is None:
+            return
+        bucket = self._bucket(grade)
+        del self._members[bucket][student_id]
+        self._add(bucket, -1)
+
+    def get_grade(self, student_id: str) -> Optional[float]:
+        """Return the ranked final grade of a student, or None."""
+        return self._grades.get(student_id)
+
+    def rank(self, student_id: str) -> Optional[int]:
+        """
+        Get a student's rank (1 = best; equal 0.01 buckets tie).
+
+        Args:
+            student_id: The student identifier
+
+        Returns:
+            The rank, or None if the student is not ranked
+        """
+        grade = self._grades.get(student_id)
+        if grade is None:
+            return None
+        return len(self._grades) - self._count_through(self._bucket(grade)) + 1
+
+    def percentile(self, student_id: str) -> Optional[float]:
+        """
+        Get the percentage of ranked students at or below a student.
+
+        Args:
+            student_id: The student identifier
+
+        Returns:
+            Percentile in 0-100, or None if the student is not ranked
+        """
+        grade = self._grades.get(student_id)
+        if grade is None:
+            return None
+        at_or_below = self._count_through(self._bucket(grade))
+        return at_or_below * 100.0 / len(self._grades)
+
+    def count_at_least(self, grade: float) -> int:
+        """Return the number of students whose grade rounds to >= grade."""
+        bucket = self._bucket(grade)
+        below = self._count_through(bucket - 1) if bucket > 0 else 0
+        return len(self._grades) - below
+
+    def top(self, k: int) -> List[RankedGrade]:
+        """
+        Get the k best students.
+
+        Args:
+            k: Number of students
+
+        Returns:
+            List of (student_id, final_grade), best first
+        """
+        return self._collect(k, True)
+
+    def bottom(self, k: int) -> List[RankedGrade]:
+        """
+        Get the k lowest-graded students.
+
+        Args:
+            k: Number of students
+
+        Returns:
+            List of (student_id, final_grade), lowest first
+        """
+        return self._collect(k, False)
+
+    def _collect(self, k: int, descending: bool) -> List[RankedGrade]:
+        """Gather up to k members, visiting only the non-empty buckets."""
+        results: List[RankedGrade] = []
+        total = len(self._grades)
+        while len(results) < min(k, total):
+            # Position (from the lowest grade) of the next member to take
+            position = (total - len(results) if descending
+                        else len(results) + 1)
+            members = self._members[self._bucket_of(position)]
+            # Exact grades order students inside a bucket
+            results.extend(sorted(
+                members.items(),
+                key=lambda item: (-item[1], item[0]) if descending
+                else (item[1], item[0])
+            ))
+        return results[:max(k, 0)]
+
+    def __len__(self) -> int:
+        """Return the number of ranked students."""
+        return len(self._grades)
+
+    def __contains__(self, student_id: str) -> bool:
+        """Return True if the student is ranked."""
+        return student_id in self._grades
+
+
+class RankingEngine:
+    """Global and per-course rankings kept in sync with an app.
+
+    Each student is ranked with its own (attendance_percentage,
+    extra_points, reached_minimum_attendance) inputs, set with
+    set_inputs(); students without evaluations are not ranked. A change
+    of the calculator's policies triggers a full rebuild on the next query.
+    """
+
+    def __init__(self, app):
+        """
+        Initialize a RankingEngine and rank every student of the app.
+
+        Args:
+            app: GradeCalculatorApp whose students are ranked
+        """
+        self.app = app
+        self.inputs: Dict[str, Tuple[float, float, bool]] = {}
+        self.ranking = GradeRanking()
+        self.course_rankings: Dict[str, GradeRanking] = {}
+        self._lock = threading.RLock()
+        self._policy_version = None
+        self.rebuild()
+
+    def _final_grade(self, student_id: str) -> Optional[float]:
+        """Compute a student's final grade, None if it has none."""
+        student = self.app.find_student(student_id)
+        if student is None or student.get_evaluation_count() == 0:
+            return None
+        try:
+            final_grade, _ = \
+                self.app.grade_calculator.calculate_student_final_grade(
+                    student, *self.inputs.get(student_id, DEFAULT_INPUTS)
+                )
+        except ValueError:
+            return None
+        return final_grade
+
+    def _place(self, ranking: GradeRanking, student_id: str,
+               grade: Optional[float]) -> None:
+        """Update or remove a student in one ranking."""
+        if grade is None:
+            ranking.remove(student_id)
+        else:
+            ranking.update(student_id, grade)
+
+    def rebuild(self) -> None:
+        """Recompute every ranking from scratch."""
+        with self._lock:
+            self._policy_version = self.app.grade_calculator.policy_version
+            self.ranking = GradeRanking()
+            self.course_rankings = {}
+            # Read-only lookups: snapshot students are not materialized
+            student_ids = list(self.app.students)
+            if self.app.snapshot is not None:
+                student_ids.extend(
+                    student_id
+                    for student_id in self.app.snapshot.student_ids()
+                    if student_id not in self.app.students
+                )
+            for student_id in student_ids:
+                self._place(self.ranking, student_id,
+                            self._final_grade(student_id))
+
+    def _check_policies(self) -> None:
+        """Rebuild if the calculator's policies changed."""
+        if self._policy_version != self.app.grade_calculator.policy_version:
+            self.rebuild()
+
+    def refresh_student(self, student_id: str) -> None:
+        """
+        Re-rank a student after its evaluations changed.
+
+        Args:
+            student_id: The student identifier
+        """
+        with self._lock:
+            grade = self._final_grade(student_id)
+            self._place(self.ranking, student_id, grade)
+            for ranking in self._built_course_rankings(student_id):
+                self._place(ranking, student_id, grade)
+
+    def _built_course_rankings(self, student_id: str) -> List[GradeRanking]:
+        """Return the already built course rankings of a student."""
+        rankings = []
+        for teacher_id in self.app.course_index.get_teacher_ids(student_id):
+            teacher = self.app.teachers.get(teacher_id)
+            if teacher is None:
+                continue
+            ranking = self.course_rankings.get(
+                normalize_course(teacher.course))
+            if ranking is not None and ranking not in rankings:
+                rankings.append(ranking)
+        return rankings
+
+    def on_enroll(self, teacher_id: str, student_id: str) -> None:
+        """Add a newly enrolled student to its course's ranking, if built."""
+        with self._lock:
+            teacher = self.app.teachers.get(teacher_id)
+            ranking = self.course_rankings.get(
+                normalize_course(teacher.course)) if teacher else None
+            if ranking is not None:
+                self._place(ranking, student_id,
+                            self.ranking.get_grade(student_id))
+
+    def invalidate_courses(self) -> None:
+        """Drop the course rankings (e.g. after a teacher changed course)."""
+        with self._lock:
+            self.course_rankings = {}
+
+    def set_inputs(self, student_id: str, attendance_percentage: float,
+                   extra_points: float,
+                   reached_minimum_attendance: bool) -> None:
+        """
+        Set the grade inputs a student is ranked with.
+
+        Args:
+            student_id: The student identifier
+            attendance_percentage: Student's attendance percentage
+            extra_points: Number of extra points earned
+            reached_minimum_attendance: Whether the student reached the
+                                        minimum attendance
+        """
+        with self._lock:
+            self.inputs[student_id] = (attendance_percentage, extra_points,
+                                       reached_minimum_attendance)
+        self.refresh_student(student_id)
+
+    def get_ranking(self, course: Optional[str] = None) -> GradeRanking:
+        """
+        Get the global ranking or the ranking of one course.
+
+        Args:
+            course: Course name (None for every student)
+
+        Returns:
+            The up-to-date GradeRanking
+        """
+        with self._lock:
+            self._check_policies()
+            if course is None:
+                return self.ranking
+            key = normalize_course(course)
+            ranking = self.course_rankings.get(key)
+            if ranking is None:
+                ranking = GradeRanking()
+                teacher_ids = set(
+                    self.app.course_index.get_teacher_ids_by_course(course))
+                for teacher_id, student_id in self.app.get_enrollments():
+                    grade = self.ranking.get_grade(student_id)
+                    if teacher_id in teacher_ids and grade is not None:
+                        ranking.update(student_id, grade)
+                self.course_rankings[key] = ranking
+            return ranking
+
+    def rank(self, student_id: str,
+             course: Optional[str] = None) -> Optional[int]:
+        """Return a student's rank (1 = best), or None if unranked."""
+        with self._lock:
+            return self.get_ranking(course).rank(student_id)
+
+    def percentile(self, student_id: str,
+                   course: Optional[str] = None) -> Optional[float]:
+        """Return the percentage of students at or below a student."""
+        with self._lock:
+            return self.get_ranking(course).percentile(student_id)
+
+    def top(self, k: int, course: Optional[str] = None) -> List[RankedGrade]:
+        """Return the k best (student_id, final_grade), best first."""
+        with self._lock:
+            return self.get_ranking(course).top(k)
+
+    def bottom(self, k: int,
+               course: Optional[str] = None) -> List[RankedGrade]:
+        """Return the k lowest (student_id, final_grade), lowest first."""
+        with self._lock:
+            return self.get_ranking(course).bottom(k)
@@ -0,0 +1,202 @@
+"""
+Scenarios module for cohort-wide what-if policy sweeps.
+
+This module contains the PolicySweep class, which grades a cohort under
+every combination of a grid of minimum attendance percentages, attendance
+penalty percentages and extra points values. Each stage of the grade
+depends on only one policy parameter, so the work is broadcast: weighted
+averages are computed once per student, grades after penalty once per
+penalty percentage and grades with extra points once per (penalty, extra
+points value) pair. Students reach a minimum attendance as a suffix of the
+cohort sorted by attendance, so each column is sketched per attendance
+segment once and a scenario merges two precomputed cumulative sketches. The arithmetic is the same as
+GradeCalculator.calculate_final_grade, so every scenario grade is
+identical to grading the student with that policy.
+"""
+from bisect import bisect_left
+from itertools import product
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence
+
+# Support both direct execution and package imports
+try:
+    from .grade_calculator import GradeCalculator
+    from .extra_points_policy import ExtraPointsPolicy
+    from .sketch import GradeSketch
+except (ImportError, ValueError):
+    from grade_calculator import GradeCalculator
+    from extra_points_policy import ExtraPointsPolicy
+    from sketch import GradeSketch
+
+DEFAULT_INPUTS = (100.0, 0.0)
+
+
+class PolicySweep:
+    """Grades a fixed cohort under a grid of policy parameters."""
+
+    def __init__(self, calculator: GradeCalculator,
+                 students: Iterable,
+                 inputs: Optional[Mapping[str, tuple]] = None):
+        """
+        Initialize a PolicySweep, computing each weighted average once.
+
+        Students without evaluations, or with too many, are skipped.
+
+        Args:
+            calculator: GradeCalculator supplying MIN_GRADE, MAX_GRADE and
+                        the evaluation limits
+            students: Student objects (or snapshot students) to grade
+            inputs: Optional mapping of student_id to (attendance_percentage,
+                    extra_points[, reached_minimum_attendance]); the flag
+                    is ignored, every scenario derives it from its own
+                    minimum attendance
+        """
+        inputs = inputs or {}
+        self.calculator = calculator
+        self.student_ids: List[str] = []
+        self._averages: List[float] = []
+        self._attendance: List[float] = []
+        self._missing: List[Optional[float]] = []
+        self._extra_points: List[float] = []
+        for student in students:
+            try:
+                average = calculator.calculate_weighted_average_from_totals(
+                    *student.get_weighted_totals())
+            except ValueError:
+                continue
+            attendance, extra_points = inputs.get(
+                student.student_id, DEFAULT_INPUTS)[:2]
+            self.student_ids.append(student.student_id)
+            self._averages.append(average)
+            self._attendance.append(attendance)
+            # Same operation order as calculate_attendance_penalty
+            self._missing.append(
+                None if attendance < 0 or attendance > 100
+                else (100 - attendance) / 100.0 * calculator.MAX_GRADE
+            )
+            self._extra_points.append(extra_points)
+
+    def _after_penalty(self, penalty_percentage: float) -> List[float]:
+        """Return every student's grade after the attendance penalty."""
+        calculator = self.calculator
+        return [
+            max(calculator.MIN_GRADE, average - (
+                0.0 if missing is None
+                else min(missing * penalty_percentage, calculator.MAX_GRADE)
+            ))
+            for average, missing in zip(self._averages, self._missing)
+        ]
+
+    def _with_extra_points(self, after_penalty: Sequence[float],
+                           extra_points_value: float) -> List[float]:
+        """Return every student's final grade with extra points applied.
+
+        extra_points_value must already be validated (run() does).
+        """
+        # min(cap, grade + points) equals grade + (apply_extra_points(...)
+        # - grade) capped at MAX_GRADE, as calculate_final_grade computes
+        cap = min(self.calculator.MAX_GRADE, ExtraPointsPolicy.MAX_GRADE)
+        return [
+            min(cap, grade + extra_points * extra_points_value)
+            for grade, extra_points in zip(after_penalty, self._extra_points)
+        ]
+
+    def run(self, minimum_attendances: Sequence[float],
+            penalty_percentages: Sequence[float],
+            extra_points_values: Sequence[float],
+            passing_grade: Optional[float] = None,
+            bin_count: int = GradeSketch.DEFAULT_BIN_COUNT) -> List[dict]:
+        """
+        Grade the cohort under every combination of the grid.
+
+        Args:
+            minimum_attendances: Minimum attendance percentages (0-100)
+            penalty_percentages: Values of ATTENDANCE_PENALTY_PERCENTAGE
+            extra_points_values: Values of ExtraPointsPolicy's
+                                 extra_points_value
+            passing_grade: Lowest passing final grade (default:
+                           GradeCalculator.PASSING_GRADE)
+            bin_count: Number of histogram bins of each distribution
+
+        Returns:
+            One dict per scenario, in grid order (minimum attendance
+            outermost), with 'minimum_attendance', 'penalty_percentage',
+            'extra_points_value', 'students', 'passed', 'pass_rate' and
+            'distribution' (a GradeSketch)
+
+        Raises:
+            ValueError: If a grid value is out of range
+        """
+        if any(not 0 <= value <= 100 for value in minimum_attendances):
+            raise ValueError("Attendance percentage must be between 0 and 100")
+        if any(value < 0 for value in penalty_percentages):
+            raise ValueError("Penalty percentage cannot be negative")
+        if any(value < 0 for value in extra_points_values):
+            raise ValueError("Extra points value cannot be negative")
+        if passing_grade is None:
+            passing_grade = self.calculator.PASSING_GRADE
+
+        # Students sorted by attendance reach a minimum as a suffix, so the
+        # distinct minimums cut the cohort into segments whose sketches are
+        # built once per column and merged per scenario
+        order = sorted(range(len(self._attendance)),
+                       key=self._attendance.__getitem__)
+        attendance = [self._attendance[i] for i in order]
+        minimums = sorted(set(minimum_attendances))
+        cuts = ([0] + [bisect_left(attendance, minimum)
+                       for minimum in minimums] + [len(order)])
+
+        def segment_sums(column: Sequence[float]) -> List[tuple]:
+            """Return cumulative (sketch, passed) over the segments."""
+            segments = []
+            for start, end in zip(cuts, cuts[1:]):
+                grades = [column[order[i]] for i in range(start, end)]
+                sketch = GradeSketch(bin_count)
+                sketch.update(grades)
+                segments.append((sketch, sum(
+                    1 for grade in grades if grade >= passing_grade)))
+            return segments
+
+        def accumulate(segments: List[tuple], reverse: bool) -> List[tuple]:
+            """Merge segments from either end (element k covers k or more
+            segments from that end)."""
+            totals = [(GradeSketch(bin_count), 0)]
+            for sketch, passed in (reversed(segments) if reverse
+                                   else segments):
+                previous, previous_passed = totals[-1]
+                merged = previous.copy().merge(sketch)
+                totals.append((merged, previous_passed + passed))
+            return totals
+
+        student_count = len(order)
+        max_grade = self.calculator.MAX_GRADE
+        scenarios: Dict[tuple, dict] = {}
+        for percentage in dict.fromkeys(penalty_percentages):
+            after_penalty = self._after_penalty(percentage)
+            # Without minimum attendance only the MAX_GRADE cap applies
+            below = accumulate(segment_sums(
+                [min(max_grade, grade) for grade in after_penalty]), False)
+            for value in dict.fromkeys(extra_points_values):
+                above = accumulate(segment_sums(self._with_extra_points(
+                    after_penalty, value)), True)
+                for k, minimum in enumerate(minimums, start=1):
+                    # Segments before k miss the minimum, the rest reach it
+                    below_sketch, below_passed = below[k]
+                    above_sketch, above_passed = above[len(cuts) - 1 - k]
+                    passed = below_passed + above_passed
+                    scenarios[(minimum, percentage, value)] = {
+                        'minimum_attendance': minimum,
+                        'penalty_percentage': percentage,
+                        'extra_points_value': value,
+                        'students': student_count,
+                        'passed': passed,
+                        'pass_rate': (passed / student_count
+                                      if student_count else 0.0),
+                        'distribution': below_sketch.copy().merge(
+                            above_sketch)
+                    }
+        return [scenarios[key] for key in product(
+            minimum_attendances, penalty_percentages, extra_points_values)]
+
+    def __len__(self) -> int:
+        """Return the number of gradable students in the cohort."""
+        return len(self.student_ids)
@@ -0,0 +1,407 @@
+"""
+Service module exposing the grade calculator as a local HTTP/JSON API.
+
+This module contains the GradeService class, an asyncio HTTP/1.1 server
+built only on the standard library. Connections are kept alive between
+requests, each request holds one of the application's
+GradeCalculatorApp.MAX_CONCURRENT_USERS session slots while it runs (idle
+connections hold none) and calls into the application run on a bounded
+thread pool, so one process serves the 50-user peak without a thread per
+user.
+
+Endpoints:
+    POST /students                        {"student_id", "name"}
+    POST /evaluations                     {"student_id", "evaluation_id",
+                                           "grade", "weight_percentage"}
+    GET  /students/<id>/final-grade       ?attendance=&extra_points=
+                                           &reached_minimum=
+    GET  /students/<id>/report            (same query, text/plain)
+
+Usage:
+    python -m grade_calculator.service [--host HOST] [--port PORT]
+"""
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+# Support both direct execution and package imports
+try:
+    from .evaluation import Evaluation
+    from .concurrency import ConcurrentGradeCalculatorApp, SessionLimitError
+except (ImportError, ValueError):
+    from evaluation import Evaluation
+    from concurrency import ConcurrentGradeCalculatorApp, SessionLimitError
+
+REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    411: "Length Required",
+    413: "Payload Too Large",
+    422: "Unprocessable Entity",
+    431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+    503: "Service Unavailable",
+}
+
+
+class HTTPError(Exception):
+    """Error that is reported to the client as an HTTP status."""
+
+    def __init__(self, status: int, message: str):
+        """
+        Initialize an HTTPError.
+
+        Args:
+            status: HTTP status code to answer with
+            message: Error message sent in the JSON body
+        """
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class GradeService:
+    """Asyncio HTTP/JSON front-end for a ConcurrentGradeCalculatorApp."""
+
+    DEFAULT_WORKERS = 8
+    IDLE_TIMEOUT_SECONDS = 30.0
+    MAX_BODY_BYTES = 64 * 1024
+
+    def __init__(self, app: Optional[ConcurrentGradeCalculatorApp] = None,
+                 max_workers: int = DEFAULT_WORKERS):
+        """
+        Initialize a GradeService.
+
+        Args:
+            app: Thread-safe application to serve (default: an empty one)
+            max_workers: Size of the thread pool running application calls
+        """
+        self.app = app or ConcurrentGradeCalculatorApp(load_sample_data=False)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self, host: str = "127.0.0.1",
+                    port: int = 8080) -> Tuple[str, int]:
+        """
+        Start listening for connections.
+
+        Args:
+            host: Interface to bind
+            port: TCP port to bind (0 picks a free port)
+
+        Returns:
+            The (host, port) actually bound
+        """
+        self.server = await asyncio.start_server(self._handle_connection,
+                                                 host, port)
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        """Serve connections until cancelled."""
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self) -> None:
+        """Stop the server and the worker pool."""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        self.executor.shutdown(wait=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """Serve the requests of one (keep-alive) connection."""
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await asyncio.wait_for(
+                        self._read_request(reader), self.IDLE_TIMEOUT_SECONDS
+                    )
+                except HTTPError as e:
+                    await self._write_response(
+                        writer, e.status, {"error": e.message}, False
+                    )
+                    break
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                try:
+                    status, payload = await self._dispatch(method, target,
+                                                           body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": e.message}
+                except Exception:
+                    # A handler bug must not drop the connection unanswered
+                    status, payload = 500, {"error": "Internal server error"}
+                await self._write_response(writer, status, payload,
+                                           keep_alive)
+        except (asyncio.TimeoutError, ConnectionError,
+                asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        """Read one request; return None when the client is done."""
+        request_line = await self._read_line(reader, 400,
+                                             "Request line too long")
+        if not request_line.strip():
+            return None
+        try:
+            method, target, version = \
+                request_line.decode("latin-1").strip().split(" ")
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+
+        headers: Dict[str, str] = {}
+        while True:
+            line = await self._read_line(reader, 431,
+                                         "Request header field too large")
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        body = b""
+        if method in ("POST", "PUT"):
+            if "content-length" not in headers:
+                raise HTTPError(411, "Content-Length header required")
+            try:
+                length = int(headers["content-length"])
+            except ValueError:
+                raise HTTPError(400, "Invalid Content-Length header")
+            if length > self.MAX_BODY_BYTES:
+                raise HTTPError(413, "Request body too large")
+            body = await reader.readexactly(length)
+
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = connection == "keep-alive"
+        else:
+            keep_alive = connection != "close"
+        return method, target, headers, body, keep_alive
+
+    @staticmethod
+    async def _read_line(reader: asyncio.StreamReader, status: int,
+                         message: str) -> bytes:
+        """Read one line, answering status if it exceeds the reader limit."""
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise HTTPError(status, message)
+
+    async def _write_response(self, writer: asyncio.StreamWriter,
+                              status: int, payload,
+                              keep_alive: bool) -> None:
+        """Write a JSON (dict) or text (bytes) response."""
+        if isinstance(payload, bytes):
+            content_type = "text/plain; charset=utf-8"
+            body = payload
+        else:
+            content_type = "application/json"
+            body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        ).encode("latin-1")
+        writer.write(head + body)
+        await writer.drain()
+
+    async def _dispatch(self, method: str, target: str, body: bytes):
+        """Route a request to its handler and return (status, payload)."""
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.strip("/").split("/")]
+        query = {key: values[-1]
+                 for key, values in parse_qs(url.query).items()}
+
+        if parts == ["students"]:
+            self._require_method(method, "POST")
+            return await self._run(self._add_student, self._parse_json(body))
+        if parts == ["evaluations"]:
+            self._require_method(method, "POST")
+            return await self._run(self._add_evaluation,
+                                   self._parse_json(body))
+        if len(parts) == 3 and parts[0] == "students":
+            self._require_method(method, "GET")
+            if parts[2] == "final-grade":
+                return await self._run(self._final_grade, parts[1], query)
+            if parts[2] == "report":
+                return await self._run(self._report, parts[1], query)
+        raise HTTPError(404, f"No route for {url.path}")
+
+    async def _run(self, handler, *args):
+        """Run a blocking handler on the worker pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._in_session,
+                                          handler, *args)
+
+    def _in_session(self, handler, *args):
+        """Run a handler holding a session slot for the request only."""
+        try:
+            with self.app.session():
+                return handler(*args)
+        except SessionLimitError as e:
+            raise HTTPError(503, str(e))
+
+    @staticmethod
+    def _require_method(method: str, expected: str) -> None:
+        """Reject requests using the wrong HTTP method."""
+        if method != expected:
+            raise HTTPError(405, f"Use {expected} for this endpoint")
+
+    @staticmethod
+    def _parse_json(body: bytes) -> dict:
+        """Decode a JSON object request body."""
+        try:
+            data = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, ValueError):
+            raise HTTPError(400, "Request body must be valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return data
+
+    @staticmethod
+    def _field(data: dict, name: str, default=None):
+        """Return a required (or defaulted) field of a JSON body."""
+        value = data.get(name, default)
+        if value is None:
+            raise HTTPError(400, f"Missing field '{name}'")
+        return value
+
+    @staticmethod
+    def _number(value, name: str) -> float:
+        """Convert a body or query value to float."""
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise HTTPError(400, f"'{name}' must be a number")
+
+    def _grade_inputs(self, query: Dict[str, str]) -> Tuple[float, float,
+                                                            bool]:
+        """Parse attendance, extra points and minimum attendance flag."""
+        attendance = self._number(query.get("attendance", 100.0),
+                                  "attendance")
+        if not (0 <= attendance <= 100):
+            raise HTTPError(400, "Attendance must be between 0 and 100")
+        extra_points = self._number(query.get("extra_points", 0.0),
+                                    "extra_points")
+        if extra_points < 0:
+            raise HTTPError(400, "Extra points cannot be negative")
+        if "reached_minimum" in query:
+            reached = query["reached_minimum"].lower() in ("1", "true",
+                                                           "yes")
+        else:
+            # Same rule as the interactive use case CU001
+            policy = self.app.grade_calculator.attendance_policy
+            reached = policy.is_attendance_sufficient(attendance)
+        return attendance, extra_points, reached
+
+    def _require_student(self, student_id: str) -> None:
+        """Reject unknown students and students without evaluations."""
+        student = self.app.find_student(student_id)
+        if student is None:
+            raise HTTPError(404, f"Student {student_id} not found")
+        if student.get_evaluation_count() == 0:
+            raise HTTPError(422,
+                            f"Student {student_id} has no evaluations")
+
+    def _add_student(self, data: dict):
+        """Handle POST /students."""
+        student_id = str(self._field(data, "student_id")).strip()
+        name = str(self._field(data, "name")).strip()
+        if not student_id or not name:
+            raise HTTPError(400, "Student ID and name cannot be empty")
+        if not self.app.add_new_student(student_id, name):
+            raise HTTPError(422, f"Student {student_id} already exists")
+        return 201, {"student_id": student_id, "name": name}
+
+    def _add_evaluation(self, data: dict):
+        """Handle POST /evaluations."""
+        student_id = str(self._field(data, "student_id"))
+        evaluation_id = str(self._field(data, "evaluation_id"))
+        grade = self._number(self._field(data, "grade"), "grade")
+        weight = self._number(
+            self._field(data, "weight_percentage",
+                        Evaluation.DEFAULT_WEIGHT_PERCENTAGE),
+            "weight_percentage"
+        )
+        if not self.app.has_student(student_id):
+            raise HTTPError(404, f"Student {student_id} not found")
+        try:
+            Evaluation.validate(grade, weight)
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        if not self.app.add_evaluation(student_id, evaluation_id, grade,
+                                       weight):
+            raise HTTPError(422, "Evaluation was rejected")
+        return 201, {"student_id": student_id,
+                     "evaluation_id": evaluation_id,
+                     "grade": grade, "weight_percentage": weight}
+
+    def _final_grade(self, student_id: str, query: Dict[str, str]):
+        """Handle GET /students/<id>/final-grade."""
+        inputs = self._grade_inputs(query)
+        self._require_student(student_id)
+        result = self.app.get_student_final_grade(student_id, *inputs)
+        if result is None:
+            raise HTTPError(422, "Grade cannot be calculated")
+        final_grade, details = result
+        return 200, {"student_id": student_id, "final_grade": final_grade,
+                     "details": details}
+
+    def _report(self, student_id: str, query: Dict[str, str]):
+        """Handle GET /students/<id>/report."""
+        inputs = self._grade_inputs(query)
+        self._require_student(student_id)
+        report = self.app.get_grade_report_bytes(student_id, *inputs)
+        if report is None:
+            raise HTTPError(422, "Report cannot be generated")
+        return 200, report
+
+
+async def _serve(host: str, port: int, workers: int,
+                 load_sample_data: bool) -> None:
+    """Run a GradeService until interrupted."""
+    service = GradeService(
+        ConcurrentGradeCalculatorApp(load_sample_data=load_sample_data),
+        max_workers=workers
+    )
+    bound_host, bound_port = await service.start(host, port)
+    print(f"Grade service listening on http://{bound_host}:{bound_port}")
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None) -> None:
+    """Command line entry point for the grade service."""
+    parser = argparse.ArgumentParser(
+        description="CS-GradeCalculator HTTP/JSON service"
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int,
+                        default=GradeService.DEFAULT_WORKERS)
+    parser.add_argument("--sample-data", action="store_true",
+                        help="load the sample students on startup")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve(args.host, args.port, args.workers,
+                           args.sample_data))
+    except KeyboardInterrupt:
+        print("\nGoodbye!")
+
+
+if __name__ == "__main__":
+    main()
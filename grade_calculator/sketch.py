@@ -0,0 +1,253 @@
+"""
+Sketch module for streaming grade distribution statistics.
+
+This module contains GradeSketch, a fixed-size summary of final grades
+that is updated one grade at a time and merged with other sketches, so the
+per-shard sketches of a multiprocess run combine into the cohort's. It
+keeps a fixed-bin histogram over MIN_GRADE..MAX_GRADE, counts at the
+0.01 resolution grades are reported with (for quantiles) and running
+moments combined with Chan et al.'s parallel variance formula.
+"""
+import math
+import operator
+from array import array
+from typing import Iterable, List, Optional, Tuple
+
+# Support both direct execution and package imports
+try:
+    from .grade_calculator import GradeCalculator
+except (ImportError, ValueError):
+    from grade_calculator import GradeCalculator
+
+
+class GradeSketch:
+    """Mergeable histogram, quantile and moment summary of grades."""
+
+    DEFAULT_BIN_COUNT = 20
+    SCALE = 100
+
+    def __init__(self, bin_count: int = DEFAULT_BIN_COUNT,
+                 min_grade: float = GradeCalculator.MIN_GRADE,
+                 max_grade: float = GradeCalculator.MAX_GRADE):
+        """
+        Initialize an empty GradeSketch.
+
+        Args:
+            bin_count: Number of equal-width histogram bins
+            min_grade: Lowest grade of the scale
+            max_grade: Highest grade of the scale
+
+        Raises:
+            ValueError: If bin_count is not positive or the scale is empty
+        """
+        if bin_count <= 0:
+            raise ValueError("Bin count must be greater than 0")
+        if max_grade <= min_grade:
+            raise ValueError("Maximum grade must be greater than minimum")
+        self.bin_count = bin_count
+        self.min_grade = min_grade
+        self.max_grade = max_grade
+        self.bins = array("q", bytes(8 * bin_count))
+        self._fine = array("q", bytes(
+            8 * (round((max_grade - min_grade) * self.SCALE) + 1)))
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _clamp(self, grade: float) -> float:
+        """Clamp a grade to the scale."""
+        return min(max(grade, self.min_grade), self.max_grade)
+
+    def add(self, grade: float) -> None:
+        """
+        Add one final grade.
+
+        Args:
+            grade: The grade (clamped to the scale)
+        """
+        grade = self._clamp(grade)
+        width = (self.max_grade - self.min_grade) / self.bin_count
+        self.bins[min(int((grade - self.min_grade) / width),
+                      self.bin_count - 1)] += 1
+        self._fine[round((grade - self.min_grade) * self.SCALE)] += 1
+        # Welford's update
+        self.count += 1
+        delta = grade - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (grade - self.mean)
+        self.min = grade if self.min is None else min(self.min, grade)
+        self.max = grade if self.max is None else max(self.max, grade)
+
+    def update(self, grades: Iterable[float]) -> None:
+        """
+        Add many final grades.
+
+        The batch's moments are computed in two passes and combined with
+        the running ones, which is cheaper than one add() per grade.
+
+        Args:
+            grades: Iterable of grades
+        """
+        low, high = self.min_grade, self.max_grade
+        grades = [low if grade < low else high if grade > high else grade
+                  for grade in grades]
+        if not grades:
+            return
+        width = (high - low) / self.bin_count
+        last_bin = self.bin_count - 1
+        bins, fine, scale = self.bins, self._fine, self.SCALE
+        for grade in grades:
+            offset = grade - low
+            index = int(offset / width)
+            bins[index if index < last_bin else last_bin] += 1
+            fine[round(offset * scale)] += 1
+        count = len(grades)
+        mean = sum(grades) / count
+        m2 = sum((grade - mean) * (grade - mean) for grade in grades)
+        self._combine(count, mean, m2, min(grades), max(grades))
+
+    def _combine(self, count: int, mean: float, m2: float,
+                 low: float, high: float) -> None:
+        """Fold the moments of another set of grades into this sketch."""
+        total = self.count + count
+        delta = mean - self.mean
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def merge(self, other: "GradeSketch") -> "GradeSketch":
+        """
+        Fold another sketch into this one.
+
+        Args:
+            other: Sketch with the same bins and scale
+
+        Returns:
+            This sketch
+
+        Raises:
+            ValueError: If the sketches use different bins or scales
+        """
+        if (other.bin_count, other.min_grade, other.max_grade) != \
+                (self.bin_count, self.min_grade, self.max_grade):
+            raise ValueError("Cannot merge sketches with different bins")
+        if other.count == 0:
+            return self
+        self.bins = array("q", map(operator.add, self.bins, other.bins))
+        self._fine = array("q", map(operator.add, self._fine, other._fine))
+        self._combine(other.count, other.mean, other._m2, other.min,
+                      other.max)
+        return self
+
+    def copy(self) -> "GradeSketch":
+        """Return an independent copy of this sketch."""
+        clone = GradeSketch(self.bin_count, self.min_grade, self.max_grade)
+        clone.bins = array("q", self.bins)
+        clone._fine = array("q", self._fine)
+        clone.count, clone.mean, clone._m2 = self.count, self.mean, self._m2
+        clone.min, clone.max = self.min, self.max
+        return clone
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the grades (0.0 when empty)."""
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def stdev(self) -> float:
+        """Population standard deviation of the grades."""
+        return math.sqrt(self.variance)
+
+    def quantile(self, q: float) -> float:
+        """
+        Get a quantile, exact to the 0.01 grade resolution.
+
+        Args:
+            q: Quantile in 0-1 (0.5 is the median)
+
+        Returns:
+            The nearest-rank grade at quantile q
+
+        Raises:
+            ValueError: If the sketch is empty or q is outside 0-1
+        """
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("Quantile must be between 0 and 1")
+        if self.count == 0:
+            raise ValueError("Cannot compute quantiles of an empty sketch")
+        target = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, value in enumerate(self._fine):
+            seen += value
+            if seen >= target:
+                grade = self.min_grade + i / self.SCALE
+                return min(max(grade, self.min), self.max)
+        return self.max
+
+    def quantiles(self, qs: Iterable[float]) -> List[float]:
+        """Return quantile(q) for each q."""
+        return [self.quantile(q) for q in qs]
+
+    @property
+    def median(self) -> float:
+        """Median grade (see quantile)."""
+        return self.quantile(0.5)
+
+    def histogram(self) -> List[Tuple[float, float, int]]:
+        """
+        Get the histogram.
+
+        Returns:
+            List of (low, high, count) per bin; every bin is half-open
+            except the last, which includes max_grade
+        """
+        width = (self.max_grade - self.min_grade) / self.bin_count
+        return [(self.min_grade + i * width, self.min_grade + (i + 1) * width,
+                 value) for i, value in enumerate(self.bins)]
+
+    def count_at_least(self, grade: float) -> int:
+        """
+        Count the grades that round (to 0.01) to at least grade.
+
+        Args:
+            grade: The threshold, e.g. a passing grade
+
+        Returns:
+            Number of grades at or above the threshold
+        """
+        start = round((self._clamp(grade) - self.min_grade) * self.SCALE)
+        return sum(self._fine[start:])
+
+    def to_dict(self) -> dict:
+        """
+        Summarize the sketch.
+
+        Returns:
+            Dict with 'count', 'mean', 'stdev', 'min', 'max', 'median',
+            'p25', 'p75' and 'histogram' (bin counts); statistics are None
+            for an empty sketch
+        """
+        empty = self.count == 0
+        return {
+            'count': self.count,
+            'mean': None if empty else self.mean,
+            'stdev': None if empty else self.stdev,
+            'min': self.min,
+            'max': self.max,
+            'median': None if empty else self.median,
+            'p25': None if empty else self.quantile(0.25),
+            'p75': None if empty else self.quantile(0.75),
+            'histogram': list(self.bins)
+        }
+
+    def __len__(self) -> int:
+        """Return the number of grades added."""
+        return self.count
+
+    def __repr__(self) -> str:
+        """Return a string representation of the GradeSketch."""
+        return f"GradeSketch(count={self.count}, bins={self.bin_count})"
@@ -0,0 +1,362 @@
+"""
+Snapshot module for saving and memory-mapping the application state.
+
+This module contains write_snapshot and the Snapshot reader for a compact
+fixed-width binary format:
+
+    header      magic, counts, the last write-ahead log sequence number
+                the snapshot covers and the offset of every section
+    strings     interned IDs and names: (count + 1) uint64 offsets followed
+                by the UTF-8 bytes
+    students    fixed-width records sorted by student_id, with the
+                evaluation range and the precomputed weighted totals
+    teachers    fixed-width records, in registration order
+    enrollments (teacher, student) uint32 string index pairs
+    evaluations packed evaluation_id (uint32 string index), grade and
+                weight (float64) columns, contiguous per student
+
+All integers and floats are little-endian. A Snapshot maps the file with
+mmap and answers lookups by binary search over the student records, so
+opening even a large term only reads the header.
+"""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Support both direct execution and package imports
+try:
+    from .evaluation import Evaluation
+    from .evaluation_store import EvaluationStore
+    from .student import Student
+except (ImportError, ValueError):
+    from evaluation import Evaluation
+    from evaluation_store import EvaluationStore
+    from student import Student
+
+MAGIC = b"GRDSNAP3"
+HEADER = struct.Struct("<8sIIIQQIQQQQQQQQ")
+STUDENT_RECORD = struct.Struct("<IIIQIdd")
+TEACHER_RECORD = struct.Struct("<III")
+STRING_OFFSET = struct.Struct("<Q")
+
+
+def _column_bytes(typecode: str, values) -> bytes:
+    """Pack a column as little-endian bytes."""
+    column = array(typecode, values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+class _StringTable:
+    """Interns strings while a snapshot is written."""
+
+    def __init__(self):
+        """Initialize an empty _StringTable."""
+        self.index: Dict[str, int] = {}
+        self.encoded: List[bytes] = []
+
+    def intern(self, text: str) -> int:
+        """Return the index of text, adding it on first use."""
+        position = self.index.get(text)
+        if position is None:
+            position = len(self.encoded)
+            self.index[text] = position
+            self.encoded.append(text.encode("utf-8"))
+        return position
+
+
+def write_snapshot(app, path: str, sequence: int = 0) -> None:
+    """
+    Write the students, teachers and evaluations of an app to a snapshot.
+
+    The file is written next to path and renamed over it, so readers
+    never see a partially written snapshot.
+
+    Args:
+        app: GradeCalculatorApp to save (snapshot-backed students are
+             included)
+        path: Destination file
+        sequence: Last write-ahead log sequence number already applied to
+                  the app (0 when no log is used)
+    """
+    strings = _StringTable()
+    roster = app.get_all_students()
+    student_rows = []
+    evaluation_ids = []
+    grades = []
+    weights = []
+    for position, student in enumerate(roster):
+        count, total_weighted, total_weight = student.get_weighted_totals()
+        student_rows.append((
+            student.student_id.encode("utf-8"),
+            strings.intern(student.student_id), strings.intern(student.name),
+            position, len(grades), count, total_weighted, total_weight
+        ))
+        for evaluation in student.evaluations:
+            evaluation_ids.append(strings.intern(evaluation.evaluation_id))
+            grades.append(evaluation.grade)
+            weights.append(evaluation.weight_percentage)
+    student_rows.sort()
+    teacher_rows = [
+        (strings.intern(teacher.teacher_id), strings.intern(teacher.name),
+         strings.intern(teacher.course))
+        for teacher in app.teachers.values()
+    ]
+    enrollments = app.get_enrollments()
+    enrollment_pairs = [strings.intern(text) for pair in enrollments
+                        for text in pair]
+
+    offsets = [0]
+    for encoded in strings.encoded:
+        offsets.append(offsets[-1] + len(encoded))
+    sections = [
+        _column_bytes("Q", offsets),
+        b"".join(strings.encoded),
+        b"".join(STUDENT_RECORD.pack(*row[1:]) for row in student_rows),
+        b"".join(TEACHER_RECORD.pack(*row) for row in teacher_rows),
+        _column_bytes("I", enrollment_pairs),
+        _column_bytes("I", evaluation_ids),
+        _column_bytes("d", grades),
+        _column_bytes("d", weights),
+    ]
+    positions = []
+    position = HEADER.size
+    for section in sections:
+        positions.append(position)
+        position += len(section)
+    header = HEADER.pack(MAGIC, len(student_rows), len(teacher_rows),
+                         len(strings.encoded), len(grades), sequence,
+                         len(enrollments), *positions)
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as handle:
+        handle.write(header)
+        for section in sections:
+            handle.write(section)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+
+
+class SnapshotStudent:
+    """Read-only student totals served straight from a Snapshot."""
+
+    __slots__ = ("student_id", "name", "version", "_evaluation_count",
+                 "_total_weighted", "_total_weight")
+
+    def __init__(self, student_id: str, name: str, evaluation_count: int,
+                 total_weighted: float, total_weight: float):
+        """
+        Initialize a SnapshotStudent.
+
+        Args:
+            student_id: Unique identifier for the student
+            name: Full name of the student
+            evaluation_count: Number of stored evaluations
+            total_weighted: Sum of grade * weight / 100
+            total_weight: Sum of the weight percentages
+        """
+        self.student_id = student_id
+        self.name = name
+        # Snapshots never change; the app clears its caches on attach
+        self.version = 0
+        self._evaluation_count = evaluation_count
+        self._total_weighted = total_weighted
+        self._total_weight = total_weight
+
+    def get_weighted_totals(self) -> Tuple[int, float, float]:
+        """Return (evaluation_count, total_weighted_grade, total_weight)."""
+        return (self._evaluation_count, self._total_weighted,
+                self._total_weight)
+
+    def get_evaluation_count(self) -> int:
+        """Return the number of evaluations of the student."""
+        return self._evaluation_count
+
+    def __repr__(self) -> str:
+        """Return a string representation of the SnapshotStudent."""
+        return f"SnapshotStudent(id={self.student_id}, name={self.name})"
+
+
+class Snapshot:
+    """Memory-mapped, read-only view of a snapshot file."""
+
+    def __init__(self, path: str):
+        """
+        Open and map a snapshot file.
+
+        Args:
+            path: Snapshot written by write_snapshot
+
+        Raises:
+            ValueError: If the file is not a snapshot
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0,
+                                  access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is not a grade snapshot")
+        if (len(self._map) < HEADER.size
+                or self._map[:len(MAGIC)] != MAGIC):
+            self.close()
+            raise ValueError(f"{path} is not a grade snapshot")
+        (_, self.student_count, self.teacher_count, self.string_count,
+         self.evaluation_count, self.sequence, self.enrollment_count,
+         self._offsets_pos, self._strings_pos, self._students_pos,
+         self._teachers_pos, self._enrollments_pos,
+         self._evaluation_ids_pos, self._grades_pos,
+         self._weights_pos) = HEADER.unpack_from(self._map)
+
+    def _string_bytes(self, index: int) -> bytes:
+        """Return the UTF-8 bytes of an interned string."""
+        position = self._offsets_pos + index * STRING_OFFSET.size
+        start, end = struct.unpack_from("<QQ", self._map, position)
+        return self._map[self._strings_pos + start:self._strings_pos + end]
+
+    def _string(self, index: int) -> str:
+        """Return an interned string."""
+        return self._string_bytes(index).decode("utf-8")
+
+    def _record(self, index: int) -> Tuple[int, int, int, int, int,
+                                           float, float]:
+        """Return the raw fields of the student record at index."""
+        return STUDENT_RECORD.unpack_from(
+            self._map, self._students_pos + index * STUDENT_RECORD.size
+        )
+
+    def _find(self, student_id: str) -> Optional[Tuple]:
+        """Binary search the student records for student_id."""
+        key = student_id.encode("utf-8")
+        low, high = 0, self.student_count
+        while low < high:
+            middle = (low + high) // 2
+            record = self._record(middle)
+            found = self._string_bytes(record[0])
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                return record
+        return None
+
+    def __len__(self) -> int:
+        """Return the number of students in the snapshot."""
+        return self.student_count
+
+    def __contains__(self, student_id: str) -> bool:
+        """Return True if the snapshot holds student_id."""
+        return self._find(student_id) is not None
+
+    def get_student(self, student_id: str) -> Optional[SnapshotStudent]:
+        """
+        Look up the precomputed totals of a student.
+
+        Args:
+            student_id: The student identifier
+
+        Returns:
+            The SnapshotStudent, or None if the student is not stored
+        """
+        record = self._find(student_id)
+        if record is None:
+            return None
+        _, name, _, _, count, total_weighted, total_weight = record
+        return SnapshotStudent(student_id, self._string(name), count,
+                               total_weighted, total_weight)
+
+    def load_student(self, student_id: str,
+                     store: Optional[EvaluationStore] = None
+                     ) -> Optional[Student]:
+        """
+        Build a full Student with its evaluations.
+
+        Args:
+            student_id: The student identifier
+            store: Optional columnar store for the evaluations
+
+        Returns:
+            A new Student, or None if the student is not stored
+        """
+        record = self._find(student_id)
+        if record is None:
+            return None
+        _, name, _, start, count, _, _ = record
+        return self._build_student(student_id, self._string(name), start,
+                                   count, store)
+
+    def _build_student(self, student_id: str, name: str, start: int,
+                       count: int, store: Optional[EvaluationStore]
+                       ) -> Student:
+        """Build a Student from its evaluation range."""
+        student = Student(student_id, name, store)
+        ids = struct.unpack_from(f"<{count}I", self._map,
+                                 self._evaluation_ids_pos + start * 4)
+        grades = struct.unpack_from(f"<{count}d", self._map,
+                                    self._grades_pos + start * 8)
+        weights = struct.unpack_from(f"<{count}d", self._map,
+                                     self._weights_pos + start * 8)
+        # Re-adding in stored order rebuilds bit-identical running totals
+        for evaluation_id, grade, weight in zip(ids, grades, weights):
+            student.add_evaluation(Evaluation(
+                student_id, self._string(evaluation_id), grade, weight
+            ))
+        return student
+
+    def names(self) -> Iterator[Tuple[str, str]]:
+        """Yield every stored (student_id, name), in student_id order."""
+        for index in range(self.student_count):
+            student_id, name = self._record(index)[:2]
+            yield self._string(student_id), self._string(name)
+
+    def student_ids(self) -> List[str]:
+        """Return every student_id in original registration order."""
+        ordered = [None] * self.student_count
+        for index in range(self.student_count):
+            student_id, _, position = self._record(index)[:3]
+            ordered[position] = self._string(student_id)
+        return ordered
+
+    def teachers(self) -> Iterator[Tuple[str, str, str]]:
+        """Yield every stored (teacher_id, name, course), in order."""
+        for index in range(self.teacher_count):
+            fields = TEACHER_RECORD.unpack_from(
+                self._map, self._teachers_pos + index * TEACHER_RECORD.size
+            )
+            yield tuple(self._string(field) for field in fields)
+
+    def enrollments(self) -> Iterator[Tuple[str, str]]:
+        """Yield every stored (teacher_id, student_id), in order."""
+        pairs = struct.unpack_from(f"<{self.enrollment_count * 2}I",
+                                   self._map, self._enrollments_pos)
+        for index in range(0, len(pairs), 2):
+            yield self._string(pairs[index]), self._string(pairs[index + 1])
+
+    def close(self) -> None:
+        """Unmap and close the snapshot file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def __enter__(self) -> "Snapshot":
+        """Return the snapshot for use in a with statement."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the snapshot when leaving a with statement."""
+        self.close()
+
+    def __repr__(self) -> str:
+        """Return a string representation of the Snapshot."""
+        return (
+            f"Snapshot(path={self.path!r}, students={self.student_count}, "
+            f"evaluations={self.evaluation_count})"
+        )
@@ -0,0 +1,275 @@
+"""
+Storage module for persisting GradeCalculatorApp state.
+
+This module contains the StorageBackend interface and SQLiteStorage, its
+SQLite implementation. SQLiteStorage keeps students, teachers,
+enrollments and evaluations in indexed tables, hands out connections from a small pool
+and buffers evaluation writes so they are committed in batched
+transactions. Loading a term is a few indexed scans instead of replaying
+every insert.
+"""
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator, List, Tuple
+
+# Support both direct execution and package imports
+try:
+    from .evaluation import Evaluation
+except (ImportError, ValueError):
+    from evaluation import Evaluation
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS students ("
+    " student_id TEXT PRIMARY KEY,"
+    " name TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS teachers ("
+    " teacher_id TEXT PRIMARY KEY,"
+    " name TEXT NOT NULL,"
+    " course TEXT NOT NULL)",
+    # seq keeps insertion order, which the weighted sums depend on
+    "CREATE TABLE IF NOT EXISTS evaluations ("
+    " seq INTEGER PRIMARY KEY,"
+    " student_id TEXT NOT NULL REFERENCES students (student_id),"
+    " evaluation_id TEXT NOT NULL,"
+    " grade REAL NOT NULL,"
+    " weight_percentage REAL NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS enrollments ("
+    " teacher_id TEXT NOT NULL REFERENCES teachers (teacher_id),"
+    " student_id TEXT NOT NULL REFERENCES students (student_id),"
+    " PRIMARY KEY (teacher_id, student_id))",
+    "CREATE INDEX IF NOT EXISTS enrollments_by_student"
+    " ON enrollments (student_id)",
+    "CREATE INDEX IF NOT EXISTS evaluations_by_student"
+    " ON evaluations (student_id, seq)",
+    "CREATE INDEX IF NOT EXISTS teachers_by_course ON teachers (course)",
+)
+
+# Statements are kept as constants so sqlite3's per-connection statement
+# cache prepares each of them only once
+UPSERT_STUDENT = (
+    "INSERT INTO students (student_id, name) VALUES (?, ?) "
+    "ON CONFLICT (student_id) DO UPDATE SET name = excluded.name"
+)
+DELETE_STUDENT_EVALUATIONS = "DELETE FROM evaluations WHERE student_id = ?"
+UPSERT_TEACHER = (
+    "INSERT INTO teachers (teacher_id, name, course) VALUES (?, ?, ?) "
+    "ON CONFLICT (teacher_id) DO UPDATE SET name = excluded.name, "
+    "course = excluded.course"
+)
+INSERT_EVALUATION = (
+    "INSERT INTO evaluations "
+    "(student_id, evaluation_id, grade, weight_percentage) "
+    "VALUES (?, ?, ?, ?)"
+)
+INSERT_ENROLLMENT = (
+    "INSERT OR IGNORE INTO enrollments (teacher_id, student_id) "
+    "VALUES (?, ?)"
+)
+SELECT_STUDENTS = "SELECT student_id, name FROM students ORDER BY rowid"
+SELECT_TEACHERS = (
+    "SELECT teacher_id, name, course FROM teachers ORDER BY rowid"
+)
+SELECT_ENROLLMENTS = (
+    "SELECT teacher_id, student_id FROM enrollments ORDER BY rowid"
+)
+SELECT_EVALUATIONS = (
+    "SELECT student_id, evaluation_id, grade, weight_percentage "
+    "FROM evaluations ORDER BY student_id, seq"
+)
+
+
+class StorageBackend(ABC):
+    """Interface of the persistence layer used by GradeCalculatorApp.
+
+    Writes may be buffered; flush() makes every earlier write durable.
+    Replacing a student (saving an existing student_id) drops its stored
+    evaluations, as GradeCalculatorApp.add_student does in memory. A
+    backend missing any abstract method cannot be instantiated.
+    """
+
+    @abstractmethod
+    def save_student(self, student_id: str, name: str) -> None:
+        """Persist a student, replacing any stored one with the same ID."""
+
+    @abstractmethod
+    def save_teacher(self, teacher_id: str, name: str, course: str) -> None:
+        """Persist a teacher, replacing any stored one with the same ID."""
+
+    @abstractmethod
+    def save_evaluation(self, evaluation: Evaluation) -> None:
+        """Persist an evaluation of an already saved student."""
+
+    @abstractmethod
+    def save_enrollment(self, teacher_id: str, student_id: str) -> None:
+        """Persist that a student is enrolled with a teacher."""
+
+    @abstractmethod
+    def load_students(self) -> List[Tuple[str, str]]:
+        """Return every stored (student_id, name), in insertion order."""
+
+    @abstractmethod
+    def load_teachers(self) -> List[Tuple[str, str, str]]:
+        """Return every stored (teacher_id, name, course), in order."""
+
+    @abstractmethod
+    def load_enrollments(self) -> List[Tuple[str, str]]:
+        """Return every stored (teacher_id, student_id), in order."""
+
+    @abstractmethod
+    def load_evaluations(self) -> Iterator[Evaluation]:
+        """Yield every stored evaluation, in insertion order per student."""
+
+    def flush(self) -> None:
+        """Write any buffered data."""
+
+    def close(self) -> None:
+        """Flush and release the backend's resources."""
+        self.flush()
+
+
+class ConnectionPool:
+    """Fixed-size pool of SQLite connections to one database."""
+
+    def __init__(self, path: str, size: int = 4, timeout: float = 30.0):
+        """
+        Initialize a ConnectionPool.
+
+        Args:
+            path: Database file (":memory:" forces a single connection)
+            size: Number of connections kept open
+            timeout: Seconds SQLite waits on a locked database
+
+        Raises:
+            ValueError: If size is not positive
+        """
+        if size <= 0:
+            raise ValueError("Pool size must be greater than 0")
+        if path == ":memory:":
+            size = 1  # every in-memory connection is a separate database
+        self.size = size
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._connections = []
+        for _ in range(size):
+            connection = sqlite3.connect(path, timeout=timeout,
+                                         check_same_thread=False)
+            self._connections.append(connection)
+            self._idle.put(connection)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Context manager borrowing a connection from the pool."""
+        connection = self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        """Close every connection of the pool."""
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
+
+
+class SQLiteStorage(StorageBackend):
+    """StorageBackend keeping the application state in a SQLite file."""
+
+    DEFAULT_BATCH_SIZE = 500
+
+    def __init__(self, path: str, pool_size: int = 4,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize a SQLiteStorage, creating the schema if needed.
+
+        Args:
+            path: Database file path (or ":memory:")
+            pool_size: Number of pooled connections
+            batch_size: Evaluations buffered before a batched commit
+
+        Raises:
+            ValueError: If pool_size or batch_size is not positive
+        """
+        if batch_size <= 0:
+            raise ValueError("Batch size must be greater than 0")
+        self.path = path
+        self.batch_size = batch_size
+        self.pool = ConnectionPool(path, pool_size)
+        self._pending: List[Tuple[str, str, float, float]] = []
+        self._pending_lock = threading.Lock()
+        with self.pool.connection() as connection:
+            if path != ":memory:":
+                connection.execute("PRAGMA journal_mode = WAL")
+            with connection:
+                for statement in SCHEMA:
+                    connection.execute(statement)
+
+    def save_student(self, student_id: str, name: str) -> None:
+        """Persist a student, dropping the evaluations of a replaced one."""
+        self.flush()
+        with self.pool.connection() as connection, connection:
+            connection.execute(UPSERT_STUDENT, (student_id, name))
+            connection.execute(DELETE_STUDENT_EVALUATIONS, (student_id,))
+
+    def save_teacher(self, teacher_id: str, name: str, course: str) -> None:
+        """Persist a teacher."""
+        with self.pool.connection() as connection, connection:
+            connection.execute(UPSERT_TEACHER, (teacher_id, name, course))
+
+    def save_enrollment(self, teacher_id: str, student_id: str) -> None:
+        """Persist an enrollment."""
+        with self.pool.connection() as connection, connection:
+            connection.execute(INSERT_ENROLLMENT, (teacher_id, student_id))
+
+    def save_evaluation(self, evaluation: Evaluation) -> None:
+        """Buffer an evaluation, committing the buffer once it is full."""
+        with self._pending_lock:
+            self._pending.append((
+                evaluation.student_id, evaluation.evaluation_id,
+                evaluation.grade, evaluation.weight_percentage
+            ))
+            if len(self._pending) < self.batch_size:
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Commit the buffered evaluations in one transaction."""
+        with self._pending_lock:
+            if not self._pending:
+                return
+            with self.pool.connection() as connection, connection:
+                connection.executemany(INSERT_EVALUATION, self._pending)
+            self._pending = []
+
+    def load_students(self) -> List[Tuple[str, str]]:
+        """Return every stored (student_id, name), in insertion order."""
+        with self.pool.connection() as connection:
+            return connection.execute(SELECT_STUDENTS).fetchall()
+
+    def load_teachers(self) -> List[Tuple[str, str, str]]:
+        """Return every stored (teacher_id, name, course), in order."""
+        with self.pool.connection() as connection:
+            return connection.execute(SELECT_TEACHERS).fetchall()
+
+    def load_enrollments(self) -> List[Tuple[str, str]]:
+        """Return every stored (teacher_id, student_id), in order."""
+        with self.pool.connection() as connection:
+            return connection.execute(SELECT_ENROLLMENTS).fetchall()
+
+    def load_evaluations(self) -> Iterator[Evaluation]:
+        """Yield every stored evaluation, in insertion order per student."""
+        self.flush()
+        with self.pool.connection() as connection:
+            for row in connection.execute(SELECT_EVALUATIONS):
+                yield Evaluation(*row)
+
+    def close(self) -> None:
+        """Flush buffered evaluations and close the connections."""
+        self.flush()
+        self.pool.close()
+
+    def __repr__(self) -> str:
+        """Return a string representation of the SQLiteStorage."""
+        return f"SQLiteStorage(path={self.path!r})"
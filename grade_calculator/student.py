@@ -3,29 +3,51 @@ Student module for managing student information and their evaluations.
 
 This module contains the Student class that represents a student in the system.
 """
-from typing import List
+from itertools import count
+from typing import List, Optional, Tuple
 
 # Support both direct execution and package imports
 try:
     from .evaluation import Evaluation
+    from .evaluation_store import EvaluationStore
 except (ImportError, ValueError):
     from evaluation import Evaluation
+    from evaluation_store import EvaluationStore
+
+# Versions are unique across all students, so a re-created student never
+# reuses the version of the object it replaced
+_version_counter = count(1)
 
 
 class Student:
     """Represents a student in the CS-GradeCalculator system."""
 
-    def __init__(self, student_id: str, name: str):
+    __slots__ = ("student_id", "name", "evaluations", "version",
+                 "_total_weighted", "_total_weight")
+
+    def __init__(self, student_id: str, name: str,
+                 store: Optional[EvaluationStore] = None):
         """
         Initialize a Student.
 
         Args:
             student_id: Unique identifier for the student
             name: Full name of the student
+            store: Optional columnar store to keep the evaluations in
+                   instead of a list of Evaluation objects
         """
         self.student_id = student_id
         self.name = name
-        self.evaluations: List[Evaluation] = []
+        if store is not None:
+            self.evaluations = store.bind_student(student_id)
+        else:
+            self.evaluations: List[Evaluation] = []
+        # Running totals kept in sync by add/remove so the weighted
+        # average can be read without rescanning the evaluations
+        self._total_weighted = 0.0
+        self._total_weight = 0.0
+        # Changes whenever the evaluations change (used as a cache key)
+        self.version = next(_version_counter)
 
     def add_evaluation(self, evaluation: Evaluation) -> None:
         """
@@ -43,6 +65,55 @@ class Student:
                 f"match student {self.student_id}"
             )
         self.evaluations.append(evaluation)
+        self._total_weighted += evaluation.get_weighted_grade()
+        self._total_weight += evaluation.weight_percentage
+        self.version = next(_version_counter)
+
+    def remove_evaluation(self, evaluation_id: str) -> Evaluation:
+        """
+        Remove an evaluation from this student.
+
+        Args:
+            evaluation_id: Identifier of the evaluation to remove
+
+        Returns:
+            The removed Evaluation object
+
+        Raises:
+            ValueError: If the student has no such evaluation
+        """
+        for index, evaluation in enumerate(self.evaluations):
+            if evaluation.evaluation_id == evaluation_id:
+                removed = self.evaluations.pop(index)
+                self._recompute_totals()
+                return removed
+        raise ValueError(
+            f"Evaluation {evaluation_id} not found for student "
+            f"{self.student_id}"
+        )
+
+    def _recompute_totals(self) -> None:
+        """Rebuild the running totals from the evaluations."""
+        # Summing again in insertion order (instead of subtracting) keeps
+        # the totals bit-identical to a fresh scan of the evaluations
+        total_weighted = 0.0
+        total_weight = 0.0
+        for evaluation in self.evaluations:
+            total_weighted += evaluation.get_weighted_grade()
+            total_weight += evaluation.weight_percentage
+        self._total_weighted = total_weighted
+        self._total_weight = total_weight
+        self.version = next(_version_counter)
+
+    def get_weighted_totals(self) -> Tuple[int, float, float]:
+        """
+        Get the running aggregates of this student's evaluations.
+
+        Returns:
+            Tuple of (evaluation_count, total_weighted_grade, total_weight)
+        """
+        return (len(self.evaluations), self._total_weighted,
+                self._total_weight)
 
     def get_evaluation_count(self) -> int:
         """
@@ -58,7 +129,7 @@ class Student:
         Get all evaluations for this student.
 
         Returns:
-            List of Evaluation objects
+            List of Evaluation objects (views when backed by a store)
         """
         return self.evaluations.copy()
 
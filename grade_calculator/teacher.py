@@ -8,6 +8,8 @@ This module contains the Teacher class that represents a teacher in the system.
 class Teacher:
     """Represents a teacher in the CS-GradeCalculator system."""
 
+    __slots__ = ("teacher_id", "name", "course")
+
     def __init__(self, teacher_id: str, name: str, course: str):
         """
         Initialize a Teacher.
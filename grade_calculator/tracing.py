@@ -0,0 +1,309 @@
+"""
+Tracing module for nested, monotonic-clock timing spans.
+
+This module contains the Tracer class, which times nested spans per thread
+and hands each finished span to a pluggable sink, and two sinks:
+ListSink keeps spans in memory and ChromeTraceSink writes them as a
+Chrome trace (chrome://tracing, Perfetto) JSON file. GradeCalculator
+emits a span per stage of calculate_final_grade (weighted average,
+attendance penalty, extra points, details) and GradeCalculatorApp one per
+lookup. No tracer is set by default; the stages then open the no-op spans
+of NULL_TRACER.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional
+
+
+class Span:
+    """A finished (or running) timed operation."""
+
+    __slots__ = ("name", "start_ns", "end_ns", "depth", "parent",
+                 "thread_id", "args")
+
+    def __init__(self, name: str, depth: int, parent: Optional[str],
+                 args: Dict[str, object]):
+        """
+        Initialize a Span starting now.
+
+        Args:
+            name: Span name
+            depth: Nesting depth (0 for a root span)
+            parent: Name of the enclosing span, if any
+            args: Extra values recorded with the span
+        """
+        self.name = name
+        self.depth = depth
+        self.parent = parent
+        self.thread_id = threading.get_ident()
+        self.args = args
+        self.end_ns = 0
+        self.start_ns = time.perf_counter_ns()
+
+    @property
+    def duration_ns(self) -> int:
+        """Duration of the span in nanoseconds."""
+        return self.end_ns - self.start_ns
+
+    def __repr__(self) -> str:
+        """Return a string representation of the Span."""
+        return f"Span(name={self.name!r}, duration_ns={self.duration_ns})"
+
+
+class SpanSink(ABC):
+    """Interface of the destinations of finished spans."""
+
+    @abstractmethod
+    def emit(self, span: Span) -> None:
+        """Receive a finished span."""
+
+    def close(self) -> None:
+        """Flush and release the sink's resources."""
+
+
+class ListSink(SpanSink):
+    """Sink keeping finished spans in a list (in finishing order)."""
+
+    def __init__(self):
+        """Initialize an empty ListSink."""
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def emit(self, span: Span) -> None:
+        """Keep a finished span."""
+        with self._lock:
+            self.spans.append(span)
+
+
+class ChromeTraceSink(SpanSink):
+    """Sink writing spans to a Chrome trace event JSON file.
+
+    Each span becomes a complete ("X") event with microsecond timestamps.
+    Events are buffered and appended to the file every flush_every spans,
+    so memory stays bounded however long the process runs; close() ends
+    the JSON document.
+    """
+
+    DEFAULT_FLUSH_EVERY = 1000
+
+    def __init__(self, path: str, flush_every: int = DEFAULT_FLUSH_EVERY):
+        """
+        Initialize a ChromeTraceSink, creating the file.
+
+        Args:
+            path: Output file
+            flush_every: Number of buffered events that triggers a write
+
+        Raises:
+            ValueError: If flush_every is not positive
+        """
+        if flush_every <= 0:
+            raise ValueError("Flush interval must be greater than 0")
+        self.path = path
+        self.flush_every = flush_every
+        self._events: List[dict] = []
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._written = 0
+        self._handle = open(path, "w", encoding="utf-8")
+        self._handle.write('{"displayTimeUnit": "ms", "traceEvents": [')
+
+    def emit(self, span: Span) -> None:
+        """Buffer a finished span as a trace event."""
+        event = {
+            "name": span.name,
+            "cat": "grade_calculator",
+            "ph": "X",
+            "ts": span.start_ns / 1000.0,
+            "dur": span.duration_ns / 1000.0,
+            "pid": self._pid,
+            "tid": span.thread_id,
+        }
+        if span.args:
+            event["args"] = {key: str(value)
+                             for key, value in span.args.items()}
+        with self._lock:
+            self._events.append(event)
+            if len(self._events) >= self.flush_every:
+                self._write_events()
+
+    def _write_events(self) -> None:
+        """Append the buffered events to the file (lock held)."""
+        if self._handle is None:
+            return
+        for event in self._events:
+            self._handle.write(("," if self._written else "")
+                               + json.dumps(event))
+            self._written += 1
+        self._events.clear()
+
+    def flush(self) -> None:
+        """Write every span emitted so far to the file."""
+        with self._lock:
+            self._write_events()
+            if self._handle is not None:
+                self._handle.flush()
+
+    def close(self) -> None:
+        """Write the remaining spans and end the JSON document."""
+        with self._lock:
+            self._write_events()
+            if self._handle is not None:
+                self._handle.write("]}\n")
+                self._handle.close()
+                self._handle = None
+
+
+class _SpanContext:
+    """Context manager opening and closing one span."""
+
+    __slots__ = ("tracer", "name", "args", "span")
+
+    def __init__(self, tracer: "Tracer", name: str, args: Dict[str, object]):
+        """
+        Initialize a _SpanContext.
+
+        Args:
+            tracer: Tracer owning the span
+            name: Span name
+            args: Extra values recorded with the span
+        """
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.span = None
+
+    def __enter__(self) -> Span:
+        """Start the span, nested in the thread's innermost open span."""
+        stack = self.tracer._stack()
+        self.span = Span(self.name, len(stack),
+                         stack[-1].name if stack else None, self.args)
+        stack.append(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        """End the span, noting the exception type if one was raised."""
+        span = self.span
+        span.end_ns = time.perf_counter_ns()
+        if exc_type is not None:
+            span.args = dict(span.args, error=exc_type.__name__)
+        self.tracer._stack().pop()
+        self.tracer.sink.emit(span)
+
+
+class Tracer:
+    """Creates nested spans (per thread) and emits them to a sink."""
+
+    def __init__(self, sink: Optional[SpanSink] = None):
+        """
+        Initialize a Tracer.
+
+        Args:
+            sink: Destination of finished spans (default: a ListSink)
+        """
+        self.sink = sink if sink is not None else ListSink()
+        self._local = threading.local()
+
+    def _stack(self) -> List[Span]:
+        """Return the current thread's stack of open spans."""
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def span(self, name: str, **args) -> _SpanContext:
+        """
+        Open a span, as a context manager yielding the Span.
+
+        Args:
+            name: Span name
+            **args: Extra values recorded with the span
+
+        Returns:
+            The span's context manager
+        """
+        return _SpanContext(self, name, args)
+
+    def close(self) -> None:
+        """Close the sink."""
+        self.sink.close()
+
+
+class _NullSpanContext:
+    """Context manager doing nothing, for spans while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        """Do nothing."""
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        """Do nothing."""
+
+
+class _NullTracer:
+    """Stand-in for Tracer whose spans do nothing."""
+
+    __slots__ = ()
+
+    _span = _NullSpanContext()
+
+    def span(self, name: str, **args) -> _NullSpanContext:
+        """Return a span context that does nothing."""
+        return self._span
+
+
+NULL_TRACER = _NullTracer()
+
+_tracer: Optional[Tracer] = None
+
+
+def set_tracer(tracer: Optional[Tracer]) -> Optional[Tracer]:
+    """
+    Install the tracer used by the instrumented code.
+
+    Args:
+        tracer: The Tracer, or None to stop tracing
+
+    Returns:
+        The previously installed tracer
+    """
+    global _tracer
+    previous, _tracer = _tracer, tracer
+    return previous
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the installed tracer, or None when tracing is off."""
+    return _tracer
+
+
+def current_tracer():
+    """Return the installed tracer, or NULL_TRACER when tracing is off."""
+    return _tracer if _tracer is not None else NULL_TRACER
+
+
+def traced(name: str) -> Callable:
+    """
+    Decorate a function so each call is a span (when a tracer is set).
+
+    Args:
+        name: Span name
+
+    Returns:
+        The decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = _tracer
+            if tracer is None:
+                return func(*args, **kwargs)
+            with tracer.span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
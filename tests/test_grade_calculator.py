@@ -12,10 +12,21 @@ This test suite aims for >80% code coverage across all modules:
 
 Tests include normal cases, edge cases, boundary conditions, and error scenarios.
 """
+import asyncio
+import http.client
+import json
+import math
 import unittest
 import sys
 import os
+import csv
+import socket
+import subprocess
+import tempfile
+import threading
+import time
 from io import StringIO
+from types import SimpleNamespace
 
 # Support both direct execution and package imports
 import sys
@@ -26,22 +37,82 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'grade_calculat
 
 try:
     from evaluation import Evaluation
+    from evaluation_store import EvaluationStore, EvaluationView
     from student import Student
     from teacher import Teacher
     from grade_calculator import GradeCalculator
     from attendance_policy import AttendancePolicy
     from extra_points_policy import ExtraPointsPolicy
-    from main import GradeCalculatorApp
+    from main import GradeCalculatorApp, main as run_main
+    import main_standalone
+    from cache import LRUCache
+    from parallel import shard_for, pack_chunk, grade_chunk
+    from concurrency import (
+        ConcurrentGradeCalculatorApp, ReadWriteLock, SessionLimitError
+    )
+    from service import GradeService
+    from importer import CsvImporter, EvaluationRowChecker, split_file
+    from storage import ConnectionPool, SQLiteStorage, StorageBackend
+    from snapshot import Snapshot, write_snapshot
+    from wal import WriteAheadLog, read_log, ADD_EVALUATION
+    from name_index import NamePrefixIndex, TrigramIndex, normalize_name
+    from ranking import GradeRanking
+    from sketch import GradeSketch
+    from scenarios import PolicySweep
+    from metrics import (
+        Metrics, enable_metrics, disable_metrics, get_metrics, error_category
+    )
+    from tracing import (Tracer, ListSink, ChromeTraceSink, SpanSink,
+                         set_tracer)
+    from profiling import parse_args, SamplingProfiler
 except ImportError as e:
     # Fallback - try relative imports from package
     try:
         from ..grade_calculator.evaluation import Evaluation
+        from ..grade_calculator.evaluation_store import (
+            EvaluationStore, EvaluationView
+        )
         from ..grade_calculator.student import Student
         from ..grade_calculator.teacher import Teacher
         from ..grade_calculator.grade_calculator import GradeCalculator
         from ..grade_calculator.attendance_policy import AttendancePolicy
         from ..grade_calculator.extra_points_policy import ExtraPointsPolicy
-        from ..grade_calculator.main import GradeCalculatorApp
+        from ..grade_calculator.main import (
+            GradeCalculatorApp, main as run_main
+        )
+        from ..grade_calculator import main_standalone
+        from ..grade_calculator.cache import LRUCache
+        from ..grade_calculator.parallel import (
+            shard_for, pack_chunk, grade_chunk
+        )
+        from ..grade_calculator.concurrency import (
+            ConcurrentGradeCalculatorApp, ReadWriteLock, SessionLimitError
+        )
+        from ..grade_calculator.service import GradeService
+        from ..grade_calculator.importer import (
+            CsvImporter, EvaluationRowChecker, split_file
+        )
+        from ..grade_calculator.storage import (
+            ConnectionPool, SQLiteStorage, StorageBackend
+        )
+        from ..grade_calculator.snapshot import Snapshot, write_snapshot
+        from ..grade_calculator.wal import (
+            WriteAheadLog, read_log, ADD_EVALUATION
+        )
+        from ..grade_calculator.name_index import (
+            NamePrefixIndex, TrigramIndex, normalize_name
+        )
+        from ..grade_calculator.ranking import GradeRanking
+        from ..grade_calculator.sketch import GradeSketch
+        from ..grade_calculator.scenarios import PolicySweep
+        from ..grade_calculator.metrics import (
+            Metrics, enable_metrics, disable_metrics, get_metrics,
+            error_category
+        )
+        from ..grade_calculator.tracing import (
+            Tracer, ListSink, ChromeTraceSink, SpanSink, set_tracer
+        )
+        from ..grade_calculator.profiling import parse_args, SamplingProfiler
     except ImportError:
         print(f"Import error: {e}")
         raise
@@ -108,6 +179,13 @@ class TestEvaluation(unittest.TestCase):
         eval_obj = Evaluation("S001", "E001", 15.0, 0.1)
         self.assertAlmostEqual(eval_obj.get_weighted_grade(), 0.015, places=3)
 
+    def test_evaluation_is_slotted(self):
+        """Test that evaluations do not carry a per-instance __dict__."""
+        eval_obj = Evaluation("S001", "E001", 15.0, 50.0)
+        self.assertFalse(hasattr(eval_obj, "__dict__"))
+        with self.assertRaises(AttributeError):
+            eval_obj.comment = "not allowed"
+
 
 class TestStudent(unittest.TestCase):
     """Test cases for the Student class."""
@@ -150,6 +228,167 @@ class TestStudent(unittest.TestCase):
         # Original should not be modified
         self.assertEqual(self.student.get_evaluation_count(), 1)
 
+    def test_weighted_totals_track_add_and_remove(self):
+        """Test that running totals follow added and removed evaluations."""
+        self.assertEqual(self.student.get_weighted_totals(), (0, 0.0, 0.0))
+        self.student.add_evaluation(Evaluation("S001", "E001", 20.0, 30.0))
+        self.student.add_evaluation(Evaluation("S001", "E002", 10.0, 70.0))
+        count, total_weighted, total_weight = \
+            self.student.get_weighted_totals()
+        self.assertEqual(count, 2)
+        self.assertAlmostEqual(total_weighted, 13.0)
+        self.assertEqual(total_weight, 100.0)
+        removed = self.student.remove_evaluation("E001")
+        self.assertEqual(removed.evaluation_id, "E001")
+        self.assertEqual(self.student.get_weighted_totals(), (1, 7.0, 70.0))
+
+    def test_remove_unknown_evaluation(self):
+        """Test that removing a missing evaluation raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.student.remove_evaluation("E404")
+
+    def test_remove_evaluation_from_store(self):
+        """Test removing an evaluation from a store-backed student."""
+        student = Student("S001", "John Doe", EvaluationStore())
+        student.add_evaluation(Evaluation("S001", "E001", 15.0, 50.0))
+        student.add_evaluation(Evaluation("S001", "E002", 17.0, 50.0))
+        student.remove_evaluation("E001")
+        self.assertEqual([e.evaluation_id for e in student.get_evaluations()],
+                         ["E002"])
+        self.assertEqual(student.get_weighted_totals(), (1, 8.5, 50.0))
+
+    def test_student_is_slotted(self):
+        """Test that students do not carry a per-instance __dict__."""
+        self.assertFalse(hasattr(self.student, "__dict__"))
+
+
+class TestEvaluationStore(unittest.TestCase):
+    """Test cases for the columnar EvaluationStore."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.store = EvaluationStore()
+
+    def test_add_and_view(self):
+        """Test that stored rows are exposed as Evaluation-like views."""
+        student = Student("S001", "John Doe", self.store)
+        version = student.version
+        student.add_evaluation(Evaluation("S001", "E001", 15.5, 30.0))
+        view = student.get_evaluations()[0]
+        self.assertIsInstance(view, EvaluationView)
+        self.assertEqual(view.student_id, "S001")
+        self.assertEqual(view.evaluation_id, "E001")
+        self.assertEqual(view.grade, 15.5)
+        self.assertEqual(view.weight_percentage, 30.0)
+        self.assertAlmostEqual(view.get_weighted_grade(), 4.65)
+        self.assertIn("E001", repr(view))
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(self.store.get_evaluations("S001"), [view])
+        self.assertEqual(student.get_weighted_totals(),
+                         (1, view.get_weighted_grade(), 30.0))
+        self.assertGreater(student.version, version)
+
+    def test_validation_matches_evaluation(self):
+        """Test that the store rejects the same values as Evaluation."""
+        evaluations = self.store.bind_student("S001")
+        for grade, weight in ((20.1, 30.0), (15.0, 0.0)):
+            with self.assertRaises(ValueError):
+                evaluations.append(SimpleNamespace(
+                    evaluation_id="E001", grade=grade,
+                    weight_percentage=weight))
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(len(evaluations), 0)
+
+    def test_ids_are_interned(self):
+        """Test that repeated ids are stored once in the string tables."""
+        for student_id in ("S001", "S002"):
+            student = Student(student_id, "Student", self.store)
+            for evaluation_id in ("E001", "E002"):
+                student.add_evaluation(
+                    Evaluation(student_id, evaluation_id, 10.0, 50.0))
+        self.assertEqual(self.store.student_ids, ["S001", "S002"])
+        self.assertEqual(self.store.evaluation_ids, ["E001", "E002"])
+        self.assertEqual(self.store.get_evaluation_count("S002"), 2)
+        self.assertEqual(self.store.get_evaluation_count("S999"), 0)
+        self.assertEqual(self.store.get_evaluations("S999"), [])
+
+    def test_student_backed_by_store(self):
+        """Test that a Student can keep its evaluations in a store."""
+        student = Student("S001", "John Doe", self.store)
+        student.add_evaluation(Evaluation("S001", "E001", 15.0, 50.0))
+        student.add_evaluation(Evaluation("S001", "E002", 17.0, 50.0))
+        self.assertEqual(student.get_evaluation_count(), 2)
+        self.assertEqual(len(self.store), 2)
+        evaluations = student.get_evaluations()
+        self.assertEqual([e.grade for e in evaluations], [15.0, 17.0])
+        self.assertEqual(evaluations[1].evaluation_id, "E002")
+        evaluations.append(evaluations[0])
+        self.assertEqual(student.get_evaluation_count(), 2)
+        avg = GradeCalculator().calculate_weighted_average(evaluations[:2])
+        self.assertEqual(avg, 16.0)
+
+    def test_rebinding_student_starts_empty(self):
+        """Test that re-creating a student does not inherit old rows."""
+        Student("S001", "John", self.store).add_evaluation(
+            Evaluation("S001", "E001", 15.0)
+        )
+        student = Student("S001", "John", self.store)
+        self.assertEqual(student.get_evaluation_count(), 0)
+
+    def test_rebinding_student_frees_old_rows(self):
+        """Test that re-creating a student releases its old rows."""
+        old = Student("S001", "John", self.store)
+        old.add_evaluation(Evaluation("S001", "E001", 15.0, 50.0))
+        old.add_evaluation(Evaluation("S001", "E002", 17.0, 50.0))
+        student = Student("S001", "John", self.store)
+        self.assertEqual(len(self.store), 0)
+        self.assertEqual(old.get_evaluation_count(), 0)
+        student.add_evaluation(Evaluation("S001", "E003", 12.0, 100.0))
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(self.store.capacity, 2)
+        self.assertIn("evaluations=1", repr(self.store))
+
+    def test_removed_rows_are_reused(self):
+        """Test that removing and re-adding does not grow the columns."""
+        student = Student("S001", "John", self.store)
+        student.add_evaluation(Evaluation("S001", "E001", 15.0, 50.0))
+        student.add_evaluation(Evaluation("S001", "E002", 17.0, 50.0))
+        for _ in range(10):
+            removed = student.remove_evaluation("E001")
+            self.assertEqual(len(self.store), 1)
+            student.add_evaluation(Evaluation("S001", "E001", 11.0, 50.0))
+            self.assertEqual(removed.evaluation_id, "E001")
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.capacity, 2)
+        self.assertEqual(
+            [(e.evaluation_id, e.grade) for e in student.get_evaluations()],
+            [("E002", 17.0), ("E001", 11.0)]
+        )
+
+    def test_popped_evaluation_outlives_its_row(self):
+        """Test that a removed evaluation keeps its values after reuse."""
+        student = Student("S001", "John", self.store)
+        student.add_evaluation(Evaluation("S001", "E001", 15.0, 40.0))
+        removed = student.remove_evaluation("E001")
+        other = Student("S002", "Jane", self.store)
+        other.add_evaluation(Evaluation("S002", "E009", 9.0, 60.0))
+        self.assertEqual(self.store.capacity, 1)
+        self.assertEqual((removed.student_id, removed.evaluation_id,
+                          removed.grade, removed.weight_percentage),
+                         ("S001", "E001", 15.0, 40.0))
+
+    def test_app_with_store_matches_list_backed_app(self):
+        """Test that a store-backed app grades like the default app."""
+        app = GradeCalculatorApp(load_sample_data=True,
+                                 evaluation_store=self.store)
+        plain = GradeCalculatorApp(load_sample_data=True)
+        self.assertEqual(len(self.store), 9)
+        for student_id in ("S001", "S002", "S003"):
+            self.assertEqual(
+                app.get_student_final_grade(student_id, 85.0, 1.0, True),
+                plain.get_student_final_grade(student_id, 85.0, 1.0, True)
+            )
+
 
 class TestAttendancePolicy(unittest.TestCase):
     """Test cases for the AttendancePolicy class."""
@@ -400,6 +639,43 @@ class TestGradeCalculator(unittest.TestCase):
         )
         self.assertEqual(final_grade, 17.0)
 
+    def test_student_final_grade_matches_list_path(self):
+        """Test that totals-based grading equals list-based grading."""
+        student = Student("S001", "John Doe")
+        for i, (grade, weight) in enumerate([(12.0, 33.33), (11.5, 33.33),
+                                             (13.0, 33.34)]):
+            student.add_evaluation(Evaluation("S001", f"E{i}", grade, weight))
+        self.assertEqual(
+            self.calculator.calculate_student_final_grade(student, 85.0, 1.5),
+            self.calculator.calculate_final_grade(student.get_evaluations(),
+                                                  85.0, 1.5)
+        )
+
+    def test_student_final_grade_without_evaluations(self):
+        """Test that a student without evaluations raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_student_final_grade(
+                Student("S001", "John Doe")
+            )
+
+    def test_student_grade_report_generation(self):
+        """Test grade report generation from a Student."""
+        student = Student("S001", "John Doe")
+        student.add_evaluation(Evaluation("S001", "E001", 15.0, 100.0))
+        report = self.calculator.generate_student_grade_report(student)
+        self.assertEqual(
+            report,
+            self.calculator.generate_grade_report(
+                "S001", "John Doe", student.get_evaluations()
+            )
+        )
+        self.assertIn(
+            "Error generating report",
+            self.calculator.generate_student_grade_report(
+                Student("S002", "Jane")
+            )
+        )
+
     def test_grade_report_generation(self):
         """Test grade report generation."""
         evaluations = [
@@ -417,6 +693,92 @@ class TestGradeCalculator(unittest.TestCase):
         self.assertIn("15.0", report)
 
 
+class TestGradeCalculatorBatch(unittest.TestCase):
+    """Test cases for the cohort batch grading API."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.calculator = GradeCalculator()
+        self.cohort = [
+            ([(15.5, 30.0), (17.0, 40.0), (16.0, 30.0)], 100.0, 0.0, True),
+            ([(18.0, 30.0), (19.0, 40.0), (17.5, 30.0)], 90.0, 3.0, True),
+            ([(12.0, 33.33), (11.5, 33.33), (13.0, 33.34)], 50.0, 2.0, False),
+            ([(20.0, 100.0)], 100.0, 5.0, True),
+            ([(0.0, 10.0)], 0.0, 0.0, True),
+        ]
+
+    def _columns(self):
+        """Flatten the cohort into batch columns."""
+        grades, weights, offsets = [], [], [0]
+        attendance, extra, reached = [], [], []
+        for evaluations, att, points, flag in self.cohort:
+            for grade, weight in evaluations:
+                grades.append(grade)
+                weights.append(weight)
+            offsets.append(len(grades))
+            attendance.append(att)
+            extra.append(points)
+            reached.append(flag)
+        return grades, weights, offsets, attendance, extra, reached
+
+    def test_batch_matches_per_student_path(self):
+        """Test that batch results equal calculate_final_grade exactly."""
+        results = self.calculator.calculate_final_grades_batch(
+            *self._columns()
+        )
+        self.assertEqual(len(results), len(self.cohort))
+        for result, (evaluations, att, points, flag) in zip(results,
+                                                            self.cohort):
+            expected = self.calculator.calculate_final_grade(
+                [Evaluation("S001", f"E{i}", g, w)
+                 for i, (g, w) in enumerate(evaluations)],
+                att, points, flag
+            )
+            self.assertEqual(result, expected)
+
+    def test_batch_default_reached_minimum(self):
+        """Test that minimum attendance defaults to True for everyone."""
+        columns = self._columns()[:5]
+        results = self.calculator.calculate_final_grades_batch(*columns)
+        self.assertEqual(results[2][1]['extra_points_applied'], 2.0)
+
+    def test_batch_empty_cohort(self):
+        """Test that an empty cohort returns no results."""
+        self.assertEqual(
+            self.calculator.calculate_final_grades_batch([], [], [0], [], []),
+            []
+        )
+
+    def test_batch_student_without_evaluations(self):
+        """Test that a student with no rows raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_final_grades_batch(
+                [15.0], [100.0], [0, 1, 1], [100.0, 100.0], [0.0, 0.0]
+            )
+
+    def test_batch_exceeds_max_evaluations(self):
+        """Test that too many rows for one student raises ValueError."""
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_final_grades_batch(
+                [15.0] * 11, [1.0] * 11, [0, 11], [100.0], [0.0]
+            )
+
+    def test_batch_inconsistent_columns(self):
+        """Test that mismatched column lengths raise ValueError."""
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_final_grades_batch(
+                [15.0], [100.0, 50.0], [0, 1], [100.0], [0.0]
+            )
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_final_grades_batch(
+                [15.0], [100.0], [0, 1], [100.0, 90.0], [0.0]
+            )
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_final_grades_batch(
+                [15.0], [100.0], [0, 2], [100.0], [0.0]
+            )
+
+
 class TestTeacher(unittest.TestCase):
     """Test cases for the Teacher class."""
 
@@ -427,6 +789,11 @@ class TestTeacher(unittest.TestCase):
         self.assertEqual(teacher.name, "Dr. Smith")
         self.assertEqual(teacher.course, "Mathematics")
 
+    def test_teacher_is_slotted(self):
+        """Test that teachers do not carry a per-instance __dict__."""
+        teacher = Teacher("T001", "Dr. Smith", "Mathematics")
+        self.assertFalse(hasattr(teacher, "__dict__"))
+
 
 class TestIntegration(unittest.TestCase):
     """Integration tests for the complete system."""
@@ -733,5 +1100,1931 @@ class TestGradeCalculatorAppExtended(unittest.TestCase):
             self.assertLessEqual(grade, 20.0)
 
 
+class TestLRUCache(unittest.TestCase):
+    """Test cases for the LRUCache class."""
+
+    def test_hits_misses_and_evictions(self):
+        """Test that the cache counts hits, misses and evictions."""
+        cache = LRUCache(2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)  # evicts "b", the least recently used
+        self.assertIsNone(cache.get("b"))
+        self.assertIn("a", cache)
+        self.assertEqual(cache.get_stats(), {
+            'hits': 1, 'misses': 1, 'evictions': 1, 'size': 2, 'maxsize': 2
+        })
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_invalid_size(self):
+        """Test that a non-positive size raises ValueError."""
+        with self.assertRaises(ValueError):
+            LRUCache(0)
+
+
+class TestGradeCalculatorAppCache(unittest.TestCase):
+    """Test cases for the final-grade memoization in GradeCalculatorApp."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.app = GradeCalculatorApp(load_sample_data=True)
+
+    def test_repeated_request_hits_cache(self):
+        """Test that identical requests are served from the cache."""
+        first = self.app.get_student_final_grade("S001", 90.0, 1.0, True)
+        second = self.app.get_student_final_grade("S001", 90.0, 1.0, True)
+        self.assertEqual(first, second)
+        stats = self.app.get_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_cached_details_are_not_shared(self):
+        """Test that mutating a returned details dict cannot corrupt it."""
+        _, details = self.app.get_student_final_grade("S001")
+        details['final_grade'] = -1
+        _, details = self.app.get_student_final_grade("S001")
+        self.assertGreater(details['final_grade'], 0)
+
+    def test_add_evaluation_invalidates(self):
+        """Test that a new evaluation changes the cached grade."""
+        self.app.add_student("S100", "Alice")
+        self.app.add_evaluation("S100", "E001", 10.0, 50.0)
+        before, _ = self.app.get_student_final_grade("S100")
+        self.app.add_evaluation("S100", "E002", 20.0, 50.0)
+        after, _ = self.app.get_student_final_grade("S100")
+        self.assertEqual((before, after), (10.0, 15.0))
+        self.assertEqual(self.app.get_cache_stats()['hits'], 0)
+
+    def test_replaced_student_invalidates(self):
+        """Test that re-adding a student does not reuse old entries."""
+        self.app.get_student_final_grade("S001")
+        self.app.add_student("S001", "María García")
+        self.app.add_evaluation("S001", "E001", 5.0, 100.0)
+        grade, _ = self.app.get_student_final_grade("S001")
+        self.assertEqual(grade, 5.0)
+
+    def test_policy_replacement_invalidates(self):
+        """Test that replacing a policy changes the cached grade."""
+        _, before = self.app.get_student_final_grade("S003", 100.0, 2.0)
+        self.app.grade_calculator.extra_points_policy = ExtraPointsPolicy(0.5)
+        _, after = self.app.get_student_final_grade("S003", 100.0, 2.0)
+        self.assertEqual(before['extra_points_applied'], 2.0)
+        self.assertEqual(after['extra_points_applied'], 1.0)
+        self.app.grade_calculator.attendance_policy = AttendancePolicy(90.0)
+        self.app.get_student_final_grade("S003", 100.0, 2.0)
+        self.assertEqual(self.app.get_cache_stats()['hits'], 0)
+
+    def test_errors_are_not_cached(self):
+        """Test that failed calculations are not memoized."""
+        self.app.add_student("S100", "Alice")
+        for i in range(11):
+            self.app.add_evaluation("S100", f"E{i:03d}", 15.0, 5.0)
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        self.assertIsNone(self.app.get_student_final_grade("S100"))
+        sys.stdout = sys.__stdout__
+        self.assertEqual(self.app.get_cache_stats()['size'], 0)
+
+
+class TestGradeCalculatorAppReportCache(unittest.TestCase):
+    """Test cases for the rendered grade report cache."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.app = GradeCalculatorApp(load_sample_data=True)
+
+    def test_report_matches_generated_report(self):
+        """Test that the cached report equals a freshly generated one."""
+        student = self.app.students["S001"]
+        expected = self.app.grade_calculator.generate_grade_report(
+            "S001", student.name, student.get_evaluations(), 90.0, 1.0, True
+        )
+        self.assertEqual(self.app.get_grade_report("S001", 90.0, 1.0, True),
+                         expected)
+        self.assertEqual(
+            self.app.get_grade_report_bytes("S001", 90.0, 1.0, True),
+            expected.encode("utf-8")
+        )
+        stats = self.app.get_report_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_bytes_are_reused(self):
+        """Test that repeated requests return the same encoded object."""
+        first = self.app.get_grade_report_bytes("S002")
+        self.assertIs(self.app.get_grade_report_bytes("S002"), first)
+
+    def test_report_invalidated_by_changes(self):
+        """Test that evaluations, names and policies invalidate reports."""
+        first = self.app.get_grade_report("S001")
+        self.app.students["S001"].name = "María G. García"
+        renamed = self.app.get_grade_report("S001")
+        self.assertIn("María G. García", renamed)
+        self.app.add_evaluation("S001", "E004", 20.0, 10.0)
+        self.assertIn("Total Evaluations: 4", self.app.get_grade_report("S001"))
+        self.app.grade_calculator.attendance_policy = AttendancePolicy(70.0)
+        self.app.get_grade_report("S001")
+        self.assertNotEqual(first, renamed)
+        self.assertEqual(self.app.get_report_cache_stats()['hits'], 0)
+
+    def test_report_for_missing_student(self):
+        """Test that unknown or empty students produce no report."""
+        self.app.add_student("S100", "Alice")
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        self.assertIsNone(self.app.get_grade_report("NONEXIST"))
+        self.assertIsNone(self.app.get_grade_report_bytes("S100"))
+        sys.stdout = sys.__stdout__
+        self.assertIn("Error", captured_output.getvalue())
+
+    def test_error_reports_are_not_cached(self):
+        """Test that a failing calculation returns an uncached error."""
+        self.app.add_student("S100", "Alice")
+        for i in range(11):
+            self.app.add_evaluation("S100", f"E{i:03d}", 15.0, 5.0)
+        report = self.app.get_grade_report("S100")
+        self.assertIn("Error generating report", report)
+        self.assertEqual(self.app.get_report_cache_stats()['size'], 0)
+
+
+class TestParallelGrading(unittest.TestCase):
+    """Test cases for sharded multiprocess cohort grading."""
+
+    def setUp(self):
+        """Set up a cohort with gradable and ungradable students."""
+        self.app = GradeCalculatorApp(load_sample_data=True)
+        for i in range(40):
+            student_id = f"P{i:03d}"
+            self.app.add_student(student_id, f"Student {i}")
+            for j in range(1 + i % 4):
+                self.app.add_evaluation(student_id, f"E{j}",
+                                        (i * 7 + j * 3) % 21, 10.0 + j * 7.5)
+        self.app.add_student("EMPTY", "No Evaluations")
+        self.app.add_student("FULL", "Too Many")
+        for j in range(11):
+            self.app.add_evaluation("FULL", f"E{j:03d}", 15.0, 5.0)
+        self.inputs = {
+            f"P{i:03d}": (60.0 + i, i % 3, i % 2 == 0) for i in range(40)
+        }
+
+    def test_shard_assignment_is_stable(self):
+        """Test that shards depend only on the id and shard count."""
+        self.assertEqual(shard_for("S001", 4), shard_for("S001", 4))
+        self.assertTrue(all(0 <= shard_for(f"S{i}", 3) < 3
+                            for i in range(50)))
+
+    def test_chunk_round_trip(self):
+        """Test that a packed chunk grades like the per-student path."""
+        students = [self.app.students[sid] for sid in ("S001", "S002")]
+        chunk = pack_chunk(students, {"S002": (85.0, 1.0, True)})
+        self.assertIsInstance(chunk['grades'], bytes)
+        student_ids, results = grade_chunk(self.app.grade_calculator, chunk)
+        self.assertEqual(student_ids, ["S001", "S002"])
+        self.assertEqual(results[1], self.app.get_student_final_grade(
+            "S002", 85.0, 1.0, True))
+
+    def test_parallel_matches_serial(self):
+        """Test that the process pool output equals the serial output."""
+        serial = self.app.grade_all_students(self.inputs)
+        parallel = self.app.grade_all_students(self.inputs, processes=3)
+        self.assertEqual(parallel, serial)
+        self.assertEqual(list(parallel), list(self.app.students))
+        self.assertIsNone(parallel["EMPTY"])
+        self.assertIsNone(parallel["FULL"])
+        self.assertEqual(serial["P005"], self.app.get_student_final_grade(
+            "P005", *self.inputs["P005"]))
+
+    def test_parallel_sketches_merge(self):
+        """Test that merged shard sketches match the serial sketch."""
+        serial = GradeSketch()
+        grades = self.app.grade_all_students(self.inputs, sketch=serial)
+        parallel = self.app.get_grade_distribution(inputs=self.inputs,
+                                                   processes=3)
+        self.assertEqual(parallel.count, 43)
+        self.assertEqual(parallel.count, serial.count)
+        self.assertEqual(list(parallel.bins), list(serial.bins))
+        self.assertEqual(parallel.median, serial.median)
+        self.assertAlmostEqual(parallel.mean, serial.mean)
+        self.assertAlmostEqual(parallel.stdev, serial.stdev)
+        finals = [r[0] for r in grades.values() if r is not None]
+        self.assertAlmostEqual(serial.mean, sum(finals) / len(finals))
+
+
+class TestConcurrentGradeCalculatorApp(unittest.TestCase):
+    """Test cases for the thread-safe application."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.app = ConcurrentGradeCalculatorApp(load_sample_data=True)
+
+    def test_readers_share_writer_excludes(self):
+        """Test that readers overlap while a writer waits for them."""
+        lock = ReadWriteLock()
+        lock.acquire_read()
+        lock.acquire_read()
+        acquired = threading.Event()
+
+        def writer():
+            with lock.write_locked():
+                acquired.set()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        self.assertFalse(acquired.wait(0.05))
+        lock.release_read()
+        lock.release_read()
+        self.assertTrue(acquired.wait(1.0))
+        thread.join()
+
+    def test_session_limit_enforced(self):
+        """Test that admission stops at MAX_CONCURRENT_USERS."""
+        limiter = self.app.session_limiter
+        for _ in range(self.app.MAX_CONCURRENT_USERS):
+            limiter.acquire()
+        self.assertEqual(limiter.active_sessions, 50)
+        with self.assertRaises(SessionLimitError):
+            with self.app.session():
+                pass
+        limiter.release()
+        with self.app.session():
+            self.assertEqual(limiter.active_sessions, 50)
+        self.assertEqual(limiter.active_sessions, 49)
+
+    def test_calls_outside_sessions_are_admitted(self):
+        """Test that app calls take a slot unless already in a session."""
+        limiter = self.app.session_limiter
+        seen = []
+        calculator = self.app.grade_calculator
+        original = calculator.calculate_student_final_grade
+
+        def record(*args):
+            seen.append(limiter.active_sessions)
+            return original(*args)
+
+        calculator.calculate_student_final_grade = record
+        self.app.get_student_final_grade("S001", 90.0)
+        with self.app.session():
+            with self.app.session():
+                self.app.get_student_final_grade("S002", 90.0)
+        self.assertEqual(seen, [1, 1])
+        self.assertEqual(limiter.active_sessions, 0)
+
+        for _ in range(self.app.MAX_CONCURRENT_USERS):
+            limiter.acquire()
+        self.app.ADMISSION_TIMEOUT = 0.0
+        with self.assertRaises(SessionLimitError):
+            self.app.add_evaluation("S001", "E009", 12.0)
+        self.assertEqual(self.app.students["S001"].get_evaluation_count(), 3)
+        for _ in range(self.app.MAX_CONCURRENT_USERS):
+            limiter.release()
+
+    def test_concurrent_reads_and_writes(self):
+        """Test that parallel users see consistent grades."""
+        for i in range(20):
+            self.app.add_student(f"C{i:03d}", f"Student {i}")
+        errors = []
+
+        def user(index):
+            student_id = f"C{index % 20:03d}"
+            try:
+                with self.app.session(timeout=5.0):
+                    self.app.add_evaluation(student_id, f"E{index}",
+                                            10.0 + index % 10, 10.0)
+                    result = self.app.get_student_final_grade(student_id)
+                    if result is None or not 10.0 <= result[0] <= 20.0:
+                        errors.append(result)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=user, args=(i,))
+                   for i in range(120)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        counts = [self.app.students[f"C{i:03d}"].get_evaluation_count()
+                  for i in range(20)]
+        self.assertEqual(sum(counts), 120)
+        self.assertEqual(self.app.session_limiter.active_sessions, 0)
+
+    def test_matches_plain_app(self):
+        """Test that results equal the single-threaded application."""
+        plain = GradeCalculatorApp(load_sample_data=True)
+        self.assertEqual(self.app.grade_all_students(),
+                         plain.grade_all_students())
+        self.assertEqual(self.app.get_grade_report("S002", 90.0),
+                         plain.get_grade_report("S002", 90.0))
+
+
+class TestGradeService(unittest.TestCase):
+    """Test cases for the asyncio HTTP/JSON service."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the service on a free port in a background loop."""
+        cls.loop = asyncio.new_event_loop()
+        cls.service = GradeService(
+            ConcurrentGradeCalculatorApp(load_sample_data=True),
+            max_workers=4
+        )
+        cls.host, cls.port = cls.loop.run_until_complete(
+            cls.service.start("127.0.0.1", 0)
+        )
+        cls.thread = threading.Thread(target=cls.loop.run_forever,
+                                      daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Stop the service and its loop."""
+        asyncio.run_coroutine_threadsafe(cls.service.close(),
+                                         cls.loop).result(5)
+        cls.loop.call_soon_threadsafe(cls.loop.stop)
+        cls.thread.join(5)
+        cls.loop.close()
+
+    def setUp(self):
+        """Open a keep-alive client connection."""
+        self.connection = http.client.HTTPConnection(self.host, self.port,
+                                                     timeout=5)
+
+    def tearDown(self):
+        """Close the client connection."""
+        self.connection.close()
+
+    def _request(self, method, path, body=None):
+        """Send a request and return (status, decoded body)."""
+        headers = {}
+        if body is not None:
+            body = json.dumps(body)
+            headers["Content-Type"] = "application/json"
+        self.connection.request(method, path, body=body, headers=headers)
+        response = self.connection.getresponse()
+        data = response.read()
+        if response.getheader("Content-Type") == "application/json":
+            return response.status, json.loads(data)
+        return response.status, data.decode("utf-8")
+
+    def test_add_student_evaluation_and_grade_on_one_connection(self):
+        """Test the full flow over a single keep-alive connection."""
+        status, body = self._request("POST", "/students",
+                                     {"student_id": "W001", "name": "Web"})
+        self.assertEqual((status, body["student_id"]), (201, "W001"))
+        status, _ = self._request("POST", "/evaluations", {
+            "student_id": "W001", "evaluation_id": "E001",
+            "grade": 16.0, "weight_percentage": 100.0
+        })
+        self.assertEqual(status, 201)
+        status, body = self._request(
+            "GET", "/students/W001/final-grade?attendance=90&extra_points=1"
+        )
+        self.assertEqual(status, 200)
+        expected = self.service.app.get_student_final_grade("W001", 90.0,
+                                                            1.0, True)
+        self.assertEqual(body["final_grade"], expected[0])
+        self.assertEqual(body["details"], expected[1])
+
+    def test_report_endpoint(self):
+        """Test that the report endpoint returns the cached report text."""
+        status, body = self._request("GET", "/students/S001/report")
+        self.assertEqual(status, 200)
+        self.assertEqual(body, self.service.app.get_grade_report("S001"))
+
+    def test_errors(self):
+        """Test error statuses for bad requests."""
+        self.assertEqual(self._request("GET", "/students/NOPE/report")[0],
+                         404)
+        status, body = self._request("POST", "/evaluations", {
+            "student_id": "S001", "evaluation_id": "E009", "grade": 25.0
+        })
+        self.assertEqual(status, 400)
+        self.assertIn("Grade must be between", body["error"])
+        self.assertEqual(self._request(
+            "GET", "/students/S001/final-grade?attendance=abc")[0], 400)
+        self.assertEqual(self._request("GET", "/students")[0], 405)
+        self.assertEqual(self._request("GET", "/unknown")[0], 404)
+        self.assertEqual(self._request("POST", "/students", {
+            "student_id": "S001", "name": "Duplicate"})[0], 422)
+
+    def test_rejections_and_handler_failures(self):
+        """Test app rejections map to 422 and handler bugs to 500."""
+        app = self.service.app
+        self._request("POST", "/students",
+                      {"student_id": "W002", "name": "Web"})
+        app.add_evaluation = lambda *args: False
+        app.get_grade_report_bytes = lambda *args: None
+        try:
+            status, body = self._request("POST", "/evaluations", {
+                "student_id": "W002", "evaluation_id": "E001",
+                "grade": 12.0})
+            self.assertEqual((status, body["error"]),
+                             (422, "Evaluation was rejected"))
+            self.assertEqual(app.find_student("W002").get_evaluation_count(),
+                             0)
+            self.assertEqual(
+                self._request("GET", "/students/S001/report")[0], 422)
+            app.get_student_final_grade = None  # calling it raises
+            status, body = self._request("GET",
+                                         "/students/S001/final-grade")
+            self.assertEqual((status, body["error"]),
+                             (500, "Internal server error"))
+        finally:
+            del app.add_evaluation
+            del app.get_grade_report_bytes
+            app.__dict__.pop("get_student_final_grade", None)
+        # The connection survives the failures
+        self.assertEqual(self._request("GET", "/students/S001/report")[0],
+                         200)
+
+    def test_concurrent_duplicate_students(self):
+        """Test that racing POSTs for one ID add the student once."""
+        statuses = []
+
+        def post():
+            connection = http.client.HTTPConnection(self.host, self.port,
+                                                    timeout=5)
+            connection.request("POST", "/students", body=json.dumps(
+                {"student_id": "W003", "name": "Racer"}))
+            statuses.append(connection.getresponse().status)
+            connection.close()
+
+        threads = [threading.Thread(target=post) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(statuses), [201] + [422] * 7)
+
+    def _raw_status(self, data):
+        """Send raw bytes on a new connection and return the status line."""
+        with socket.create_connection((self.host, self.port),
+                                      timeout=5) as raw:
+            raw.sendall(data)
+            return raw.makefile("rb").readline().decode("latin-1")
+
+    def test_overlong_lines_are_answered(self):
+        """Test that lines over the reader limit get 400 and 431."""
+        self.assertIn(" 400 ", self._raw_status(
+            b"GET /" + b"a" * 70000 + b" HTTP/1.1\r\n\r\n"))
+        self.assertIn(" 431 ", self._raw_status(
+            b"GET /students/S001/report HTTP/1.1\r\nX-Big: "
+            + b"b" * 70000 + b"\r\n\r\n"))
+
+    def test_idle_connections_hold_no_session(self):
+        """Test that a session slot is held per request, not connection."""
+        self.assertEqual(self._request("GET", "/students/S001/report")[0],
+                         200)
+        # The keep-alive connection is still open but idle
+        self.assertEqual(self.service.app.session_limiter.active_sessions, 0)
+
+
+class TestCsvImporter(unittest.TestCase):
+    """Test cases for the streaming CSV importer."""
+
+    def setUp(self):
+        """Set up an app and a temporary directory for CSV files."""
+        self.app = GradeCalculatorApp(load_sample_data=True)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def _write(self, name, text):
+        """Write a CSV file in the temporary directory."""
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8", newline="") as handle:
+            handle.write(text)
+        return path
+
+    def test_import_students(self):
+        """Test importing students and rejecting bad rows."""
+        path = self._write("students.csv",
+                           "student_id,name\nS100,Alice\nS001,Again\n,X\n")
+        rejects = os.path.join(self.tmp.name, "rejects.csv")
+        result = CsvImporter(self.app).import_students(path, rejects)
+        self.assertEqual((result.imported, result.rejected), (1, 2))
+        self.assertEqual(self.app.students["S100"].name, "Alice")
+        self.assertEqual(self.app.students["S001"].name, "María García")
+
+    def test_import_evaluations_with_rejects(self):
+        """Test that invalid rows go to the rejects file, not stdout."""
+        self.app.add_student("S100", "Alice")
+        path = self._write("evaluations.csv", (
+            "student_id,evaluation_id,grade,weight_percentage\n"
+            "S100,E001,15.5,40\n"
+            "S100,E002,17,\n"
+            "S100,E001,12,10\n"
+            "S100,E003,25,10\n"
+            "S100,E004,abc,10\n"
+            "S100,E005,12,0\n"
+            "S999,E001,12,10\n"
+            "S001,E001,12,10\n"
+        ))
+        rejects = os.path.join(self.tmp.name, "rejects.csv")
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        result = CsvImporter(self.app, chunk_size=2).import_evaluations(
+            path, rejects)
+        sys.stdout = sys.__stdout__
+        self.assertEqual(captured_output.getvalue(), "")
+        self.assertEqual((result.imported, result.rejected), (2, 6))
+        self.assertEqual(result.rejects_path, rejects)
+        student = self.app.students["S100"]
+        self.assertEqual([e.weight_percentage for e in student.evaluations],
+                         [40.0, 100.0])
+        with open(rejects, newline="", encoding="utf-8") as handle:
+            rows = list(csv.DictReader(handle))
+        self.assertEqual([row["line"] for row in rows],
+                         ["4", "5", "6", "7", "8", "9"])
+        self.assertIn("Duplicate evaluation E001", rows[0]["error"])
+        self.assertIn("Grade must be between", rows[1]["error"])
+        self.assertIn("Invalid grade", rows[2]["error"])
+        self.assertIn("Weight percentage", rows[3]["error"])
+        self.assertIn("not found", rows[4]["error"])
+
+    def test_checker_keeps_only_the_current_chunk(self):
+        """Test the checker reads the app, holding no per-student state."""
+        checker = EvaluationRowChecker(self.app)
+        checker.check(Evaluation("S001", "E004", 12.0, 10.0))
+        with self.assertRaises(ValueError):
+            checker.check(Evaluation("S001", "E004", 13.0, 10.0))
+        with self.assertRaises(ValueError):
+            checker.check(Evaluation("S001", "E001", 13.0, 10.0))
+        checker.commit()
+        self.assertEqual(checker._pending, {})
+        # Committed without insertion: the reservation is forgotten
+        checker.check(Evaluation("S001", "E004", 13.0, 10.0))
+        for i in range(5, 11):
+            checker.check(Evaluation("S001", f"E{i:03d}", 12.0, 10.0))
+        with self.assertRaises(ValueError):
+            checker.check(Evaluation("S001", "E011", 12.0, 10.0))
+
+    def test_max_evaluations_enforced(self):
+        """Test that rows beyond MAX_EVALUATIONS_PER_STUDENT are rejected."""
+        self.app.add_student("S100", "Alice")
+        lines = ["student_id,evaluation_id,grade,weight_percentage"]
+        lines += [f"S100,E{i:03d},15,5" for i in range(12)]
+        path = self._write("many.csv", "\n".join(lines) + "\n")
+        result = CsvImporter(self.app).import_evaluations(path)
+        self.assertEqual((result.imported, result.rejected), (10, 2))
+        self.assertIsNone(result.rejects_path)
+        self.assertIsNotNone(self.app.get_student_final_grade("S100"))
+
+    def test_missing_columns(self):
+        """Test that a file without the required header raises."""
+        path = self._write("bad.csv", "student,grade\nS001,10\n")
+        with self.assertRaises(ValueError):
+            CsvImporter(self.app).import_evaluations(path)
+        with self.assertRaises(ValueError):
+            CsvImporter(self.app, chunk_size=0)
+
+    def test_split_file_on_line_boundaries(self):
+        """Test that byte ranges cover every data line exactly once."""
+        path = self._write("split.csv", "student_id,evaluation_id,grade\n"
+                           + "".join(f"S100,E{i:03d},15\n" for i in range(9)))
+        fieldnames, ranges = split_file(path, 20)
+        self.assertEqual(fieldnames, ["student_id", "evaluation_id", "grade"])
+        self.assertGreater(len(ranges), 1)
+        with open(path, "rb") as handle:
+            data = handle.read()
+        self.assertEqual(ranges[0][0], data.index(b"\n") + 1)
+        self.assertEqual(ranges[-1][1], len(data))
+        for (_, end), (start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(data[end - 1:end], b"\n")
+
+    def test_parallel_import_matches_serial(self):
+        """Test that chunked parallel parsing merges in file order."""
+        lines = ["student_id,evaluation_id,grade,weight_percentage"]
+        lines += [f"S100,E{i:03d},{10 + i % 10},5" for i in range(12)]
+        lines += ["S100,E000,12,10", "", "S200,E001,abc,10",
+                  "S200,E001,14,50", "S200,E001,16,50", "S999,E001,12,10"]
+        path = self._write("cohort.csv", "\n".join(lines) + "\n")
+
+        results = {}
+        for mode in ("serial", "parallel"):
+            app = GradeCalculatorApp(load_sample_data=False)
+            app.add_student("S100", "Alice")
+            app.add_student("S200", "Bob")
+            rejects = os.path.join(self.tmp.name, f"{mode}.csv")
+            importer = CsvImporter(app, chunk_size=3)
+            if mode == "serial":
+                result = importer.import_evaluations(path, rejects)
+            else:
+                # Tiny chunks put duplicates in different workers' ranges
+                result = importer.import_evaluations_parallel(
+                    path, rejects, processes=2, chunk_bytes=40)
+            with open(rejects, newline="", encoding="utf-8") as handle:
+                rows = list(csv.DictReader(handle))
+            results[mode] = (
+                result.imported, result.rejected, rows,
+                {sid: [(e.evaluation_id, e.grade)
+                       for e in app.students[sid].evaluations]
+                 for sid in app.students}
+            )
+
+        self.assertEqual(results["parallel"], results["serial"])
+        imported, rejected, rows, evaluations = results["parallel"]
+        self.assertEqual((imported, rejected), (11, 6))
+        self.assertEqual(len(evaluations["S100"]), 10)
+        self.assertEqual(evaluations["S200"], [("E001", 14.0)])
+        self.assertEqual([row["line"] for row in rows],
+                         ["12", "13", "14", "16", "18", "19"])
+
+
+    def test_byte_order_mark(self):
+        """Test that a BOM-prefixed CSV imports on both paths."""
+        path = self._write("bom.csv", "\ufeffstudent_id,evaluation_id,grade,"
+                           "weight_percentage\nS100,E001,15,40\n"
+                           "S100,E002,12,60\n")
+        for mode in ("serial", "parallel"):
+            app = GradeCalculatorApp(load_sample_data=False)
+            app.add_student("S100", "Alice")
+            importer = CsvImporter(app)
+            if mode == "serial":
+                result = importer.import_evaluations(path)
+            else:
+                result = importer.import_evaluations_parallel(
+                    path, processes=2, chunk_bytes=16)
+            self.assertEqual((result.imported, result.rejected), (2, 0),
+                             mode)
+            self.assertEqual(app.students["S100"].get_evaluation_count(), 2)
+        students = self._write("bom_students.csv",
+                               "\ufeffstudent_id,name\nS300,Carol\n")
+        self.assertEqual(CsvImporter(self.app).import_students(
+            students).imported, 1)
+
+
+class TestSQLiteStorage(unittest.TestCase):
+    """Test cases for the SQLite persistence backend."""
+
+    def setUp(self):
+        """Set up a temporary database path."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "grades.db")
+
+    def _count(self, storage, table):
+        """Count the committed rows of a table."""
+        with storage.pool.connection() as connection:
+            return connection.execute(
+                f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def test_state_survives_restart(self):
+        """Test that a reopened app loads the same state from SQLite."""
+        app = GradeCalculatorApp(storage=SQLiteStorage(self.path))
+        app.add_student("S100", "Alice")
+        app.add_evaluation("S100", "E001", 14.25, 60.0)
+        app.add_evaluation("S100", "E002", 17.5, 40.0)
+        expected = {sid: app.get_student_final_grade(sid, 90.0, 1.0)
+                    for sid in app.students}
+        app.close()
+
+        reopened = GradeCalculatorApp(storage=SQLiteStorage(self.path))
+        self.addCleanup(reopened.close)
+        self.assertEqual(list(reopened.students), ["S001", "S002", "S003",
+                                                   "S100"])
+        self.assertEqual(len(reopened.all_years_teachers), 1)
+        self.assertEqual(reopened.students["S001"].get_evaluation_count(), 3)
+        for student_id, grade in expected.items():
+            self.assertEqual(
+                reopened.get_student_final_grade(student_id, 90.0, 1.0),
+                grade
+            )
+
+    def test_evaluations_written_in_batches(self):
+        """Test that evaluations are committed once a batch is full."""
+        storage = SQLiteStorage(self.path, batch_size=3)
+        app = GradeCalculatorApp(load_sample_data=False, storage=storage)
+        self.addCleanup(app.close)
+        app.add_student("S100", "Alice")
+        app.add_evaluation("S100", "E001", 15.0, 50.0)
+        app.add_evaluation("S100", "E002", 16.0, 50.0)
+        self.assertEqual(self._count(storage, "evaluations"), 0)
+        app.add_evaluation("S100", "E003", 17.0, 0.5)
+        self.assertEqual(self._count(storage, "evaluations"), 3)
+        app.add_evaluation("S100", "E004", 18.0, 0.5)
+        storage.flush()
+        self.assertEqual(self._count(storage, "evaluations"), 4)
+
+    def test_replaced_student_drops_evaluations(self):
+        """Test that re-adding a student clears its stored evaluations."""
+        storage = SQLiteStorage(self.path)
+        app = GradeCalculatorApp(load_sample_data=False, storage=storage)
+        app.add_student("S100", "Alice")
+        app.add_evaluation("S100", "E001", 15.0, 100.0)
+        app.add_student("S100", "Alice Smith")
+        app.close()
+
+        reopened = GradeCalculatorApp(load_sample_data=False,
+                                      storage=SQLiteStorage(self.path))
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.students["S100"].name, "Alice Smith")
+        self.assertEqual(reopened.students["S100"].get_evaluation_count(), 0)
+
+    def test_invalid_configuration(self):
+        """Test that non-positive pool and batch sizes are rejected."""
+        with self.assertRaises(ValueError):
+            ConnectionPool(self.path, size=0)
+        with self.assertRaises(ValueError):
+            SQLiteStorage(self.path, batch_size=0)
+        self.assertEqual(ConnectionPool(":memory:", size=4).size, 1)
+
+    def test_incomplete_backend_cannot_be_created(self):
+        """Test that a backend missing interface methods is rejected."""
+        class WriteOnlyStorage(StorageBackend):
+            def save_student(self, student_id, name):
+                pass
+
+        with self.assertRaises(TypeError):
+            WriteOnlyStorage()
+        with self.assertRaises(TypeError):
+            StorageBackend()
+
+
+class TestSnapshot(unittest.TestCase):
+    """Test cases for the memory-mapped binary snapshot."""
+
+    def setUp(self):
+        """Set up an app with data and write it to a snapshot."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "term.snap")
+        self.source = GradeCalculatorApp(load_sample_data=True)
+        self.source.add_student("S100", "Zoë Ávila")
+        self.source.add_evaluation("S100", "E001", 13.3, 33.3)
+        self.source.add_evaluation("S100", "E002", 16.7, 66.7)
+        self.source.add_student("S004", "No Evaluations")
+        write_snapshot(self.source, self.path)
+
+    def _open_app(self, **kwargs):
+        """Create an app started from the snapshot."""
+        app = GradeCalculatorApp(snapshot=self.path, **kwargs)
+        self.addCleanup(app.close)
+        return app
+
+    def test_final_grade_served_from_mapped_pages(self):
+        """Test that grades match the source without materializing."""
+        app = self._open_app()
+        self.assertEqual(app.students, {})
+        self.assertEqual(len(app.all_years_teachers), 1)
+        for student_id in ("S001", "S002", "S003", "S100"):
+            self.assertEqual(
+                app.get_student_final_grade(student_id, 85.0, 1.0),
+                self.source.get_student_final_grade(student_id, 85.0, 1.0)
+            )
+        self.assertEqual(app.students, {})
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        self.assertIsNone(app.get_student_final_grade("S004"))
+        self.assertIsNone(app.get_student_final_grade("S999"))
+        sys.stdout = sys.__stdout__
+        self.assertIn("has no evaluations", captured_output.getvalue())
+
+    def test_copy_on_write(self):
+        """Test that writing to a snapshot student materializes it."""
+        app = self._open_app(evaluation_store=EvaluationStore())
+        before = app.get_student_final_grade("S100")
+        self.assertTrue(app.add_evaluation("S100", "E003", 20.0, 10.0))
+        self.assertEqual(list(app.students), ["S100"])
+        self.assertEqual(app.students["S100"].name, "Zoë Ávila")
+        self.assertEqual(
+            [e.evaluation_id for e in app.students["S100"].evaluations],
+            ["E001", "E002", "E003"]
+        )
+        self.assertNotEqual(app.get_student_final_grade("S100"), before)
+
+    def test_roster_operations_materialize_in_order(self):
+        """Test that whole-roster reads see every snapshot student."""
+        app = self._open_app()
+        self.assertEqual([s.student_id for s in app.get_all_students()],
+                         ["S001", "S002", "S003", "S100", "S004"])
+        self.assertEqual(app.grade_all_students(),
+                         self.source.grade_all_students())
+        self.assertEqual(app.get_grade_report("S002"),
+                         self.source.get_grade_report("S002"))
+
+    def test_snapshot_lookup(self):
+        """Test binary search lookups and the reader metadata."""
+        with Snapshot(self.path) as snapshot:
+            self.assertEqual(len(snapshot), 5)
+            self.assertEqual(snapshot.evaluation_count, 11)
+            self.assertIn("S004", snapshot)
+            self.assertNotIn("S000", snapshot)
+            self.assertNotIn("S999", snapshot)
+            record = snapshot.get_student("S100")
+            self.assertEqual(record.name, "Zoë Ávila")
+            self.assertEqual(record.get_weighted_totals(),
+                             self.source.students["S100"]
+                             .get_weighted_totals())
+
+    def test_rejects_other_files(self):
+        """Test that a file without the snapshot header is rejected."""
+        path = os.path.join(self.tmp.name, "other.bin")
+        for content in (b"", b"not a snapshot" * 10):
+            with open(path, "wb") as handle:
+                handle.write(content)
+            with self.assertRaises(ValueError):
+                Snapshot(path)
+
+
+class TestWriteAheadLog(unittest.TestCase):
+    """Test cases for the write-ahead log and checkpoints."""
+
+    def setUp(self):
+        """Set up temporary log and snapshot paths."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.log_path = os.path.join(self.tmp.name, "term.wal")
+        self.snapshot_path = os.path.join(self.tmp.name, "term.snap")
+
+    def _open_app(self, **kwargs):
+        """Start an app from the snapshot and log paths."""
+        app = GradeCalculatorApp(
+            load_sample_data=False, snapshot=self.snapshot_path,
+            wal=WriteAheadLog(self.log_path, **kwargs)
+        )
+        self.addCleanup(app.close)
+        return app
+
+    def test_replay_after_crash(self):
+        """Test that mutations survive without a clean shutdown."""
+        app = self._open_app()
+        app.add_teacher("T001", "Dr. Juan Pérez", "Software All Years")
+        app.add_student("S100", "Alice")
+        app.add_evaluation("S100", "E001", 14.2, 60.0)
+        app.add_evaluation("S100", "E002", 17.9, 40.0)
+        expected = app.get_student_final_grade("S100", 90.0, 1.0)
+        # No close(): the records are already in the file
+
+        recovered = self._open_app()
+        self.assertEqual(len(recovered.all_years_teachers), 1)
+        self.assertEqual(recovered.get_student_final_grade("S100", 90.0, 1.0),
+                         expected)
+        self.assertEqual(recovered.wal.last_sequence, 4)
+
+    def test_torn_tail_is_ignored(self):
+        """Test that a partially written record is cut off on reopen."""
+        log = WriteAheadLog(self.log_path)
+        log.append(ADD_EVALUATION, "S100", "E001", 15.0, 100.0)
+        log.append(ADD_EVALUATION, "S100", "E002", 16.0, 100.0)
+        log.close()
+        with open(self.log_path, "r+b") as handle:
+            handle.truncate(os.path.getsize(self.log_path) - 3)
+
+        _, records, _ = read_log(self.log_path)
+        self.assertEqual([r[2][1] for r in records], ["E001"])
+        log = WriteAheadLog(self.log_path)
+        self.assertEqual(log.append(ADD_EVALUATION, "S100", "E003", 17.0,
+                                    100.0), 2)
+        log.close()
+        _, records, _ = read_log(self.log_path)
+        self.assertEqual([r[2][1] for r in records], ["E001", "E003"])
+
+    def test_checkpoint_replays_each_mutation_once(self):
+        """Test compaction into a snapshot followed by more mutations."""
+        app = self._open_app(compact_every=3)
+        app.add_student("S100", "Alice")
+        app.add_evaluation("S100", "E001", 12.0, 50.0)
+        app.add_evaluation("S100", "E002", 18.0, 50.0)  # compacts here
+        self.assertTrue(os.path.exists(self.snapshot_path))
+        self.assertEqual(app.wal.pending_records, 0)
+        app.add_student("S200", "Bob")
+        app.add_evaluation("S200", "E001", 11.0, 100.0)
+        expected = app.grade_all_students()
+
+        recovered = self._open_app(compact_every=3)
+        self.assertEqual(recovered.snapshot.sequence, 3)
+        self.assertEqual(recovered.get_student("S100").get_evaluation_count(),
+                         2)
+        self.assertEqual(recovered.grade_all_students(), expected)
+
+    def test_concurrent_writers_across_checkpoints(self):
+        """Test checkpoints exclude writers of every shard."""
+        app = ConcurrentGradeCalculatorApp(
+            load_sample_data=False, lock_shards=8,
+            snapshot=self.snapshot_path,
+            wal=WriteAheadLog(self.log_path, compact_every=40)
+        )
+        student_ids = [f"S{i:03d}" for i in range(8)]
+        for student_id in student_ids:
+            app.add_student(student_id, f"Student {student_id}")
+        lock_states = []
+        get_all_students = app.get_all_students
+
+        def recording_get_all_students():
+            # Only called by checkpoint() here
+            lock = app._registry_lock
+            lock_states.append((lock._readers, lock._writer))
+            return get_all_students()
+
+        app.get_all_students = recording_get_all_students
+
+        def writer(student_id):
+            for i in range(50):
+                app.add_evaluation(student_id, f"E{i:03d}", 10 + i % 10,
+                                   2.0)
+
+        threads = [threading.Thread(target=writer, args=(student_id,))
+                   for student_id in student_ids]
+        for thread in threads:
+            thread.start()
+        app.checkpoint()
+        for thread in threads:
+            thread.join()
+        app.checkpoint()
+        app.close()
+
+        self.assertGreater(len(lock_states), 2)
+        self.assertEqual(set(lock_states), {(0, True)})
+        with Snapshot(self.snapshot_path) as snapshot:
+            self.assertEqual(len(snapshot), 8)
+            # 8 students and 400 evaluations, all covered by the snapshot
+            self.assertEqual(snapshot.sequence, 408)
+            self.assertEqual(snapshot.evaluation_count, 400)
+        recovered = self._open_app()
+        for student_id in student_ids:
+            self.assertEqual(
+                recovered.find_student(student_id).get_evaluation_count(), 50)
+
+    def test_new_log_continues_after_snapshot(self):
+        """Test that a fresh log never reuses covered sequence numbers."""
+        app = self._open_app()
+        app.add_student("S100", "Alice")
+        app.checkpoint()
+        app.close()
+        os.remove(self.log_path)
+
+        app = self._open_app()
+        app.add_evaluation("S100", "E001", 15.0, 100.0)
+        app.close()
+        recovered = self._open_app()
+        self.assertEqual(recovered.get_student_final_grade("S100")[0], 15.0)
+
+    def test_group_commit_batches_fsync(self):
+        """Test that concurrent syncs share the log's fsyncs."""
+        log = WriteAheadLog(self.log_path, batch_size=1000, max_delay=60)
+        self.addCleanup(log.close)
+        sequences = [log.append(ADD_EVALUATION, "S100", f"E{i}", 15.0, 1.0)
+                     for i in range(10)]
+        self.assertEqual(sequences, list(range(1, 11)))
+        self.assertEqual(log._synced_sequence, 0)
+        threads = [threading.Thread(target=log.sync, args=(sequence,))
+                   for sequence in sequences]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(log._synced_sequence, 10)
+        with self.assertRaises(ValueError):
+            WriteAheadLog(self.log_path + "2", batch_size=0)
+
+
+class TestNameIndex(unittest.TestCase):
+    """Test cases for the name prefix and trigram indexes."""
+
+    def setUp(self):
+        """Set up an app with the sample students."""
+        self.app = GradeCalculatorApp(load_sample_data=True)
+
+    def test_normalize_name(self):
+        """Test accent, case and whitespace normalization."""
+        self.assertEqual(normalize_name("  María   GARCÍA "), "maria garcia")
+
+    def test_prefix_search(self):
+        """Test prefix matches on the first and later words of a name."""
+        self.app.add_student("S004", "Mario Gómez")
+        self.assertEqual([sid for sid, _ in self.app.search_students("mar")],
+                         ["S001", "S004", "S003"])
+        self.assertEqual(self.app.search_students("GARC"),
+                         [("S001", "María García")])
+        self.assertEqual(self.app.search_students("maria g"),
+                         [("S001", "María García")])
+        self.assertEqual(self.app.search_students("mar", limit=1),
+                         [("S001", "María García")])
+        self.assertEqual(self.app.search_students("zz"), [])
+        self.assertEqual(self.app.search_students(" "), [])
+
+    def test_index_follows_replaced_students(self):
+        """Test that re-adding a student replaces its indexed name."""
+        self.app.add_student("S001", "Lucía Torres")
+        self.assertEqual(self.app.search_students("garcia"), [])
+        self.assertEqual(self.app.search_students("torres"),
+                         [("S001", "Lucía Torres")])
+        self.assertEqual(len(self.app.name_index), 3)
+        self.assertEqual(len(self.app.fuzzy_index), 3)
+
+    def test_fuzzy_search(self):
+        """Test that misspelled names find the closest students."""
+        results = self.app.fuzzy_search_students("Carlos Lopes")
+        self.assertEqual(results[0][:2], ("S002", "Carlos López"))
+        self.assertGreater(results[0][2], 0.5)
+        self.assertEqual(self.app.fuzzy_search_students("qqqq"), [])
+
+        index = TrigramIndex()
+        index.add("S1", "Ana")
+        index.remove("S1")
+        self.assertEqual((len(index), index.search("Ana")), (0, []))
+        prefix = NamePrefixIndex()
+        prefix.add("S1", "Ana Ruiz")
+        prefix.remove("S1")
+        self.assertEqual((len(prefix), prefix.search("ruiz")), (0, []))
+
+    def test_snapshot_names_indexed_on_first_search(self):
+        """Test that snapshot students are searchable without loading."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "term.snap")
+            write_snapshot(self.app, path)
+            app = GradeCalculatorApp(snapshot=path)
+            app.add_student("S002", "Carla Lozano")
+            self.assertEqual(len(app.name_index), 1)
+            self.assertEqual([sid for sid, _ in app.search_students("car")],
+                             ["S002"])
+            self.assertEqual(app.search_students("ana"),
+                             [("S003", "Ana Martínez")])
+            self.assertEqual(app.students.keys(), {"S002"})
+            app.close()
+
+    def test_menu_accepts_names(self):
+        """Test that the view menu resolves a unique name prefix."""
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        sys.stdin = StringIO("martinez\nMaria Garsia\n")
+        try:
+            self.app.menu_view_student()
+            self.app.menu_view_student()
+        finally:
+            sys.stdout = sys.__stdout__
+            sys.stdin = sys.__stdin__
+        output = captured_output.getvalue()
+        self.assertIn("Student: Ana Martínez (ID: S003)", output)
+        self.assertIn("Error: Student Maria Garsia not found", output)
+        self.assertIn("Did you mean:\n  - S001: María García", output)
+
+
+class TestCourseIndex(unittest.TestCase):
+    """Test cases for the course, teacher and enrollment indexes."""
+
+    def setUp(self):
+        """Set up an app with two courses and enrollments."""
+        self.app = GradeCalculatorApp(load_sample_data=True)
+        self.app.add_teacher("T002", "Dr. Ada Ruiz", "Algorithms")
+        self.app.add_teacher("T003", "Dr. Leo Díaz", "algorithms")
+        self.assertTrue(self.app.enroll_student("T001", "S001"))
+        self.assertTrue(self.app.enroll_student("T001", "S003"))
+        self.assertTrue(self.app.enroll_student("T002", "S001"))
+
+    def test_teachers_by_course(self):
+        """Test course lookups ignoring case and spacing."""
+        self.assertEqual(
+            [t.teacher_id for t in self.app.get_teachers_by_course(
+                " ALGORITHMS ")],
+            ["T002", "T003"]
+        )
+        self.assertEqual(self.app.get_teachers_by_course("Physics"), [])
+
+    def test_all_years_teachers_follow_replacements(self):
+        """Test that re-adding a teacher moves it between indexes."""
+        self.app.add_teacher("T001", "Dr. Juan Pérez", "Software All Years")
+        self.assertEqual(len(self.app.all_years_teachers), 1)
+        self.app.add_teacher("T001", "Dr. Juan Pérez", "Databases")
+        self.assertEqual(self.app.all_years_teachers, [])
+        self.assertEqual(
+            [t.teacher_id for t in self.app.get_teachers_by_course(
+                "databases")], ["T001"])
+
+    def test_all_years_teachers_is_a_plain_list(self):
+        """Test that all_years_teachers can still be appended and assigned."""
+        self.app.add_teacher("T001", "Dr. Juan Pérez", "Software All Years")
+        teachers = self.app.all_years_teachers
+        self.assertIs(self.app.all_years_teachers, teachers)
+        extra = Teacher("T009", "Guest", "Seminar")
+        self.app.all_years_teachers.append(extra)
+        self.assertEqual(
+            [t.teacher_id for t in self.app.all_years_teachers],
+            ["T001", "T009"])
+        self.app.all_years_teachers = []
+        self.app.add_teacher("T002", "Dr. Ana Gómez", "Math All Years")
+        self.assertEqual(
+            [t.teacher_id for t in self.app.all_years_teachers], ["T002"])
+
+    def test_teacher_students_and_evaluations(self):
+        """Test teacher -> students -> evaluations lookups."""
+        self.assertTrue(self.app.enroll_student("T001", "S001"))
+        self.assertEqual(
+            [s.student_id for s in self.app.get_teacher_students("T001")],
+            ["S001", "S003"]
+        )
+        evaluations = self.app.get_teacher_evaluations("T001")
+        self.assertEqual(len(evaluations), 6)
+        self.assertEqual({e.student_id for e in evaluations},
+                         {"S001", "S003"})
+        self.assertEqual(
+            [t.teacher_id for t in self.app.get_student_teachers("S001")],
+            ["T001", "T002"]
+        )
+        self.assertEqual(self.app.get_teacher_students("T999"), [])
+
+    def test_enroll_unknown_ids(self):
+        """Test that enrolling unknown teachers or students fails."""
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        self.assertFalse(self.app.enroll_student("T999", "S001"))
+        self.assertFalse(self.app.enroll_student("T001", "S999"))
+        sys.stdout = sys.__stdout__
+        self.assertIn("Teacher T999 not found", captured_output.getvalue())
+        self.assertIn("Student S999 not found", captured_output.getvalue())
+
+    def test_enrollments_persist(self):
+        """Test enrollments through the log, snapshot and SQLite."""
+        with tempfile.TemporaryDirectory() as directory:
+            snapshot_path = os.path.join(directory, "term.snap")
+            log_path = os.path.join(directory, "term.wal")
+            app = GradeCalculatorApp(snapshot=snapshot_path,
+                                     wal=WriteAheadLog(log_path))
+            app.enroll_student("T001", "S002")
+            app.checkpoint()
+            app.enroll_student("T001", "S003")
+            app.close()
+            app = GradeCalculatorApp(snapshot=snapshot_path,
+                                     wal=WriteAheadLog(log_path))
+            self.assertEqual(
+                [s.student_id for s in app.get_teacher_students("T001")],
+                ["S002", "S003"]
+            )
+            self.assertEqual(app.get_enrollments(),
+                             [("T001", "S002"), ("T001", "S003")])
+            app.close()
+
+            db_path = os.path.join(directory, "term.db")
+            app = GradeCalculatorApp(storage=SQLiteStorage(db_path))
+            app.enroll_student("T001", "S002")
+            app.close()
+            app = GradeCalculatorApp(storage=SQLiteStorage(db_path))
+            self.assertEqual(app.get_enrollments(), [("T001", "S002")])
+            app.close()
+
+    def test_concurrent_app_enrollment(self):
+        """Test the thread-safe enrollment entry points."""
+        app = ConcurrentGradeCalculatorApp(load_sample_data=True)
+        self.assertTrue(app.enroll_student("T001", "S002"))
+        self.assertEqual(len(app.get_teacher_evaluations("T001")), 3)
+        self.assertEqual(len(app.get_teachers_by_course(
+            "software engineering all years")), 1)
+
+class TestRanking(unittest.TestCase):
+    """Test cases for the final grade rankings."""
+
+    def setUp(self):
+        """Set up an app with rankings enabled."""
+        self.app = GradeCalculatorApp(load_sample_data=True)
+        self.ranking = self.app.enable_ranking()
+
+    def test_grade_ranking_order_statistics(self):
+        """Test rank, percentile and top/bottom-K of a GradeRanking."""
+        ranking = GradeRanking()
+        for student_id, grade in [("A", 12.0), ("B", 18.5), ("C", 12.0),
+                                  ("D", 0.0), ("E", 20.0)]:
+            ranking.update(student_id, grade)
+        self.assertEqual(len(ranking), 5)
+        self.assertEqual(ranking.rank("E"), 1)
+        self.assertEqual(ranking.rank("A"), 3)
+        self.assertEqual(ranking.rank("C"), 3)
+        self.assertEqual(ranking.rank("D"), 5)
+        self.assertAlmostEqual(ranking.percentile("A"), 60.0)
+        self.assertAlmostEqual(ranking.percentile("D"), 20.0)
+        self.assertEqual(ranking.count_at_least(12.0), 4)
+        self.assertEqual(ranking.top(2), [("E", 20.0), ("B", 18.5)])
+        self.assertEqual(ranking.bottom(3),
+                         [("D", 0.0), ("A", 12.0), ("C", 12.0)])
+        ranking.update("D", 19.0)
+        ranking.remove("E")
+        ranking.remove("missing")
+        self.assertEqual(ranking.rank("D"), 1)
+        self.assertIsNone(ranking.rank("E"))
+        self.assertIsNone(ranking.percentile("E"))
+        self.assertEqual(ranking.top(10)[-1], ("C", 12.0))
+        self.assertEqual(ranking.top(0), [])
+
+    def test_top_and_bottom_match_sorting(self):
+        """Test top/bottom-K against sorting every ranked grade."""
+        ranking = GradeRanking()
+        self.assertEqual(ranking.top(3), [])
+        grades = {f"S{i:03d}": (i * 7919 % 2001) / 100.0 for i in range(300)}
+        grades.update({"T1": 10.001, "T2": 10.004, "T3": 10.004})
+        for student_id, grade in grades.items():
+            ranking.update(student_id, grade)
+        for student_id in list(grades)[::3]:
+            ranking.remove(student_id)
+            del grades[student_id]
+        descending = sorted(grades.items(),
+                            key=lambda item: (-round(item[1], 2), -item[1],
+                                              item[0]))
+        ascending = sorted(grades.items(),
+                           key=lambda item: (round(item[1], 2), item[1],
+                                             item[0]))
+        for k in (1, 2, 37, len(grades), len(grades) + 5):
+            self.assertEqual(ranking.top(k), descending[:k])
+            self.assertEqual(ranking.bottom(k), ascending[:k])
+        self.assertEqual(ranking.bottom(-1), [])
+
+    def test_leaderboard_matches_final_grades(self):
+        """Test that the ranking agrees with get_student_final_grade."""
+        expected = sorted(
+            ((self.app.get_student_final_grade(student_id)[0], student_id)
+             for student_id in ("S001", "S002", "S003")),
+            reverse=True
+        )
+        self.assertEqual(self.ranking.top(3),
+                         [(student_id, grade)
+                          for grade, student_id in expected])
+        self.assertEqual(self.ranking.rank(expected[0][1]), 1)
+        self.assertEqual(self.ranking.bottom(1)[0][0], expected[-1][1])
+
+    def test_incremental_updates(self):
+        """Test that evaluations and replaced students update the ranks."""
+        self.app.add_student("S004", "Luis Torres")
+        self.assertIsNone(self.ranking.rank("S004"))
+        self.app.add_evaluation("S004", "E001", 20.0, 100.0)
+        self.assertEqual(self.ranking.rank("S004"), 1)
+        self.assertAlmostEqual(self.ranking.percentile("S004"), 100.0)
+        self.app.add_student("S004", "Luis Torres")
+        self.assertIsNone(self.ranking.rank("S004"))
+        self.ranking.set_inputs("S002", 0.0, 0.0, True)
+        self.assertEqual(self.ranking.ranking.get_grade("S002"), 16.25)
+        self.assertEqual(self.ranking.rank("S002"), 1)
+        self.assertEqual(self.ranking.rank("S001"), 1)
+
+    def test_policy_change_rebuilds(self):
+        """Test that changing the extra points policy re-ranks everyone."""
+        before = self.ranking.top(3)
+        self.ranking.set_inputs("S003", 100.0, 1.0, True)
+        self.assertEqual(self.ranking.rank("S003"), 3)
+        self.app.grade_calculator.extra_points_policy = \
+            ExtraPointsPolicy(10.0)
+        self.assertEqual(self.ranking.top(1), [("S003", 20.0)])
+        self.app.grade_calculator.extra_points_policy = \
+            ExtraPointsPolicy(0.0)
+        self.assertEqual(self.ranking.top(3), before)
+
+    def test_course_rankings(self):
+        """Test per-course leaderboards follow enrollments."""
+        self.app.add_teacher("T002", "Dr. Ada Ruiz", "Algorithms")
+        self.app.enroll_student("T002", "S003")
+        self.assertEqual(self.ranking.top(5, "algorithms"),
+                         [("S003", self.ranking.ranking.get_grade("S003"))])
+        self.app.enroll_student("T002", "S001")
+        self.assertEqual(self.ranking.rank("S001", "Algorithms"), 1)
+        self.assertEqual(self.ranking.rank("S003", "Algorithms"), 2)
+        self.app.add_evaluation("S001", "E004", 0.0, 100.0)
+        self.assertEqual(self.ranking.rank("S003", "Algorithms"), 1)
+        self.assertIsNone(self.ranking.rank("S002", "Algorithms"))
+        self.app.add_teacher("T002", "Dr. Ada Ruiz", "Databases")
+        self.assertEqual(len(self.ranking.get_ranking("algorithms")), 0)
+        self.assertEqual(len(self.ranking.get_ranking("databases")), 2)
+
+    def test_snapshot_students_ranked_without_loading(self):
+        """Test ranking a snapshot keeps its students mapped."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "term.snap")
+            write_snapshot(self.app, path)
+            app = GradeCalculatorApp(snapshot=path)
+            ranking = app.enable_ranking()
+            self.assertEqual(ranking.top(3), self.ranking.top(3))
+            self.assertEqual(app.students, {})
+            app.close()
+
+class TestGradeSketch(unittest.TestCase):
+    """Test cases for streaming grade distribution sketches."""
+
+    def test_moments_and_quantiles(self):
+        """Test mean, stdev, quantiles and min/max of a sketch."""
+        grades = [12.0, 15.5, 8.25, 20.0, 0.0, 11.0, 17.75]
+        sketch = GradeSketch()
+        sketch.update(grades)
+        mean = sum(grades) / len(grades)
+        variance = sum((g - mean) ** 2 for g in grades) / len(grades)
+        self.assertEqual(len(sketch), 7)
+        self.assertAlmostEqual(sketch.mean, mean)
+        self.assertAlmostEqual(sketch.variance, variance)
+        self.assertEqual(sketch.median, 12.0)
+        self.assertEqual(sketch.quantile(0.0), 0.0)
+        self.assertEqual(sketch.quantile(1.0), 20.0)
+        self.assertEqual(sketch.quantiles([0.25, 0.75]), [8.25, 17.75])
+        self.assertEqual((sketch.min, sketch.max), (0.0, 20.0))
+        self.assertEqual(sketch.count_at_least(11.0), 5)
+
+    def test_histogram_bins(self):
+        """Test fixed bins, including the closed last bin."""
+        sketch = GradeSketch(bin_count=4)
+        sketch.update([0.0, 4.99, 5.0, 19.0, 20.0, 25.0])
+        self.assertEqual(list(sketch.bins), [2, 1, 0, 3])
+        histogram = sketch.histogram()
+        self.assertEqual(histogram[0], (0.0, 5.0, 2))
+        self.assertEqual(histogram[-1], (15.0, 20.0, 3))
+
+    def test_merge_matches_single_sketch(self):
+        """Test that merging shard sketches equals one sketch."""
+        grades = [(i * 37 % 2001) / 100 for i in range(500)]
+        whole = GradeSketch()
+        whole.update(grades)
+        shards = [GradeSketch() for _ in range(3)]
+        for i, grade in enumerate(grades):
+            shards[i % 3].add(grade)
+        merged = GradeSketch()
+        for shard in shards:
+            merged.merge(shard)
+        merged.merge(GradeSketch())
+        clone = merged.copy()
+        clone.add(20.0)
+        self.assertEqual(clone.count, merged.count + 1)
+        self.assertEqual(merged.count, whole.count)
+        self.assertEqual(list(merged.bins), list(whole.bins))
+        self.assertEqual(merged.quantiles([0.1, 0.5, 0.9]),
+                         whole.quantiles([0.1, 0.5, 0.9]))
+        self.assertAlmostEqual(merged.mean, whole.mean)
+        self.assertAlmostEqual(merged.variance, whole.variance)
+        self.assertEqual((merged.min, merged.max), (whole.min, whole.max))
+
+    def test_invalid_usage(self):
+        """Test the errors of empty or incompatible sketches."""
+        sketch = GradeSketch()
+        with self.assertRaises(ValueError):
+            sketch.median
+        with self.assertRaises(ValueError):
+            sketch.quantile(1.5)
+        with self.assertRaises(ValueError):
+            sketch.merge(GradeSketch(bin_count=10))
+        with self.assertRaises(ValueError):
+            GradeSketch(bin_count=0)
+        self.assertIsNone(sketch.to_dict()['median'])
+        self.assertEqual(sketch.stdev, 0.0)
+
+    def test_course_distribution(self):
+        """Test distributions of a course and of the cohort."""
+        app = GradeCalculatorApp(load_sample_data=True)
+        app.add_teacher("T002", "Dr. Ada Ruiz", "Algorithms")
+        app.enroll_student("T002", "S001")
+        app.enroll_student("T002", "S003")
+        sketch = app.get_grade_distribution("algorithms")
+        self.assertEqual(sketch.count, 2)
+        self.assertAlmostEqual(sketch.mean, (16.25 + 12.1) / 2)
+        summary = app.get_grade_distribution().to_dict()
+        self.assertEqual(summary['count'], 3)
+        self.assertEqual(summary['median'], 16.25)
+        self.assertEqual(sum(summary['histogram']), 3)
+        self.assertEqual(app.get_grade_distribution("physics").count, 0)
+        concurrent = ConcurrentGradeCalculatorApp(load_sample_data=True)
+        self.assertEqual(concurrent.get_grade_distribution().median, 16.25)
+
+class TestPolicySweep(unittest.TestCase):
+    """Test cases for what-if policy scenario sweeps."""
+
+    def setUp(self):
+        """Set up a cohort with varied attendance and extra points."""
+        self.app = GradeCalculatorApp(load_sample_data=True)
+        for i in range(30):
+            student_id = f"W{i:03d}"
+            self.app.add_student(student_id, f"Student {i}")
+            for j in range(1 + i % 3):
+                self.app.add_evaluation(student_id, f"E{j}",
+                                        (i * 5 + j * 4) % 21, 20.0 + j * 10)
+        self.app.add_student("EMPTY", "No Evaluations")
+        self.inputs = {f"W{i:03d}": (50.0 + i * 2, i % 4, True)
+                       for i in range(30)}
+
+    def test_scenarios_match_direct_grading(self):
+        """Test every scenario grade against calculate_final_grade."""
+        grid = ([70.0, 80.0, 95.0], [0.0, 0.1, 0.35], [0.5, 1.0, 2.5])
+        results = self.app.sweep_policies(*grid, inputs=self.inputs,
+                                          passing_grade=12.0)
+        self.assertEqual(len(results), 27)
+        for result in results:
+            calculator = GradeCalculator(
+                AttendancePolicy(result['minimum_attendance']),
+                ExtraPointsPolicy(result['extra_points_value']))
+            calculator.ATTENDANCE_PENALTY_PERCENTAGE = \
+                result['penalty_percentage']
+            finals = []
+            for student in self.app.get_all_students():
+                if student.get_evaluation_count() == 0:
+                    continue
+                attendance, extra, _ = self.inputs.get(
+                    student.student_id, (100.0, 0.0, True))
+                final_grade, _ = calculator.calculate_final_grade(
+                    student.get_evaluations(), attendance, extra,
+                    calculator.attendance_policy.is_attendance_sufficient(
+                        attendance))
+                finals.append(final_grade)
+            expected = GradeSketch()
+            expected.update(finals)
+            self.assertEqual(result['students'], 33)
+            self.assertEqual(result['passed'],
+                             sum(1 for g in finals if g >= 12.0))
+            self.assertAlmostEqual(result['pass_rate'],
+                                   result['passed'] / 33)
+            distribution = result['distribution']
+            self.assertEqual(list(distribution.bins), list(expected.bins))
+            self.assertEqual(distribution.median, expected.median)
+            self.assertAlmostEqual(distribution.mean, sum(finals) / 33)
+
+    def test_defaults_use_current_policies(self):
+        """Test that omitted axes use the calculator's current policies."""
+        [result] = self.app.sweep_policies()
+        self.assertEqual(result['minimum_attendance'], 80.0)
+        self.assertEqual(result['penalty_percentage'],
+                         GradeCalculator.ATTENDANCE_PENALTY_PERCENTAGE)
+        self.assertEqual(result['extra_points_value'], 1.0)
+        grades = self.app.grade_all_students()
+        self.assertEqual(result['passed'], sum(
+            1 for r in grades.values()
+            if r is not None and r[0] >= GradeCalculator.PASSING_GRADE))
+
+    def test_broadcast_reuses_weighted_averages(self):
+        """Test a sweep object can run several grids."""
+        sweep = PolicySweep(self.app.grade_calculator,
+                            self.app.get_all_students(), self.inputs)
+        self.assertEqual(len(sweep), 33)
+        self.assertNotIn("EMPTY", sweep.student_ids)
+        lenient, strict = sweep.run([80.0], [0.0, 0.5], [1.0])
+        self.assertGreater(lenient['passed'], strict['passed'])
+        self.assertGreater(lenient['distribution'].mean,
+                           strict['distribution'].mean)
+        self.assertEqual(PolicySweep(self.app.grade_calculator, []).run(
+            [80.0], [0.1], [1.0])[0]['pass_rate'], 0.0)
+
+    def test_invalid_grid(self):
+        """Test that out-of-range grid values are rejected."""
+        with self.assertRaises(ValueError):
+            self.app.sweep_policies(minimum_attendances=[120.0])
+        with self.assertRaises(ValueError):
+            self.app.sweep_policies(penalty_percentages=[-0.1])
+        with self.assertRaises(ValueError):
+            self.app.sweep_policies(extra_points_values=[-1.0])
+
+class TestRequiredGrade(unittest.TestCase):
+    """Test cases for the required grade solver."""
+
+    def setUp(self):
+        """Set up a calculator and an app with sample data."""
+        self.calculator = GradeCalculator()
+        self.app = GradeCalculatorApp(load_sample_data=True)
+
+    def _final_with(self, student, remaining_weights, grade, *inputs):
+        """Grade a copy of student with grade on every remaining weight."""
+        copy = Student(student.student_id, student.name)
+        for evaluation in student.get_evaluations():
+            copy.add_evaluation(evaluation)
+        for i, weight in enumerate(remaining_weights):
+            copy.add_evaluation(Evaluation(student.student_id, f"R{i}",
+                                           grade, weight))
+        return self.calculator.calculate_final_grade(
+            copy.get_evaluations(), *inputs)[0]
+
+    def test_required_grade_is_exact_minimum(self):
+        """Test the answer passes and the next float below does not."""
+        cases = [
+            ([(12.0, 30.0), (9.5, 20.0)], [25.0, 25.0], 11.0,
+             (100.0, 0.0, True)),
+            ([(7.25, 40.0)], [60.0], 11.0, (70.0, 2.0, True)),
+            ([(14.0, 10.0), (3.0, 10.0), (10.0, 10.0)], [35.0, 35.0], 13.7,
+             (90.0, 3.0, False)),
+            ([], [100.0], 10.49, (100.0, 0.0, True)),
+        ]
+        for recorded, remaining, target, inputs in cases:
+            student = Student("R001", "Rosa Vega")
+            for i, (grade, weight) in enumerate(recorded):
+                student.add_evaluation(Evaluation("R001", f"E{i}", grade,
+                                                  weight))
+            required, details = self.calculator.calculate_required_grade(
+                student, remaining, target, *inputs)
+            self.assertTrue(details['achievable'])
+            self.assertGreaterEqual(
+                self._final_with(student, remaining, required, *inputs),
+                target)
+            self.assertLess(
+                self._final_with(student, remaining,
+                                 math.nextafter(required, -math.inf),
+                                 *inputs),
+                target)
+            self.assertEqual(details['remaining_weight'], sum(remaining))
+
+    def test_already_passing_and_unachievable(self):
+        """Test the MIN_GRADE and not achievable boundaries."""
+        student = self.app.get_student("S002")
+        required, details = self.calculator.calculate_required_grade(
+            student, [30.0])
+        self.assertEqual(required, 0.0)
+        self.assertTrue(details['achievable'])
+        student = Student("R002", "Ivo Paz")
+        student.add_evaluation(Evaluation("R002", "E1", 0.0, 90.0))
+        required, details = self.calculator.calculate_required_grade(
+            student, [10.0], 11.0)
+        self.assertIsNone(required)
+        self.assertFalse(details['achievable'])
+        self.assertEqual(details['final_grade'], 2.0)
+
+    def test_invalid_requests(self):
+        """Test that bad weights, targets and counts are rejected."""
+        student = self.app.get_student("S001")
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_required_grade(student, [])
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_required_grade(student, [120.0])
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_required_grade(student, [10.0], 25.0)
+        with self.assertRaises(ValueError):
+            self.calculator.calculate_required_grade(student, [5.0] * 8)
+
+    def test_batch_and_at_risk(self):
+        """Test the cohort batch through the app."""
+        self.app.add_student("S004", "Luis Torres")
+        self.app.add_evaluation("S004", "E001", 4.0, 50.0)
+        results = self.app.get_required_grades([50.0], 11.0)
+        self.assertEqual(list(results), ["S001", "S002", "S003", "S004"])
+        self.assertEqual(results["S004"],
+                         self.app.get_student_required_grade(
+                             "S004", [50.0], 11.0))
+        self.assertAlmostEqual(results["S004"][0], 18.0)
+        at_risk = self.app.get_required_grades([10.0], 15.0,
+                                               at_risk_only=True)
+        self.assertEqual(list(at_risk), ["S001", "S003", "S004"])
+        self.assertAlmostEqual(at_risk["S001"][0], 2.5)
+        self.assertFalse(at_risk["S004"][1]['achievable'])
+        self.assertIsNone(self.app.get_required_grades(
+            [5.0] * 8)["S001"])
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        self.assertIsNone(self.app.get_student_required_grade("S999",
+                                                              [10.0]))
+        self.assertIsNone(self.app.get_student_required_grade("S001", []))
+        sys.stdout = sys.__stdout__
+        self.assertIn("Student S999 not found", captured_output.getvalue())
+        concurrent = ConcurrentGradeCalculatorApp(load_sample_data=True)
+        self.assertEqual(concurrent.get_required_grades([20.0])["S003"],
+                         self.app.get_required_grades([20.0])["S003"])
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for the opt-in instrumentation."""
+
+    def setUp(self):
+        """Set up an app and make sure metrics start disabled."""
+        disable_metrics()
+        self.app = GradeCalculatorApp(load_sample_data=True)
+
+    def tearDown(self):
+        """Turn metrics off again."""
+        disable_metrics()
+
+    def test_disabled_by_default(self):
+        """Test that nothing is recorded until metrics are enabled."""
+        self.assertIsNone(get_metrics())
+        self.assertIsNotNone(self.app.get_student_final_grade("S001"))
+        metrics = enable_metrics()
+        self.assertIs(get_metrics(), metrics)
+        self.assertEqual(metrics.get_stats()['operations'], {})
+
+    def test_counts_and_latency(self):
+        """Test call counters and cumulative latency buckets."""
+        metrics = enable_metrics()
+        for _ in range(3):
+            self.app.get_student_final_grade("S001")
+        self.app.get_grade_report("S002")
+        stats = metrics.get_stats()['operations']
+        self.assertEqual(stats['get_student_final_grade']['calls'], 3)
+        # Later lookups are cache hits and skip the calculator
+        self.assertEqual(stats['calculate_student_final_grade']['calls'], 2)
+        self.assertEqual(stats['get_grade_report']['calls'], 1)
+        buckets = stats['get_student_final_grade']['latency_buckets']
+        self.assertEqual(list(buckets)[-1], "+Inf")
+        self.assertEqual(buckets["+Inf"], 3)
+        self.assertEqual(list(buckets.values()),
+                         sorted(buckets.values()))
+        self.assertGreater(
+            stats['get_student_final_grade']['latency_sum_seconds'], 0.0)
+
+    def test_errors_by_category(self):
+        """Test ValueErrors are counted by message category."""
+        metrics = enable_metrics()
+        calculator = GradeCalculator()
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                calculator.calculate_final_grade([])
+        report = calculator.generate_grade_report("S9", "Nadie", [])
+        self.assertIn("Error generating report", report)
+        stats = metrics.get_stats()['operations']
+        self.assertEqual(stats['calculate_final_grade']['errors'],
+                         {"no evaluations provided": 3})
+        self.assertEqual(stats['generate_grade_report']['errors'],
+                         {"no evaluations provided": 1})
+        self.assertEqual(error_category("Student S001 not found"),
+                         "student <n> not found")
+        self.assertEqual(
+            error_category("Grade must be between 0.0 and 20.0"),
+            "grade must be between <n> and <n>")
+
+    def test_app_failures_are_counted(self):
+        """Test errors the app catches and prints are counted as errors."""
+        metrics = enable_metrics()
+        self.app.add_student("S004", "Luis Torres")
+        sys.stdout = StringIO()
+        try:
+            self.assertIsNone(self.app.get_student_final_grade("S999"))
+            self.assertIsNone(self.app.get_student_final_grade("S004"))
+            self.assertIsNone(self.app.get_grade_report("S998"))
+            self.assertIsNone(self.app.get_grade_report_bytes("S004"))
+            self.assertFalse(self.app.add_evaluation("S001", "E9", 25.0))
+            self.assertIsNone(
+                self.app.get_student_required_grade("S001", []))
+        finally:
+            sys.stdout = sys.__stdout__
+        self.app.get_student_final_grade("S001")
+        stats = metrics.get_stats()['operations']
+        self.assertEqual(stats['get_student_final_grade']['calls'], 3)
+        self.assertEqual(stats['get_student_final_grade']['errors'], {
+            "student <n> not found": 1,
+            "student <n> has no evaluations": 1})
+        self.assertEqual(stats['get_grade_report']['errors'],
+                         {"student <n> not found": 1})
+        self.assertEqual(stats['get_grade_report_bytes']['errors'],
+                         {"student <n> has no evaluations": 1})
+        self.assertEqual(list(stats['add_evaluation']['errors']),
+                         ["grade must be between <n> and <n>"])
+        self.assertEqual(
+            sum(stats['get_student_required_grade']['errors'].values()), 1)
+
+    def test_exports(self):
+        """Test the Prometheus text and JSON exports."""
+        metrics = Metrics(buckets=(0.001, 1.0))
+        metrics.observe("lookup", 0.0005)
+        metrics.observe("lookup", 0.5)
+        metrics.observe("lookup", 2.0)
+        metrics.record_error("lookup", ValueError('Bad "id" 7'))
+        text = metrics.to_prometheus()
+        self.assertIn('grade_calculator_calls_total{operation="lookup"} 3',
+                      text)
+        self.assertIn('grade_calculator_latency_seconds_bucket{operation='
+                      '"lookup",le="0.001"} 1', text)
+        self.assertIn('grade_calculator_latency_seconds_bucket{operation='
+                      '"lookup",le="+Inf"} 3', text)
+        self.assertIn('grade_calculator_errors_total{operation="lookup",'
+                      'category="bad \\"id\\" <n>"} 1', text)
+        self.assertTrue(text.endswith("\n"))
+        data = json.loads(metrics.to_json())
+        self.assertEqual(data['operations']['lookup']['calls'], 3)
+        self.assertEqual(
+            data['operations']['lookup']['latency_buckets']['1.0'], 2)
+        metrics.reset()
+        self.assertEqual(metrics.get_stats()['operations'], {})
+        with self.assertRaises(ValueError):
+            Metrics(buckets=(1.0, 0.5))
+
+
+class TestTracing(unittest.TestCase):
+    """Test cases for the tracing spans."""
+
+    def setUp(self):
+        """Set up an app and make sure tracing starts disabled."""
+        set_tracer(None)
+        self.app = GradeCalculatorApp(load_sample_data=True)
+
+    def tearDown(self):
+        """Turn tracing off again."""
+        set_tracer(None)
+
+    def test_stage_spans_nest(self):
+        """Test the per-stage spans of a final grade are nested."""
+        sink = ListSink()
+        set_tracer(Tracer(sink))
+        self.app.get_student_final_grade("S001", 80.0, 2.0, True)
+        names = [span.name for span in sink.spans]
+        self.assertEqual(names, [
+            "find_student", "weighted_average", "attendance_penalty",
+            "extra_points", "details", "calculate_student_final_grade",
+            "get_student_final_grade"
+        ])
+        spans = {span.name: span for span in sink.spans}
+        self.assertEqual(spans["get_student_final_grade"].depth, 0)
+        self.assertEqual(spans["calculate_student_final_grade"].parent,
+                         "get_student_final_grade")
+        self.assertEqual(spans["extra_points"].depth, 2)
+        outer = spans["calculate_student_final_grade"]
+        for name in ("weighted_average", "details"):
+            self.assertGreaterEqual(spans[name].start_ns, outer.start_ns)
+            self.assertLessEqual(spans[name].end_ns, outer.end_ns)
+
+    def test_traced_results_match(self):
+        """Test tracing does not change grades or details."""
+        calculator = GradeCalculator()
+        evaluations = [Evaluation("S1", "E1", 14.3, 35.0),
+                       Evaluation("S1", "E2", 9.7, 65.0)]
+        expected = calculator.calculate_final_grade(evaluations, 83.0,
+                                                    3.0, True)
+        sink = ListSink()
+        set_tracer(Tracer(sink))
+        self.assertEqual(calculator.calculate_final_grade(
+            evaluations, 83.0, 3.0, True), expected)
+        self.assertEqual(sink.spans[-1].name, "calculate_final_grade")
+        with self.assertRaises(ValueError):
+            calculator.calculate_final_grade([])
+        self.assertEqual(sink.spans[-1].args, {"error": "ValueError"})
+        self.assertEqual(sink.spans[-1].depth, 0)
+
+    def test_no_spans_when_disabled(self):
+        """Test nothing is recorded without a tracer."""
+        sink = ListSink()
+        tracer = Tracer(sink)
+        self.assertIsNone(set_tracer(tracer))
+        self.assertIs(set_tracer(None), tracer)
+        self.app.get_student_final_grade("S001")
+        self.app.search_students("a")
+        self.assertEqual(sink.spans, [])
+
+    def test_chrome_trace_file(self):
+        """Test the Chrome trace JSON file sink."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            tracer = Tracer(ChromeTraceSink(path))
+            set_tracer(tracer)
+            self.app.get_grade_report("S002")
+            with tracer.span("custom", student_id="S002"):
+                pass
+            tracer.close()
+            with open(path, encoding="utf-8") as handle:
+                events = json.load(handle)["traceEvents"]
+        names = [event["name"] for event in events]
+        self.assertIn("get_grade_report", names)
+        self.assertIn("weighted_average", names)
+        for event in events:
+            self.assertEqual(event["ph"], "X")
+            self.assertGreaterEqual(event["dur"], 0)
+        self.assertEqual(events[-1]["args"], {"student_id": "S002"})
+
+    def test_sink_must_implement_emit(self):
+        """Test that a sink without emit cannot be created."""
+        class ClosingSink(SpanSink):
+            def close(self):
+                pass
+
+        with self.assertRaises(TypeError):
+            ClosingSink()
+
+    def test_chrome_trace_sink_is_bounded(self):
+        """Test the Chrome sink writes in batches instead of buffering."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "trace.json")
+            sink = ChromeTraceSink(path, flush_every=3)
+            tracer = Tracer(sink)
+            for i in range(7):
+                with tracer.span("step", index=i):
+                    pass
+                self.assertLess(len(sink._events), 3)
+            sink.close()
+            sink.close()
+            with open(path, encoding="utf-8") as handle:
+                events = json.load(handle)["traceEvents"]
+        self.assertEqual([event["args"]["index"] for event in events],
+                         [str(i) for i in range(7)])
+        with self.assertRaises(ValueError):
+            ChromeTraceSink(path, flush_every=0)
+
+
+class TestProfiling(unittest.TestCase):
+    """Test cases for the profiling and batch options of the CLI."""
+
+    def setUp(self):
+        """Set up a batch file viewing a student, without Exit."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.batch = os.path.join(self.directory.name, "batch.txt")
+        with open(self.batch, "w", encoding="utf-8") as handle:
+            handle.write("4\nS001\n")
+
+    def tearDown(self):
+        """Remove the temporary files."""
+        self.directory.cleanup()
+
+    def run_quietly(self, main_function, argv):
+        """Run an entry point, returning its (stdout, stderr)."""
+        stdout, stderr = StringIO(), StringIO()
+        sys.stdout, sys.stderr = stdout, stderr
+        try:
+            main_function(argv)
+        finally:
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_parse_args(self):
+        """Test the defaults and validation of the options."""
+        options = parse_args([])
+        self.assertIsNone(options.profile)
+        self.assertIsNone(options.tracemalloc)
+        self.assertEqual(options.profiler, "cprofile")
+        self.assertEqual(parse_args(["--tracemalloc"]).tracemalloc, 10)
+        self.assertEqual(parse_args(["--tracemalloc", "3"]).tracemalloc, 3)
+        with self.assertRaises(SystemExit):
+            parse_args(["--tracemalloc", "0"])
+        with self.assertRaises(SystemExit):
+            parse_args(["--sample-interval", "0"])
+
+    def test_batch_cprofile(self):
+        """Test a batch session profiled with cProfile."""
+        path = os.path.join(self.directory.name, "stats.txt")
+        stdout, stderr = self.run_quietly(
+            run_main, ["--batch", self.batch, "--profile", path,
+                       "--sort", "tottime"])
+        self.assertIn("Evaluations: 3", stdout)
+        self.assertIn("End of batch input", stdout)
+        self.assertIn("Profile written to", stderr)
+        with open(path, encoding="utf-8") as handle:
+            stats = handle.read()
+        self.assertIn("Ordered by: internal time", stats)
+        self.assertIn("menu_view_student", stats)
+
+    def test_batch_tracemalloc(self):
+        """Test the allocation report of both entry points."""
+        for main_function in (run_main, main_standalone.main):
+            stdout, stderr = self.run_quietly(
+                main_function, ["--batch", self.batch, "--tracemalloc", "3"])
+            self.assertIn("Evaluations: 3", stdout)
+            self.assertIn("Top 3 allocation sites:", stderr)
+            self.assertIn("Peak traced:", stderr)
+
+    def test_sampling_profiler(self):
+        """Test the collapsed stacks of the sampling profiler."""
+        def busy_grading():
+            calculator = GradeCalculator()
+            evaluations = [Evaluation("S1", "E1", 15.0, 100.0)]
+            deadline = time.monotonic() + 0.2
+            while time.monotonic() < deadline:
+                calculator.calculate_final_grade(evaluations)
+
+        profiler = SamplingProfiler(interval=0.001)
+        profiler.start()
+        busy_grading()
+        profiler.stop()
+        lines = profiler.collapsed().splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        self.assertGreater(int(count), 0)
+        self.assertTrue(any("busy_grading" in line for line in lines))
+        self.assertIn(";", stack)
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test cases for the lazy public names of the package."""
+
+    def run_python(self, code):
+        """Run code in a fresh interpreter at the repository root."""
+        root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+        result = subprocess.run([sys.executable, "-c", code], cwd=root,
+                                capture_output=True, text=True, check=True)
+        return result.stdout.split()
+
+    def test_calculator_does_not_import_main(self):
+        """Test GradeCalculator is usable without loading the app."""
+        output = self.run_python(
+            "import sys, grade_calculator\n"
+            "print('grade_calculator.main' in sys.modules)\n"
+            "grade_calculator.GradeCalculator().calculate_weighted_average\n"
+            "print('grade_calculator.main' in sys.modules)\n"
+            "grade_calculator.GradeCalculatorApp\n"
+            "print('grade_calculator.main' in sys.modules)\n"
+        )
+        self.assertEqual(output, ["False", "False", "True"])
+
+    def test_app_does_not_import_optional_backends(self):
+        """Test the optional subsystems load only when first used."""
+        output = self.run_python(
+            "import sys, grade_calculator\n"
+            "optional = ('storage', 'snapshot', 'wal', 'profiling',\n"
+            "            'scenarios', 'parallel', 'ranking')\n"
+            "def loaded():\n"
+            "    return sorted(name for name in optional\n"
+            "                  if 'grade_calculator.' + name in sys.modules)\n"
+            "app = grade_calculator.ConcurrentGradeCalculatorApp()\n"
+            "app.get_student_final_grade('S001')\n"
+            "print(loaded() or 'none')\n"
+            "app.grade_all_students()\n"
+            "app.enable_ranking()\n"
+            "print(','.join(loaded()))\n"
+        )
+        self.assertEqual(output, ["none", "parallel,ranking"])
+
+    def test_public_names_resolve(self):
+        """Test every name of __all__ loads and unknown names fail."""
+        output = self.run_python(
+            "import grade_calculator\n"
+            "from grade_calculator import *\n"
+            "print(all(getattr(grade_calculator, name).__name__ == name\n"
+            "          for name in grade_calculator.__all__))\n"
+            "print(set(grade_calculator.__all__)\n"
+            "      <= set(dir(grade_calculator)))\n"
+            "try:\n"
+            "    grade_calculator.Missing\n"
+            "except AttributeError:\n"
+            "    print('AttributeError')\n"
+        )
+        self.assertEqual(output, ["True", "True", "AttributeError"])
+
+
 if __name__ == "__main__":
     unittest.main()